@@ -0,0 +1,102 @@
+"""
+[챗 응답 캐시 오프라인 검증 및 벤치마크]
+OpenAI 호출 없이 Fake LLM(지연 스트리밍)과 문자 bigram 해시 임베딩으로 /api/chat 응답 캐시 동작을 검증하는 스크립트입니다.
+
+Checks:
+1. Exact Match: 동일 대화 및 공백만 다른 대화는 캐시 재생 (X-Chat-Cache: exact), 응답 본문 동일
+2. Semantic Match: 동일 데이터 + 표현만 다른 질문은 임계값 이상일 때 재생 (X-Chat-Cache: semantic)
+3. Safety: 질문이 같아도 주입된 데이터(문맥)가 다르면 Miss
+4. Benchmark: Miss(LLM 스트리밍) 대비 Hit(재생) 응답 시간
+
+Usage:
+    python backend/benchmark_chat_cache.py
+    python backend/benchmark_chat_cache.py --threshold 0.9 --llm_delay 0.01
+"""
+
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from backend import main
+from backend.chat_cache import ChatResponseCache
+from backend.chat_history import HistoryCompactor
+from backend.chat_llm import ChatLLMService
+
+EMBEDDING_DIM = 256
+
+DIVIDEND_CONTEXT = (
+    "[삼성전자 배당 데이터]\n2022.4Q DPS 361원, 배당수익률 2.6%, 배당성향 17.9%\n"
+    "2023.4Q DPS 361원, 배당수익률 1.9%, 배당성향 67.8%\n2024.4Q DPS 363원, 배당수익률 2.7%, 배당성향 29.2%"
+)
+OTHER_CONTEXT = DIVIDEND_CONTEXT.replace("삼성전자", "SK하이닉스").replace("361원", "1,200원")
+
+
+async def fake_embedder(text: str):
+    """문자 bigram을 해시 버킷에 누적한 벡터 (표현이 비슷한 문장일수록 코사인 유사도가 높음)"""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    compact = ''.join(text.split())
+    for i in range(len(compact) - 1):
+        vector[zlib.crc32(compact[i:i + 2].encode('utf-8')) % EMBEDDING_DIM] += 1.0
+    return vector.tolist()
+
+
+def conversation(context: str, question: str) -> dict:
+    return {"messages": [
+        {"role": "system", "content": context},
+        {"role": "user", "content": question},
+    ]}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='챗 응답 캐시 오프라인 검증')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Semantic Match 코사인 유사도 임계값')
+    parser.add_argument('--llm_delay', type=float, default=0.005, help='Fake LLM 문자당 스트리밍 지연 (초)')
+    args = parser.parse_args()
+
+    answer = "삼성전자는 2024년 배당성향이 29.2%로 낮아져 이익 회복 대비 배당 여력이 확대되었습니다. " * 3
+    fake_llm = FakeListChatModel(responses=[answer], sleep=args.llm_delay)
+    main.chat_llm = ChatLLMService(llm=fake_llm)
+    main.history_compactor = HistoryCompactor()
+    main.chat_cache = ChatResponseCache(ttl=600, embedder=fake_embedder, similarity_threshold=args.threshold)
+    client = TestClient(main.app)
+
+    cases = [
+        ("최초 요청", conversation(DIVIDEND_CONTEXT, "이 기업 배당 분석해줘"), "miss"),
+        ("동일 요청", conversation(DIVIDEND_CONTEXT, "이 기업 배당 분석해줘"), "exact"),
+        ("공백 차이", conversation(DIVIDEND_CONTEXT, "이 기업  배당 분석해줘 "), "exact"),
+        ("유사 질문", conversation(DIVIDEND_CONTEXT, "이 기업의 배당 분석해줘"), "semantic"),
+        ("다른 데이터", conversation(OTHER_CONTEXT, "이 기업 배당 분석해줘"), "miss"),
+        ("다른 질문", conversation(DIVIDEND_CONTEXT, "최근 뉴스 요약해줘"), "miss"),
+    ]
+
+    failures = 0
+    timings = {}
+    for label, payload, expected in cases:
+        started = time.perf_counter()
+        response = client.post("/api/chat", json=payload)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        match = response.headers.get("X-Chat-Cache")
+        ok = match == expected and response.text == answer
+        failures += 0 if ok else 1
+        timings.setdefault(match, []).append(elapsed_ms)
+        print(f"{label:>8}: {match:<8} (기대 {expected:<8}) {elapsed_ms:7.1f}ms {'OK' if ok else 'FAILED'}")
+
+    print("=" * 60)
+    miss_ms = np.mean(timings.get("miss", [0]))
+    hit_ms = np.mean(timings.get("exact", []) + timings.get("semantic", []) or [0])
+    print(f"Miss 평균 {miss_ms:.1f}ms | Hit 평균 {hit_ms:.1f}ms | x{miss_ms / hit_ms:.0f}" if hit_ms else "Hit 없음")
+    print(f"Cache: {main.chat_cache.snapshot()}")
+    print(f"Result: {'OK' if failures == 0 else 'FAILED'} ({failures}/{len(cases)} 실패)")
+    sys.exit(0 if failures == 0 else 1)
+
+
+if __name__ == "__main__":
+    main_cli()
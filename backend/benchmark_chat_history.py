@@ -0,0 +1,92 @@
+"""
+[챗 대화 이력 압축 시뮬레이션]
+NewsGrid/ChatBot처럼 매 턴 기사 본문을 주입하는 세션을 크롤링 덤프(naver_news_*.json)로 재현하여,
+턴 수 증가에 따른 원본/압축 Prompt 토큰 수와 압축 소요 시간을 비교하는 스크립트입니다.
+
+Checks:
+1. Budget: 모든 턴의 압축 결과가 토큰 예산 이하인지 확인 (초과 시 종료 코드 1)
+2. Recency: 마지막 사용자 질문 문장이 압축 결과에 그대로 남아 있는지 확인
+
+Usage:
+    python backend/benchmark_chat_history.py
+    python backend/benchmark_chat_history.py --turns 30 --budget 4000 --recent 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from backend.chat_history import HistoryCompactor
+
+CRAWLER_DIR = Path(__file__).resolve().parents[1] / 'data' / 'storage' / 'raw' / 'crawler'
+
+
+def load_articles() -> list:
+    items = []
+    for path in sorted(CRAWLER_DIR.glob('naver_news_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            items.extend(json.load(f).get('items', []))
+    return items
+
+
+def news_question(articles: list, turn: int) -> tuple:
+    """NewsGrid.jsx와 같은 형식으로 기사 2건을 주입한 사용자 메시지와 질문 문장을 생성한다."""
+    picked = [articles[(turn * 2 + k) % len(articles)] for k in range(2)]
+    context = '\n'.join(
+        f"[기사 {k + 1}]\n제목: {news['title']}\n링크: {news['link']}\n내용: {news.get('content') or news['description']}\n"
+        for k, news in enumerate(picked)
+    )
+    question = f"{turn + 1}번째 질문: 위 기사들이 주가에 미칠 영향을 정리해줘"
+    return f"[참고 자료]\n{context}\n\n[질문]\n{question}", question
+
+
+def main():
+    parser = argparse.ArgumentParser(description='챗 대화 이력 압축 시뮬레이션')
+    parser.add_argument('--turns', type=int, default=20, help='시뮬레이션 턴 수')
+    parser.add_argument('--budget', type=int, default=6000, help='Prompt 토큰 예산')
+    parser.add_argument('--recent', type=int, default=6, help='원문 유지 최근 메시지 수')
+    args = parser.parse_args()
+
+    articles = load_articles()
+    if not articles:
+        print("[ERROR] 크롤링 덤프가 없습니다.")
+        sys.exit(1)
+
+    compactor = HistoryCompactor(token_budget=args.budget, recent_messages=args.recent)
+    print(f"Tokenizer: {'tiktoken' if compactor.counter.exact else '근사치'} | 기사 {len(articles)}건")
+
+    history = [{'role': 'system', 'content': '당신은 기업 기획전략실에서 20년간 근무한 베테랑 전략 담당자입니다.'}]
+    failures = 0
+    elapsed_total = 0.0
+    for turn in range(args.turns):
+        content, question = news_question(articles, turn)
+        history.append({'role': 'user', 'content': content})
+
+        started = time.perf_counter()
+        compacted, report = compactor.compact(history)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        elapsed_total += elapsed_ms
+
+        ok = report['prompt_tokens'] <= args.budget and question in compacted[-1]['content']
+        failures += 0 if ok else 1
+        if turn % 5 == 4 or turn == args.turns - 1 or not ok:
+            print(f"Turn {turn + 1:>3}: 원본 {report['original_tokens']:>7} -> {report['prompt_tokens']:>5} 토큰 "
+                  f"(요약 {report['summarized_messages']}, 제외 {report['dropped_messages']}) {elapsed_ms:.1f}ms "
+                  f"{'OK' if ok else 'FAILED'}")
+
+        # 모델 응답 (요약 보고서 분량) 추가
+        history.append({'role': 'assistant', 'content': f"{turn + 1}번째 답변: " + "기사 요약 및 주가 영향 분석 내용입니다. " * 40})
+
+    stats = compactor.snapshot()
+    print("=" * 60)
+    print(f"누적 절감: {stats['saved_tokens']} 토큰 ({stats['saved_ratio'] * 100:.1f}%) | 압축 평균 {elapsed_total / args.turns:.1f}ms/턴")
+    print(f"Result: {'OK' if failures == 0 else 'FAILED'} ({failures}/{args.turns} 실패)")
+    sys.exit(0 if failures == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+[읽기 API 동시 부하 테스트 (Sync Threadpool vs Async Engine)]
+uvicorn 서버를 별도 프로세스로 구동하고, 동일한 조회를 동기 엔드포인트(def + psycopg2, Threadpool 실행)와
+비동기 엔드포인트(async def + asyncpg)로 동시 요청하여 처리량/지연시간 및 Threadpool 점유 영향을 비교하는 스크립트입니다.
+
+Scenarios:
+1. sync: 기존 방식. def 엔드포인트가 AnyIO Threadpool(기본 40개)에서 동기 엔진으로 조회
+2. async: main.py의 async def 엔드포인트 (get_async_engine() Connection Pool)
+
+Checks:
+1. 처리량(req/s), 지연시간 p50/p95/p99, 오류 수
+2. Threadpool 점유 영향: 부하 중 Threadpool에서 실행되는 가벼운 동기 엔드포인트(/probe)의 응답 지연 p95
+
+Network Latency:
+    로컬 DB는 왕복 지연이 거의 없어 CPU 처리량만 비교됩니다. --db_rtt_ms 지정 시 서버와 DB 사이에
+    지연 주입 TCP Proxy를 두어 원격 DB(네트워크 왕복 지연)를 재현합니다. (서버는 POSTGRES_URL로 Proxy에 연결)
+
+Usage:
+    python backend/benchmark_db_load.py
+    python backend/benchmark_db_load.py --concurrency 128 --requests 3000
+    python backend/benchmark_db_load.py --db_rtt_ms 0    # 지연 주입 없이 로컬 DB 직접 연결
+    DB_POOL_SIZE=10 DB_MAX_OVERFLOW=20 python backend/benchmark_db_load.py
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlencode
+
+from sqlalchemy import text
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from data.schema.db_models import (engine, DB_URL, DIVIDEND_SERIES_VIEW, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                                   DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE)
+
+SEARCH_QUERIES = ['기업1', '기업2', '기업30', '기업', 'ㄱㅇ', '기업100']
+
+
+def create_server_app():
+    """async 엔드포인트(main.py)와 동일 조회의 동기 엔드포인트를 함께 노출하는 앱"""
+    from fastapi import FastAPI
+    from backend import main
+    from backend.json_rows import JSONBytesResponse, query_json
+    from data.schema.db_models import dispose_async_engine, get_async_engine
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # 기업명 인덱스는 시작 시 1회 적재 (요청 경로는 검색만 비교, 증분 갱신은 async 경로의 ensure_fresh_async가 담당)
+        await main.corp_index.ensure_fresh_async(get_async_engine())
+        yield
+        await dispose_async_engine()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_api_route("/async/dividends", main.get_dividends)
+    app.add_api_route("/async/search/corps", main.search_corps)
+
+    def sync_dividends(corp_code: str = None, stock_knd: str = "보통주"):
+        query = f"""
+            SELECT corp_code, corp_name, bsns_year AS year, reprt_code, stock_knd,
+                   dps, dividend_yield AS yield, payout_ratio
+            FROM {DIVIDEND_SERIES_VIEW}
+            WHERE stock_knd = %(stock_knd)s
+        """
+        params = {"stock_knd": stock_knd}
+        if corp_code:
+            query += " AND corp_code = %(corp_code)s"
+            params["corp_code"] = corp_code
+        query += " ORDER BY corp_code, period_key, reprt_code"
+        return JSONBytesResponse(query_json(engine, query, params))
+
+    def sync_search_corps(query: str, limit: int = 20):
+        return JSONBytesResponse(main.corp_index.search(query, limit=max(1, min(limit, 100))))
+
+    def probe():
+        return {"ok": True}
+
+    app.add_api_route("/sync/dividends", sync_dividends)
+    app.add_api_route("/sync/search/corps", sync_search_corps)
+    app.add_api_route("/probe", probe)
+    return app
+
+
+def serve(port: int):
+    import uvicorn
+    uvicorn.run(create_server_app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+async def run_proxy(listen_port: int, upstream_host: str, upstream_port: int, rtt_ms: float):
+    """방향별로 rtt_ms / 2 만큼 지연 후 전달하는 TCP Proxy (대역폭 제한 없음, 순서 보장)"""
+    delay = rtt_ms / 2000
+
+    async def pipe(reader, writer):
+        queue = asyncio.Queue()
+
+        async def forward():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    break
+                wait = due - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        task = asyncio.create_task(forward())
+        try:
+            while data := await reader.read(65536):
+                queue.put_nowait((time.monotonic() + delay, data))
+        except ConnectionError:
+            pass
+        queue.put_nowait((0, None))
+        await task
+
+    async def handle(client_reader, client_writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(upstream_host, upstream_port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer),
+                             return_exceptions=True)
+
+    server = await asyncio.start_server(handle, '127.0.0.1', listen_port)
+    async with server:
+        await server.serve_forever()
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+class KeepAliveConnection:
+    """
+    부하 생성용 최소 HTTP/1.1 Keep-Alive 클라이언트 (GET, Content-Length 응답 전용).
+    단일 CPU 환경에서 부하 생성기(httpx 등)의 CPU 사용량이 서버 측정값을 왜곡하지 않도록 파싱을 최소화한다.
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def get(self, path: str, params: dict = None) -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.port)
+        target = f"{path}?{urlencode(params)}" if params else path
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+        try:
+            head = await self.reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            body = await self.reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.close()
+            raise
+        return int(head[9:12]), body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_load(port: int, path: str, make_params, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(make_params())
+
+    async def worker():
+        nonlocal errors
+        conn = KeepAliveConnection(port)
+        while not queue.empty():
+            params = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                status, _ = await conn.get(path, params)
+                if status != 200:
+                    raise RuntimeError(status)
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                errors += 1
+        conn.close()
+
+    probe_latencies = []
+    stop = asyncio.Event()
+
+    async def prober():
+        # 부하 중 Threadpool 경유 요청의 대기 시간 측정
+        conn = KeepAliveConnection(port)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                await conn.get("/probe")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                pass
+            await asyncio.sleep(0.05)
+        conn.close()
+
+    probe_task = asyncio.create_task(prober())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.5),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'errors': errors,
+        'probe_p95': percentile(probe_latencies, 0.95),
+    }
+
+
+async def wait_ready(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = KeepAliveConnection(port)
+        try:
+            if (await conn.get("/probe"))[0] == 200:
+                return
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            conn.close()
+        await asyncio.sleep(0.2)
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+async def run(args):
+    with engine.connect() as conn:
+        corp_codes = [row[0] for row in conn.execute(text(f"SELECT DISTINCT corp_code FROM {DIVIDEND_SERIES_VIEW}"))]
+    if not corp_codes:
+        print(f"[ERROR] {DIVIDEND_SERIES_VIEW}에 데이터가 없습니다.")
+        sys.exit(1)
+
+    cases = [
+        ('dividends', lambda: {'corp_code': random.choice(corp_codes)}),
+        ('search/corps', lambda: {'query': random.choice(SEARCH_QUERIES)}),
+    ]
+    await wait_ready(args.port)
+    print(f"동시 요청 {args.concurrency} | 요청 {args.requests}건/시나리오 | DB RTT {args.db_rtt_ms}ms | "
+          f"Pool {DB_POOL_SIZE}+{DB_MAX_OVERFLOW} | Pre-ping {DB_POOL_PRE_PING} | Statement Cache {DB_STATEMENT_CACHE_SIZE}")
+    for name, make_params in cases:
+        print(f"\n[{name}]")
+        results = {}
+        for mode in ('sync', 'async'):
+            path = f"/{mode}/{name}"
+            await run_load(args.port, path, make_params, min(200, args.requests), args.concurrency)  # warm-up
+            results[mode] = m = await run_load(args.port, path, make_params, args.requests, args.concurrency)
+            print(f"  {mode:<5} {m['rps']:7.0f} req/s | p50 {m['p50']:7.1f}ms | p95 {m['p95']:7.1f}ms | "
+                  f"p99 {m['p99']:7.1f}ms | 오류 {m['errors']} | /probe p95 {m['probe_p95']:6.1f}ms")
+        print(f"  -> 처리량 x{results['async']['rps'] / max(results['sync']['rps'], 1e-9):.2f}, "
+              f"p95 {results['sync']['p95']:.1f} -> {results['async']['p95']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='읽기 API 동시 부하 테스트 (Sync vs Async)')
+    parser.add_argument('--concurrency', type=int, default=64, help='동시 요청 수')
+    parser.add_argument('--requests', type=int, default=2000, help='시나리오별 요청 수')
+    parser.add_argument('--db_rtt_ms', type=float, default=2.0, help='서버-DB 간 주입할 왕복 지연 (0이면 직접 연결)')
+    parser.add_argument('--port', type=int, default=8765, help='테스트 서버 포트')
+    parser.add_argument('--proxy_port', type=int, default=8766, help='지연 주입 Proxy 포트')
+    parser.add_argument('--serve', action='store_true', help='(내부용) 테스트 서버로 실행')
+    parser.add_argument('--proxy', action='store_true', help='(내부용) 지연 주입 Proxy로 실행')
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+    if args.proxy:
+        asyncio.run(run_proxy(args.proxy_port, DB_URL.host or 'localhost', DB_URL.port or 5432, args.db_rtt_ms))
+        return
+
+    processes, env = [], dict(os.environ)
+    if args.db_rtt_ms > 0:
+        processes.append(subprocess.Popen([sys.executable, __file__, '--proxy', '--proxy_port', str(args.proxy_port),
+                                           '--db_rtt_ms', str(args.db_rtt_ms)]))
+        env['POSTGRES_URL'] = DB_URL.set(host='127.0.0.1', port=args.proxy_port).render_as_string(hide_password=False)
+    processes.append(subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port)], env=env))
+    try:
+        asyncio.run(run(args))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
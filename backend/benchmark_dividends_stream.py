@@ -0,0 +1,169 @@
+"""
+[/api/dividends 전체 조회 응답 방식 벤치마크 (단일 응답 / Keyset Pagination / NDJSON Streaming)]
+전체 기업 배당 조회를 응답 방식별로 실행하여 첫 바이트까지의 시간과 최대 메모리 할당량을 비교하는 스크립트입니다.
+
+Modes:
+1. full: 전체 결과를 JSON 배열 1개로 인코딩 (기존 응답, dividend_series.fetch_all)
+2. page: limit행씩 X-Next-Cursor로 이어서 조회 (dividend_series.fetch_page)
+3. stream: 서버측 Cursor에서 batch행씩 NDJSON으로 생성 (dividend_series.stream_ndjson)
+
+Checks:
+1. 정합성: 페이지를 이어붙인 결과와 NDJSON 행이 단일 응답과 동일한지 확인
+2. 첫 바이트 시간(full은 본문 생성 완료, page는 첫 페이지, stream은 첫 Chunk), 전체 소요 시간(p50)
+3. 최대 할당량(tracemalloc peak): full은 요청 1회, page/stream은 전체 순회 중 최댓값 (전송한 페이지/Chunk는 보관하지 않음)
+4. 중단: 스트림 소비 Task를 첫 Chunk 후 취소했을 때 연결이 Pool로 반환되는지 확인
+
+Usage:
+    python backend/benchmark_dividends_stream.py
+    python backend/benchmark_dividends_stream.py --limit 500 --batch_rows 200 --repeat 50
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import orjson
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from data.schema.db_models import get_async_engine, dispose_async_engine
+from backend.dividend_series import fetch_all, fetch_page, stream_ndjson
+
+
+def make_modes(async_engine, stock_knd: str, limit: int, batch_rows: int):
+    """모드별 실행 함수: on_first()는 첫 바이트 시점에 1회 호출, 반환값은 응답 본문(페이지/Chunk)별 크기 목록"""
+
+    async def full(on_first):
+        body = await fetch_all(async_engine, stock_knd)
+        on_first()
+        return [len(body)]
+
+    async def page(on_first):
+        chunks, cursor = [], None
+        while True:
+            body, cursor = await fetch_page(async_engine, stock_knd, limit=limit, cursor=cursor)
+            if not chunks:
+                on_first()
+            chunks.append(len(body))  # 페이지는 요청마다 별도 응답이므로 보관하지 않음
+            if cursor is None:
+                return chunks
+
+    async def stream(on_first):
+        chunks = []
+        async for chunk in stream_ndjson(async_engine, stock_knd, batch_rows=batch_rows):
+            if not chunks:
+                on_first()
+            chunks.append(len(chunk))  # 전송 후 버려지는 Chunk는 보관하지 않음
+        return chunks
+
+    return {'full': full, f'page({limit})': page, f'stream({batch_rows})': stream}
+
+
+async def run_once(fn) -> tuple:
+    started = time.perf_counter()
+    first = []
+    chunks = await fn(lambda: first.append(time.perf_counter()))
+    ended = time.perf_counter()
+    return (first[0] - started) * 1000, (ended - started) * 1000, chunks
+
+
+async def measure(fn, repeat: int) -> dict:
+    await run_once(fn)  # warm-up (Connection Pool, Prepared Statement)
+    firsts, totals = [], []
+    for _ in range(repeat):
+        first, total, _ = await run_once(fn)
+        firsts.append(first)
+        totals.append(total)
+    firsts.sort()
+    totals.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    await run_once(fn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'first': firsts[len(firsts) // 2], 'total': totals[len(totals) // 2], 'peak_kb': peak / 1024}
+
+
+async def check_consistency(async_engine, stock_knd: str, limit: int, batch_rows: int) -> bool:
+    full = orjson.loads(await fetch_all(async_engine, stock_knd))
+
+    paged, cursor, pages = [], None, 0
+    while True:
+        body, cursor = await fetch_page(async_engine, stock_knd, limit=limit, cursor=cursor)
+        paged += orjson.loads(body)
+        pages += 1
+        if cursor is None:
+            break
+
+    streamed = []
+    async for chunk in stream_ndjson(async_engine, stock_knd, batch_rows=batch_rows):
+        streamed += [orjson.loads(line) for line in chunk.splitlines()]
+
+    ok = paged == full and streamed == full
+    print(f"[정합성] 전체 {len(full)}행 | 페이지 {pages}개 {len(paged)}행 | 스트림 {len(streamed)}행: {'OK' if ok else 'MISMATCH'}")
+    return ok
+
+
+async def check_cancel(async_engine, stock_knd: str, batch_rows: int) -> bool:
+    """클라이언트 연결 종료(응답 Task 취소) 후 스트림이 잡고 있던 연결이 Pool로 반환되는지 확인"""
+    first_chunk = asyncio.Event()
+
+    async def consume():
+        async for _ in stream_ndjson(async_engine, stock_knd, batch_rows=batch_rows):
+            first_chunk.set()
+            await asyncio.sleep(60)
+
+    task = asyncio.create_task(consume())
+    await first_chunk.wait()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    del task
+    gc.collect()  # 중단된 Async Generator 정리(aclose)는 이벤트 루프 Finalizer가 예약
+    await asyncio.sleep(0.2)
+    checked_out = async_engine.pool.checkedout()
+    print(f"[중단] 스트림 취소 후 사용 중 연결 {checked_out}개: {'OK' if checked_out == 0 else 'LEAKED'}")
+    return checked_out == 0
+
+
+async def run(args) -> bool:
+    async_engine = get_async_engine()
+    try:
+        ok = await check_consistency(async_engine, args.stock_knd, args.limit, args.batch_rows)
+        ok &= await check_cancel(async_engine, args.stock_knd, args.batch_rows)
+
+        print(f"\n[{args.stock_knd}] 첫 바이트 / 전체 p50, 최대 할당량 (반복 {args.repeat}회)")
+        base = None
+        for label, fn in make_modes(async_engine, args.stock_knd, args.limit, args.batch_rows).items():
+            m = await measure(fn, args.repeat)
+            base = base or m
+            print(f"  {label:<12} first {m['first']:7.2f}ms | total {m['total']:7.2f}ms | "
+                  f"peak {m['peak_kb']:8.1f}KB (x{m['peak_kb'] / base['peak_kb']:.2f})")
+        return ok
+    finally:
+        await dispose_async_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/api/dividends 전체 조회 응답 방식 벤치마크')
+    parser.add_argument('--stock_knd', type=str, default='보통주', help='주식 종류')
+    parser.add_argument('--limit', type=int, default=1000, help='페이지 크기')
+    parser.add_argument('--batch_rows', type=int, default=500, help='스트림 Cursor 조회 단위 (행)')
+    parser.add_argument('--repeat', type=int, default=30, help='모드별 반복 횟수')
+    args = parser.parse_args()
+
+    ok = asyncio.run(run(args))
+    print("=" * 60)
+    print(f"Result: {'OK' if ok else 'FAILED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+[읽기 API JSON 직렬화 경로 벤치마크]
+/api/dividends, /api/search/corps의 응답 생성 비용을 직렬화 경로별로 비교하는 스크립트입니다.
+
+Paths:
+1. pandas: pd.read_sql -> replace({np.nan: None}) -> to_dict(orient="records") -> FastAPI 기본 인코더 (기존 방식)
+2. rows: SQLAlchemy Row -> dict -> FastAPI 기본 인코더 (jsonable_encoder + json.dumps)
+3. orjson: DBAPI Cursor Tuple -> orjson bytes (json_rows.query_json / dumps)
+
+Checks:
+1. 정합성: 세 경로의 응답 JSON을 파싱한 결과가 동일한지 확인 (NaN -> null 포함)
+2. 요청당 지연시간(p50/p95)과 요청 1회 처리 중 최대 할당량(tracemalloc peak)
+
+Usage:
+    python backend/benchmark_json_path.py
+    python backend/benchmark_json_path.py --repeat 200 --query 기업1
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from data.schema.db_models import engine, DIVIDEND_SERIES_VIEW
+from backend.corp_index import CorpNameIndex
+from backend.json_rows import JSONBytesResponse, dumps, query_json
+
+DIVIDEND_COLUMNS = """
+    corp_code, corp_name, bsns_year AS year, reprt_code, stock_knd,
+    dps, dividend_yield AS yield, payout_ratio
+"""
+
+
+def dividend_query(corp_code: str, paramstyle: str) -> str:
+    """paramstyle: 'named' (SQLAlchemy text, :name) | 'pyformat' (psycopg2, %(name)s)"""
+    bind = (lambda name: f":{name}") if paramstyle == 'named' else (lambda name: f"%({name})s")
+    query = f"SELECT {DIVIDEND_COLUMNS} FROM {DIVIDEND_SERIES_VIEW} WHERE stock_knd = {bind('stock_knd')}"
+    if corp_code:
+        query += f" AND corp_code = {bind('corp_code')}"
+    return query + " ORDER BY corp_code, period_key, reprt_code"
+
+
+def default_encode(content) -> bytes:
+    """FastAPI가 response_model 없이 반환값을 직렬화하는 경로"""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def make_dividend_paths(corp_code: str):
+    params = {"stock_knd": "보통주", **({"corp_code": corp_code} if corp_code else {})}
+    named = text(dividend_query(corp_code, 'named'))
+    pyformat = dividend_query(corp_code, 'pyformat')
+
+    def pandas_path():
+        df = pd.read_sql(named, engine, params=params)
+        df = df.replace({np.nan: None})
+        return default_encode(df.to_dict(orient="records"))
+
+    def rows_path():
+        with engine.connect() as conn:
+            return default_encode([dict(row) for row in conn.execute(named, params).mappings()])
+
+    def orjson_path():
+        return JSONBytesResponse(query_json(engine, pyformat, params)).body
+
+    return {'pandas': pandas_path, 'rows': rows_path, 'orjson': orjson_path}
+
+
+def make_search_paths(index: CorpNameIndex, query: str):
+    def pandas_path():
+        return default_encode(pd.DataFrame(index.search(query)).replace({np.nan: None}).to_dict(orient="records"))
+
+    def rows_path():
+        return default_encode(index.search(query))
+
+    def orjson_path():
+        return JSONBytesResponse(index.search(query)).body
+
+    return {'pandas': pandas_path, 'rows': rows_path, 'orjson': orjson_path}
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up (Connection Pool, 쿼리 계획)
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'peak_kb': peak / 1024,
+    }
+
+
+def run_case(name: str, paths: dict, repeat: int) -> bool:
+    bodies = {label: json.loads(fn()) for label, fn in paths.items()}
+    consistent = all(body == bodies['pandas'] for body in bodies.values())
+    size = len(paths['orjson']())
+    print(f"\n[{name}] {len(bodies['orjson'])}건, 응답 {size / 1024:.1f}KB, 정합성 {'OK' if consistent else 'MISMATCH'}")
+    base = None
+    for label, fn in paths.items():
+        m = measure(fn, repeat)
+        base = base or m
+        print(f"  {label:<7} p50 {m['p50']:7.2f}ms | p95 {m['p95']:7.2f}ms | "
+              f"peak {m['peak_kb']:8.1f}KB | x{base['p50'] / m['p50']:.1f}")
+    return consistent
+
+
+def check_nan() -> bool:
+    """NaN/Infinity가 null로 인코딩되는지 확인 (pandas 경로의 replace({np.nan: None})와 동일 결과)"""
+    record = {'dps': 100, 'yield': float('nan'), 'payout_ratio': math.inf}
+    decoded = json.loads(dumps([record]))
+    ok = decoded == [{'dps': 100, 'yield': None, 'payout_ratio': None}]
+    print(f"NaN/Infinity -> null: {'OK' if ok else 'FAILED'} ({dumps([record]).decode()})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='읽기 API JSON 직렬화 경로 벤치마크')
+    parser.add_argument('--repeat', type=int, default=100, help='경로별 반복 횟수')
+    parser.add_argument('--corp_code', type=str, help='기업 지정 조회 대상 (기본: 첫 번째 기업)')
+    parser.add_argument('--query', type=str, default='기업', help='기업명 검색어')
+    args = parser.parse_args()
+
+    ok = check_nan()
+    with engine.connect() as conn:
+        corp_code = args.corp_code or conn.execute(
+            text(f"SELECT corp_code FROM {DIVIDEND_SERIES_VIEW} ORDER BY corp_code LIMIT 1")).scalar()
+
+    ok &= run_case('/api/dividends (전체)', make_dividend_paths(None), args.repeat)
+    ok &= run_case(f'/api/dividends?corp_code={corp_code}', make_dividend_paths(corp_code), args.repeat)
+
+    index = CorpNameIndex(engine)
+    index.load()
+    ok &= run_case(f'/api/search/corps?query={args.query}', make_search_paths(index, args.query), args.repeat)
+
+    print("=" * 60)
+    print(f"Result: {'OK' if ok else 'FAILED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+[챗 응답 캐시 (Exact + Semantic Response Cache)]
+대시보드에서 반복되는 거의 동일한 챗 요청(동일 데이터 + 유사 질문)에 대해 LLM 호출 없이 이전 응답을 재생하는 모듈입니다.
+
+Roles:
+1. Exact Match: 정규화(역할 소문자, 연속 공백 축약)한 전체 대화 이력의 SHA-256 해시로 조회
+2. Semantic Match (선택): 마지막 사용자 질문을 제외한 문맥(주입된 기사/데이터 및 이전 대화)이 정확히 같은 경우에 한해,
+                         마지막 질문의 임베딩 코사인 유사도가 임계값 이상이면 캐시 응답 사용
+   - 문맥 전체를 임베딩하면 수치만 다른 데이터(다른 기업/연도)가 높은 유사도로 잘못 일치하므로 질문만 비교
+3. Replay: 캐시된 응답을 일정 길이 조각으로 나누어 동일한 StreamingResponse 형식으로 전송
+4. Metrics: Exact/Semantic Hit, Miss, 저장 건수 집계
+
+Usage:
+    cache = ChatResponseCache(ttl=3600, embedder=embeddings.aembed_query, similarity_threshold=0.95)
+    lookup = await cache.lookup(request.messages)
+    if lookup.answer is not None: stream replay(lookup.answer)
+    else: ... cache.store(lookup, answer)
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 재생 시 전송 조각 길이 (문자 수)
+REPLAY_CHUNK_SIZE = 16
+
+
+def normalize_messages(messages: Iterable) -> List[Tuple[str, str]]:
+    """role/content를 가진 메시지(Pydantic 모델 또는 dict)를 (역할, 공백 정규화 본문) 목록으로 변환한다."""
+    normalized = []
+    for m in messages:
+        role = m["role"] if isinstance(m, dict) else m.role
+        content = m["content"] if isinstance(m, dict) else m.content
+        normalized.append((role.strip().lower(), ' '.join((content or '').split())))
+    return normalized
+
+
+def hash_messages(messages: List[Tuple[str, str]]) -> str:
+    payload = json.dumps(messages, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def split_last_question(messages: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """(마지막 사용자 질문 이전의 문맥, 마지막 사용자 질문). 마지막 메시지가 사용자 질문이 아니면 질문은 None."""
+    if messages and messages[-1][0] == 'user':
+        return messages[:-1], messages[-1][1]
+    return messages, None
+
+
+async def replay(answer: str, chunk_size: int = REPLAY_CHUNK_SIZE) -> AsyncIterator[str]:
+    """캐시된 응답을 스트리밍 조각으로 재생한다."""
+    for i in range(0, len(answer), chunk_size):
+        yield answer[i:i + chunk_size]
+
+
+@dataclass
+class CacheLookup:
+    """조회 결과. Miss인 경우 store()에 그대로 전달하여 응답을 저장한다."""
+    key: str
+    context_key: Optional[str]
+    embedding: Optional[np.ndarray]
+    answer: Optional[str] = None
+    match: str = 'miss'  # 'exact' | 'semantic' | 'miss'
+    similarity: Optional[float] = None
+
+
+class ChatResponseCache:
+    """
+    프로세스 내 LRU + TTL 챗 응답 캐시.
+    embedder(텍스트 -> 벡터 비동기 함수)를 지정한 경우에만 Semantic Match를 수행한다.
+    임베딩 호출이 실패하면 Exact Match만 사용한다.
+    """
+
+    def __init__(self,
+                 ttl: float = 3600.0,
+                 max_entries: int = 1000,
+                 embedder: Callable[[str], Awaitable[List[float]]] = None,
+                 similarity_threshold: float = 0.95):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        # key -> (answer, created_at monotonic, context_key, normalized embedding)
+        self._entries: "OrderedDict[str, Tuple[str, float, Optional[str], Optional[np.ndarray]]]" = OrderedDict()
+        # context_key -> 해당 문맥에서 저장된 응답 key 목록 (Semantic Match 후보)
+        self._by_context: Dict[str, List[str]] = {}
+        self.stats = {
+            'exact_hits': 0,
+            'semantic_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'embedding_errors': 0,
+        }
+
+    def _is_alive(self, created_at: float) -> bool:
+        return time.monotonic() - created_at < self.ttl
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        context_key = entry[2]
+        if context_key is not None:
+            keys = self._by_context.get(context_key, [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                self._by_context.pop(context_key, None)
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await self.embedder(text), dtype=np.float32)
+        except Exception as e:
+            self.stats['embedding_errors'] += 1
+            print(f"[ChatCache] 임베딩 실패: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def lookup(self, messages: Iterable, scope: str = '') -> CacheLookup:
+        """
+        Exact Match -> Semantic Match 순으로 조회한다.
+        scope: 메시지 외에 응답에 영향을 주는 요청 조건 (예: 검색 대상 기업). 다른 scope 간에는 일치하지 않는다.
+        """
+        normalized = [('scope', scope)] + normalize_messages(messages) if scope else normalize_messages(messages)
+        key = hash_messages(normalized)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_alive(entry[1]):
+                self._entries.move_to_end(key)
+                self.stats['exact_hits'] += 1
+                return CacheLookup(key, entry[2], entry[3], answer=entry[0], match='exact', similarity=1.0)
+            self._remove(key)
+
+        context, question = split_last_question(normalized)
+        if self.embedder is None or question is None:
+            self.stats['misses'] += 1
+            return CacheLookup(key, None, None)
+
+        context_key = hash_messages(context)
+        embedding = await self._embed(question)
+        if embedding is not None:
+            best_key, best_score = None, -1.0
+            for candidate in list(self._by_context.get(context_key, [])):
+                answer, created_at, _, vector = self._entries[candidate]
+                if not self._is_alive(created_at):
+                    self._remove(candidate)
+                    continue
+                score = float(np.dot(embedding, vector))
+                if score > best_score:
+                    best_key, best_score = candidate, score
+            if best_key is not None and best_score >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self.stats['semantic_hits'] += 1
+                return CacheLookup(key, context_key, embedding, answer=self._entries[best_key][0],
+                                   match='semantic', similarity=round(best_score, 4))
+
+        self.stats['misses'] += 1
+        return CacheLookup(key, context_key, embedding)
+
+    def store(self, lookup: CacheLookup, answer: str):
+        """Miss 조회 결과에 대해 생성된 응답을 저장한다. (빈 응답은 저장하지 않음)"""
+        if not answer or lookup.answer is not None:
+            return
+        self._remove(lookup.key)
+        has_vector = lookup.context_key is not None and lookup.embedding is not None
+        self._entries[lookup.key] = (answer, time.monotonic(),
+                                     lookup.context_key if has_vector else None,
+                                     lookup.embedding if has_vector else None)
+        if has_vector:
+            self._by_context.setdefault(lookup.context_key, []).append(lookup.key)
+        self.stats['stores'] += 1
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats['evictions'] += 1
+
+    def snapshot(self) -> dict:
+        """모니터링용 캐시 통계를 반환한다."""
+        stats = dict(self.stats)
+        stats['entries'] = len(self._entries)
+        stats['semantic_enabled'] = self.embedder is not None
+        stats['similarity_threshold'] = self.similarity_threshold
+        hits = stats['exact_hits'] + stats['semantic_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,204 @@
+"""
+[챗 대화 이력 압축 (Token-budgeted History Compaction)]
+/api/chat으로 전달되는 대화 이력을 토큰 예산 안으로 줄여 세션이 길어져도 Prompt 크기와 응답 지연이 증가하지 않도록 하는 모듈입니다.
+
+Roles:
+1. Token Counting: tiktoken(gpt-4o-mini 인코딩)으로 메시지별 토큰 수 계산
+   - 인코딩 파일을 받을 수 없는 환경에서는 문자 종류별 근사치(영문 4자/토큰, 한글 등 0.8토큰/자) 사용
+2. Sliding Window: 최근 recent_messages개 메시지는 원문 유지 (단, 주입된 대용량 문서는 max_message_tokens로 축약)
+3. Older Turns: 윈도우 이전 대화는 메시지별 앞부분만 남긴 요약 System 메시지 1건으로 대체 (추가 LLM 호출 없음)
+4. Budget: 총 토큰이 token_budget을 넘으면 요약 -> 오래된 메시지 순으로 제거, 마지막 사용자 메시지는 앞/뒤를 남기고 축약
+5. Metrics: 요청별 원본/압축 토큰 수와 누적 절감 토큰 수 집계
+
+Usage:
+    compactor = HistoryCompactor(token_budget=6000, recent_messages=6)
+    messages, report = compactor.compact(request.messages)
+"""
+
+import math
+from typing import Iterable, List, Tuple
+
+from backend.chat_llm import CHAT_MODEL
+
+# 메시지당 역할/구분자 토큰 (OpenAI Chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_HEADER = "[이전 대화 요약] 아래는 이전 대화의 앞부분 발췌입니다."
+TRUNCATION_MARK = "\n...(중략: 약 {omitted}토큰 생략)...\n"
+
+
+class TokenCounter:
+    """tiktoken 기반 토큰 계산기 (인코딩 로드 실패 시 근사치 사용)"""
+
+    def __init__(self, model: str = CHAT_MODEL):
+        self.model = model
+        self.encoding = None
+        try:
+            import tiktoken
+            self.encoding = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            print(f"[ChatHistory] tiktoken 인코딩 로드 실패, 근사치 사용: {e}")
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        ascii_chars = sum(1 for ch in text if ch.isascii())
+        return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.8)
+
+    @staticmethod
+    def _approx_cut(text: str, tokens: int) -> int:
+        """근사치 기준 누적 토큰이 tokens를 넘지 않는 최대 문자 수"""
+        used = 0.0
+        for i, ch in enumerate(text):
+            used += 0.25 if ch.isascii() else 0.8
+            if used > tokens:
+                return i
+        return len(text)
+
+    def truncate(self, text: str, limit: int, head_ratio: float = 0.7) -> str:
+        """토큰 수가 limit을 넘으면 앞부분(head_ratio)과 뒷부분을 남기고 중간을 생략한다. (생략 표시 포함 limit 이하)"""
+        total = self.count(text)
+        if total <= limit:
+            return text
+        mark = TRUNCATION_MARK.format(omitted=total - limit)
+        keep = max(limit - self.count(mark), 2)
+        head_tokens = int(keep * head_ratio)
+        tail_tokens = keep - head_tokens
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            head = self.encoding.decode(tokens[:head_tokens])
+            tail = self.encoding.decode(tokens[-tail_tokens:]) if tail_tokens else ''
+        else:
+            # 근사치 모드: 문자별 가중치(ASCII 0.25, 그 외 0.8)를 누적하여 토큰 수에 맞는 위치에서 자름
+            head = text[:self._approx_cut(text, head_tokens - 1)]
+            tail = text[len(text) - self._approx_cut(text[::-1], tail_tokens - 1):] if tail_tokens > 1 else ''
+        return head + mark + tail
+
+
+def to_pairs(messages: Iterable) -> List[Tuple[str, str]]:
+    """role/content를 가진 메시지(Pydantic 모델 또는 dict)를 (역할, 본문) 목록으로 변환한다."""
+    pairs = []
+    for m in messages:
+        role = m["role"] if isinstance(m, dict) else m.role
+        content = m["content"] if isinstance(m, dict) else m.content
+        pairs.append((role, content or ''))
+    return pairs
+
+
+class HistoryCompactor:
+    """
+    토큰 예산 기반 대화 이력 압축기.
+    선두 System 메시지 블록은 항상 맨 앞에 원문 유지(지시문), 그 이후 메시지에는 순서를 유지한 채 Sliding Window를 적용한다.
+    (대화 중간의 System 메시지는 윈도우 안에서는 제자리에 원문 유지, 윈도우 이전이면 요약에 포함)
+    """
+
+    def __init__(self,
+                 token_budget: int = 6000,
+                 recent_messages: int = 6,
+                 max_message_tokens: int = 2500,
+                 summary_tokens_per_message: int = 60,
+                 counter: TokenCounter = None):
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.max_message_tokens = max_message_tokens
+        self.summary_tokens_per_message = summary_tokens_per_message
+        self.counter = counter or TokenCounter()
+        self.stats = {'requests': 0, 'compacted': 0, 'original_tokens': 0, 'prompt_tokens': 0}
+
+    def _tokens(self, messages: List[Tuple[str, str]]) -> int:
+        return sum(self.counter.count(content) + MESSAGE_OVERHEAD_TOKENS for _, content in messages)
+
+    def _summarize(self, older: List[Tuple[str, str]]) -> List[str]:
+        """윈도우 이전 메시지를 '- 역할: 앞부분 발췌' 줄 목록으로 축약한다."""
+        lines = []
+        for role, content in older:
+            excerpt = ' '.join(self.counter.truncate(content, self.summary_tokens_per_message, head_ratio=1.0).split())
+            lines.append(f"- {role}: {excerpt}")
+        return lines
+
+    def compact(self, messages: Iterable) -> Tuple[List[dict], dict]:
+        """
+        압축된 메시지 목록({'role', 'content'})과 토큰 리포트를 반환한다.
+        리포트: original_tokens, prompt_tokens, saved_tokens, summarized/dropped_messages, exact(tiktoken 사용 여부)
+        """
+        pairs = to_pairs(messages)
+        original_tokens = self._tokens(pairs)
+
+        # 선두 System 블록만 고정 (중간 System 메시지를 앞으로 옮기면 대화 순서가 바뀜)
+        lead = next((i for i, m in enumerate(pairs) if m[0] != 'system'), len(pairs))
+        system, dialog = pairs[:lead], pairs[lead:]
+        window = max(1, self.recent_messages)
+        older, recent = dialog[:-window], dialog[-window:]
+
+        # 1. 윈도우 내 대용량 메시지(주입된 기사/재무표) 축약 (마지막 메시지는 예산 초과 시에만, System 메시지 제외)
+        recent = [
+            (role, self.counter.truncate(content, self.max_message_tokens))
+            if pos < len(recent) - 1 and role != 'system' else (role, content)
+            for pos, (role, content) in enumerate(recent)
+        ]
+        summary_lines = self._summarize(older)
+
+        def assemble():
+            result = list(system)
+            if summary_lines:
+                result.append(('system', SUMMARY_HEADER + '\n' + '\n'.join(summary_lines)))
+            result.extend(recent)
+            return result
+
+        # 2. 예산 초과 시: 요약 줄(오래된 순) -> 윈도우 메시지(오래된 순, 마지막 메시지 제외) 제거
+        #    (반복 재계산을 피하기 위해 줄/메시지별 토큰 수로 추정 후 최종 결과만 다시 계산)
+        line_tokens = [self.counter.count(line) + 1 for line in summary_lines]
+        recent_tokens = [self.counter.count(content) + MESSAGE_OVERHEAD_TOKENS for _, content in recent]
+        summary_base = self.counter.count(SUMMARY_HEADER) + MESSAGE_OVERHEAD_TOKENS
+        estimate = self._tokens(system) + sum(recent_tokens) + (summary_base + sum(line_tokens) if line_tokens else 0)
+        dropped = 0
+        while estimate > self.token_budget and (summary_lines or len(recent) > 1):
+            if summary_lines:
+                summary_lines.pop(0)
+                estimate -= line_tokens.pop(0) + (0 if line_tokens else summary_base)
+            else:
+                recent.pop(0)
+                estimate -= recent_tokens.pop(0)
+                dropped += 1
+        compacted = assemble()
+
+        # 3. 그래도 초과하면 마지막 메시지를 앞/뒤 보존 방식으로 축약 (질문은 보통 메시지 끝에 위치)
+        #    (근사치 모드의 반올림 오차로 예산을 넘는 경우 최대 3회 반복)
+        for _ in range(3):
+            overflow = self._tokens(compacted) - self.token_budget
+            if overflow <= 0 or not recent:
+                break
+            role, content = recent[-1]
+            limit = max(self.counter.count(content) - overflow, self.token_budget // 4)
+            recent[-1] = (role, self.counter.truncate(content, limit))
+            compacted = assemble()
+
+        prompt_tokens = self._tokens(compacted)
+        report = {
+            'original_tokens': original_tokens,
+            'prompt_tokens': prompt_tokens,
+            'saved_tokens': max(0, original_tokens - prompt_tokens),
+            'summarized_messages': len(older),
+            'dropped_messages': dropped,
+            'exact': self.counter.exact,
+        }
+        self.stats['requests'] += 1
+        self.stats['compacted'] += 1 if report['saved_tokens'] else 0
+        self.stats['original_tokens'] += original_tokens
+        self.stats['prompt_tokens'] += prompt_tokens
+        return [{'role': role, 'content': content} for role, content in compacted], report
+
+    def snapshot(self) -> dict:
+        """모니터링용 누적 토큰 절감 통계를 반환한다."""
+        stats = dict(self.stats)
+        stats['saved_tokens'] = stats['original_tokens'] - stats['prompt_tokens']
+        stats['saved_ratio'] = round(stats['saved_tokens'] / stats['original_tokens'], 4) if stats['original_tokens'] else 0.0
+        stats['token_budget'] = self.token_budget
+        stats['exact_tokenizer'] = self.counter.exact
+        return stats
@@ -0,0 +1,152 @@
+"""
+[공용 LLM 클라이언트 및 챗 프롬프트 (Chat LLM Service)]
+/api/chat 요청마다 생성되던 ChatOpenAI 클라이언트와 ChatPromptTemplate을 앱 수명 동안 재사용하기 위한 모듈입니다.
+
+Roles:
+1. Connection Pool: OpenAI 호출용 httpx.AsyncClient를 앱 시작 시 1회 생성 (Keep-Alive로 TLS Handshake 재사용)
+2. Prompt: System Prompt + History Placeholder 템플릿과 Chain(prompt | llm)을 1회 구성
+3. Streaming: 요청 메시지를 LangChain 메시지로 변환하여 토큰 단위 스트리밍
+4. Metrics: 요청별 TTFT(Time To First Token) 및 전체 응답 시간 기록, 최근 요청 기준 p50/p95 집계
+
+Usage:
+    chat_llm = ChatLLMService()            # FastAPI lifespan에서 생성
+    async for token in chat_llm.stream(to_langchain_messages(request.messages)): ...
+    await chat_llm.aclose()
+"""
+
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Iterable, List
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+
+CHAT_MODEL = "gpt-4o-mini"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+SYSTEM_PROMPT = (
+    "당신은 전문적인 금융 분석 보조 에이전트입니다.\n"
+    "사용자에게 정확하고 신뢰할 수 있는 금융 정보를 제공하세요.\n"
+    "제공된 기사나 데이터가 있다면 이를 기반으로 얻을 수 있는 인사이트를 추출하고 답변하세요.\n"
+    "'기사 출처: 링크'의 형태로 출처를 밝히세요\n"
+)
+
+# Prompt Template (모듈 로드 시 1회 구성)
+CHAT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="history"),
+])
+
+# 역할별 LangChain 메시지 타입 (정의되지 않은 역할은 무시)
+MESSAGE_TYPES = {
+    "user": HumanMessage,
+    "assistant": AIMessage,
+    "system": SystemMessage,
+}
+
+# 지연시간 통계에 사용할 최근 요청 수
+LATENCY_WINDOW = 500
+
+
+def to_langchain_messages(messages: Iterable) -> List:
+    """role/content를 가진 요청 메시지(Pydantic 모델 또는 dict)를 LangChain 메시지로 변환한다."""
+    history = []
+    for m in messages:
+        role = m["role"] if isinstance(m, dict) else m.role
+        content = m["content"] if isinstance(m, dict) else m.content
+        message_type = MESSAGE_TYPES.get(role)
+        if message_type is not None:
+            history.append(message_type(content=content))
+    return history
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class ChatLLMService:
+    """
+    앱 단위로 공유하는 LLM 클라이언트.
+    단일 이벤트 루프(FastAPI 앱) 안에서 생성/사용하며, 종료 시 aclose()로 Connection Pool을 정리한다.
+    """
+
+    def __init__(self,
+                 model: str = CHAT_MODEL,
+                 api_key: str = None,
+                 max_connections: int = 50,
+                 keepalive_expiry: float = 60.0,
+                 timeout: float = 60.0,
+                 max_retries: int = 2,
+                 llm=None):
+        self.model = model
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.max_retries = max_retries
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        # llm 지정 시 해당 Chat Model 사용 (오프라인 검증용 Fake LLM 등)
+        self.llm = llm or ChatOpenAI(
+            model=model,
+            streaming=True,
+            api_key=self.api_key,
+            http_async_client=self.http_client,
+            max_retries=max_retries,
+        )
+        self.chain = CHAT_PROMPT | self.llm
+        self._ttft_ms = deque(maxlen=LATENCY_WINDOW)
+        self._total_ms = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {'requests': 0, 'errors': 0}
+
+    async def stream(self, history: List) -> AsyncIterator[str]:
+        """LangChain 메시지 이력을 입력으로 응답 토큰을 스트리밍한다. TTFT는 첫 토큰 수신 시점 기준."""
+        self.stats['requests'] += 1
+        started = time.perf_counter()
+        ttft_ms = None
+        try:
+            async for chunk in self.chain.astream({"history": history}):
+                if chunk.content:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                        self._ttft_ms.append(ttft_ms)
+                    yield chunk.content
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            self._total_ms.append(total_ms)
+            ttft_label = f"{ttft_ms:.0f}ms" if ttft_ms is not None else "-"
+            print(f"[ChatLLM] TTFT {ttft_label} | Total {total_ms:.0f}ms | History {len(history)}건")
+
+    def get_embeddings(self, model: str = EMBEDDING_MODEL) -> OpenAIEmbeddings:
+        """공용 Connection Pool을 사용하는 OpenAI 임베딩 객체를 반환한다."""
+        return OpenAIEmbeddings(model=model, api_key=self.api_key,
+                                http_async_client=self.http_client, max_retries=self.max_retries)
+
+    def get_embedder(self, model: str = EMBEDDING_MODEL):
+        """공용 Connection Pool을 사용하는 임베딩 함수(텍스트 -> 벡터, 비동기)를 반환한다."""
+        return self.get_embeddings(model).aembed_query
+
+    def snapshot(self) -> dict:
+        """모니터링용 TTFT/응답 시간 통계를 반환한다. (최근 LATENCY_WINDOW건 기준)"""
+        ttft, total = list(self._ttft_ms), list(self._total_ms)
+        return {
+            **self.stats,
+            'model': self.model,
+            'ttft_ms_p50': round(percentile(ttft, 0.5), 1),
+            'ttft_ms_p95': round(percentile(ttft, 0.95), 1),
+            'total_ms_p50': round(percentile(total, 0.5), 1),
+            'total_ms_p95': round(percentile(total, 0.95), 1),
+        }
+
+    async def aclose(self):
+        await self.http_client.aclose()
@@ -0,0 +1,342 @@
+"""
+[기업명 자동완성 인덱스 (In-Memory Corp Name Index)]
+/api/search/corps 자동완성 요청을 DB 조회 없이 처리하기 위한 프로세스 내 검색 인덱스 모듈입니다.
+
+Roles:
+1. Loading: dart_corps 테이블의 상장사(stock_code 보유) 목록을 최초 1회 메모리에 적재 (상장사만 조회)
+2. Indexing: 기업명 문자 n-gram(1~2gram) Posting List 구성 (ILIKE '%query%' Full Scan 대체)
+3. Hangul Matching: 초성(ㅅㅅㅈㅈ) 및 자모 분해(삼성저 -> 삼성전자) 기반 부분 일치 검색
+4. Incremental Refresh: modify_date 기준 변경분만 주기적으로 반영 (전체 재적재 없이 갱신)
+   - modify_date는 일 단위(YYYYMMDD)이므로 마지막 반영일 당일 변경분도 다시 조회 (>=, 반영은 멱등)
+   - 마스터에서 삭제된 기업은 상장사 corp_code 집합과 비교하여 인덱스에서 제거
+   - ensure_fresh_async: 비동기 엔진으로 조회 (인덱스 구성/변경분 반영은 Worker Thread에서 실행)
+
+Ranking:
+    기존 calculate_priority 규칙과 동일 (Exact: 0, Starts With: 1, Contains: 2) -> 기업명 가나다순.
+    자모/초성 단위로만 일치하는 결과는 동일 규칙에 +3 가중치를 부여하여 직접 일치 결과 뒤에 배치합니다.
+"""
+
+import asyncio
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+
+# 한글 음절 분해 테이블 (Unicode Hangul Syllables: U+AC00 ~ U+D7A3)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 호환용 자모 범위 (키보드 입력 시 조합 전 상태로 들어오는 문자)
+COMPAT_JAMO_FIRST = 0x3131
+COMPAT_JAMO_LAST = 0x3163
+
+# 자모 단위 매칭 결과의 우선순위 가중치
+JAMO_PRIORITY_OFFSET = 3
+
+
+def to_choseong(name: str) -> str:
+    """문자열을 초성 문자열로 변환한다. (삼성전자 -> ㅅㅅㅈㅈ, 한글 외 문자는 유지)"""
+    chars = []
+    for ch in name:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def to_jamo(name: str) -> str:
+    """문자열을 자모 단위로 분해한다. (전 -> ㅈㅓㄴ, 한글 외 문자는 유지)"""
+    chars = []
+    for ch in name:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            chars.append(CHOSEONG[offset // 588])
+            chars.append(JUNGSEONG[(offset % 588) // 28])
+            jong = JONGSEONG[offset % 28]
+            if jong != " ":
+                chars.append(jong)
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def is_choseong_query(query: str) -> bool:
+    """쿼리가 초성(자음)으로만 구성되어 있는지 확인한다."""
+    return bool(query) and all(ch in CHOSEONG or ch.isspace() for ch in query)
+
+
+def has_compat_jamo(query: str) -> bool:
+    """쿼리에 조합되지 않은 자모가 포함되어 있는지 확인한다. (예: '삼ㅅ')"""
+    return any(COMPAT_JAMO_FIRST <= ord(ch) <= COMPAT_JAMO_LAST for ch in query)
+
+
+def match_priority(key: str, query: str) -> int:
+    """기존 calculate_priority 규칙 (Exact: 0, Starts With: 1, Contains: 2)"""
+    if key == query:
+        return 0
+    if key.startswith(query):
+        return 1
+    return 2
+
+
+class NGramPostings:
+    """
+    문자 n-gram(1gram, 2gram) -> 문서 ID 집합 Posting List.
+    2글자 이상의 쿼리는 모든 bigram Posting의 교집합으로 후보를 좁힌 뒤, 실제 부분 문자열 여부로 검증한다.
+    """
+
+    def __init__(self):
+        self.unigrams: Dict[str, Set[str]] = {}
+        self.bigrams: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def _grams(key: str):
+        unigrams = set(key)
+        bigrams = {key[i:i + 2] for i in range(len(key) - 1)}
+        return unigrams, bigrams
+
+    def add(self, doc_id: str, key: str):
+        unigrams, bigrams = self._grams(key)
+        for g in unigrams:
+            self.unigrams.setdefault(g, set()).add(doc_id)
+        for g in bigrams:
+            self.bigrams.setdefault(g, set()).add(doc_id)
+
+    def remove(self, doc_id: str, key: str):
+        unigrams, bigrams = self._grams(key)
+        for table, grams in ((self.unigrams, unigrams), (self.bigrams, bigrams)):
+            for g in grams:
+                postings = table.get(g)
+                if postings is None:
+                    continue
+                postings.discard(doc_id)
+                if not postings:
+                    del table[g]
+
+    def candidates(self, query: str) -> Set[str]:
+        """쿼리를 부분 문자열로 포함할 가능성이 있는 문서 ID 후보 집합을 반환한다."""
+        if len(query) == 1:
+            return self.unigrams.get(query, set())
+
+        # Posting 크기가 작은 bigram부터 교집합 (조기 종료)
+        grams = sorted({query[i:i + 2] for i in range(len(query) - 1)},
+                       key=lambda g: len(self.bigrams.get(g, ())))
+        result = None
+        for g in grams:
+            postings = self.bigrams.get(g)
+            if not postings:
+                return set()
+            result = set(postings) if result is None else result & postings
+            if not result:
+                return set()
+        return result
+
+
+@dataclass
+class CorpEntry:
+    corp_code: str
+    corp_name: str
+    stock_code: str
+    name_key: str       # 소문자 기업명 (ILIKE와 동일한 대소문자 무시 비교)
+    choseong_key: str   # 초성 문자열
+    jamo_key: str       # 자모 분해 문자열
+
+    def to_record(self) -> dict:
+        return {"corp_code": self.corp_code, "corp_name": self.corp_name, "stock_code": self.stock_code}
+
+
+class CorpNameIndex:
+    """
+    dart_corps 상장사 기업명 검색 인덱스.
+    Thread-safe: FastAPI 동기 엔드포인트는 threadpool에서 실행되므로 갱신/조회를 Lock으로 보호한다.
+    """
+
+    # 최초 적재는 인덱스 대상(상장사)만 조회 (비상장사까지 전체 조회 시 이벤트 루프에서 행 변환 시간이 길어짐)
+    LOAD_SQL = text("""
+        SELECT corp_code, corp_name, stock_code, modify_date
+        FROM dart_corps
+        WHERE NULLIF(TRIM(stock_code), '') IS NOT NULL
+    """)
+
+    DELTA_SQL = text("""
+        SELECT corp_code, corp_name, stock_code, modify_date
+        FROM dart_corps
+        WHERE modify_date >= :last_modify_date
+    """)
+
+    # 인덱스 대상(상장사) corp_code 집합 (삭제된 기업 정리용)
+    LISTED_SQL = text("""
+        SELECT corp_code
+        FROM dart_corps
+        WHERE NULLIF(TRIM(stock_code), '') IS NOT NULL
+    """)
+
+    def __init__(self, engine, refresh_interval: float = 300.0):
+        self.engine = engine
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._entries: Dict[str, CorpEntry] = {}
+        self._names = NGramPostings()
+        self._choseong = NGramPostings()
+        self._jamo = NGramPostings()
+        self._last_modify_date = ""
+        self._last_refresh = 0.0
+        self._loaded = False
+        self._async_lock = asyncio.Lock()
+
+    # --- Index Maintenance ---
+
+    def _add(self, corp_code: str, corp_name: str, stock_code: str):
+        entry = CorpEntry(
+            corp_code=corp_code,
+            corp_name=corp_name,
+            stock_code=stock_code,
+            name_key=corp_name.lower(),
+            choseong_key=to_choseong(corp_name.lower()),
+            jamo_key=to_jamo(corp_name.lower()),
+        )
+        self._entries[corp_code] = entry
+        self._names.add(corp_code, entry.name_key)
+        self._choseong.add(corp_code, entry.choseong_key)
+        self._jamo.add(corp_code, entry.jamo_key)
+
+    def _remove(self, corp_code: str):
+        entry = self._entries.pop(corp_code, None)
+        if entry is None:
+            return
+        self._names.remove(corp_code, entry.name_key)
+        self._choseong.remove(corp_code, entry.choseong_key)
+        self._jamo.remove(corp_code, entry.jamo_key)
+
+    def apply(self, rows: Iterable) -> int:
+        """
+        (corp_code, corp_name, stock_code, modify_date) 행을 인덱스에 반영한다.
+        상장 폐지 등으로 stock_code가 비어있는 기업은 인덱스에서 제거한다.
+        """
+        applied = 0
+        with self._lock:
+            for corp_code, corp_name, stock_code, modify_date in rows:
+                self._remove(corp_code)
+                stock_code = (stock_code or "").strip()
+                if stock_code and corp_name:
+                    self._add(corp_code, corp_name, stock_code)
+                if modify_date and modify_date > self._last_modify_date:
+                    self._last_modify_date = modify_date
+                applied += 1
+        return applied
+
+    def discard(self, corp_codes: Iterable[str]):
+        """마스터에서 삭제된 기업을 인덱스에서 제거한다."""
+        with self._lock:
+            for corp_code in corp_codes:
+                self._remove(corp_code)
+
+    def load(self):
+        """dart_corps 전체를 읽어 인덱스를 새로 구성한다."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(self.LOAD_SQL).fetchall()
+        self._rebuild(rows)
+
+    def _rebuild(self, rows: Iterable):
+        """새 인덱스를 Lock 밖에서 구성한 뒤 교체한다. (구성 중에도 기존 인덱스로 검색 가능)"""
+        fresh = CorpNameIndex(self.engine, self.refresh_interval)
+        fresh.apply(rows)
+        with self._lock:
+            self._entries = fresh._entries
+            self._names = fresh._names
+            self._choseong = fresh._choseong
+            self._jamo = fresh._jamo
+            self._last_modify_date = fresh._last_modify_date
+            self._last_refresh = time.monotonic()
+            self._loaded = True
+        print(f"[CorpIndex] 기업명 인덱스 적재 완료: {len(self._entries)}개 상장사")
+
+    def _apply_delta(self, rows: Iterable, listed: Iterable[str]) -> int:
+        """마지막 반영일 이후 변경된 행을 반영하고, 상장사 목록(listed)에 없는 기업(마스터에서 삭제)을 제거한다."""
+        applied = self.apply(rows)
+        listed = set(listed)
+        with self._lock:
+            removed = [corp_code for corp_code in self._entries if corp_code not in listed]
+        self.discard(removed)
+        self._last_refresh = time.monotonic()
+        if removed:
+            print(f"[CorpIndex] 삭제된 기업 제거: {len(removed)}건")
+        return applied
+
+    async def ensure_fresh_async(self, async_engine):
+        """
+        최초 조회 시 전체 적재, 이후 refresh_interval 경과 시 증분 갱신을 수행한다.
+        DB 조회는 async_engine으로 수행하고, 동시 요청 중 1건만 적재/갱신한다.
+        n-gram/초성/자모 인덱스 구성은 Worker Thread에서 실행하여 이벤트 루프를 막지 않는다.
+        """
+        if self._loaded and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        async with self._async_lock:
+            if not self._loaded:
+                async with async_engine.connect() as conn:
+                    rows = (await conn.execute(self.LOAD_SQL)).all()
+                await asyncio.to_thread(self._rebuild, rows)
+                return
+            if time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+            try:
+                async with async_engine.connect() as conn:
+                    rows = (await conn.execute(self.DELTA_SQL, {"last_modify_date": self._last_modify_date})).all()
+                    listed = (await conn.execute(self.LISTED_SQL)).scalars().all()
+                await asyncio.to_thread(self._apply_delta, rows, listed)
+            except Exception as e:
+                # 갱신 실패 시 기존 인덱스로 계속 서비스
+                self._last_refresh = time.monotonic()
+                print(f"[CorpIndex] 증분 갱신 실패: {e}")
+
+    # --- Query ---
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[dict]:
+        """쿼리와 일치하는 상장사를 우선순위 -> 기업명 순으로 최대 limit건 반환한다."""
+        query_key = query.strip().lower()
+        if not query_key:
+            return []
+
+        with self._lock:
+            ranked = {}
+
+            # 1. 직접 부분 일치 (기존 ILIKE '%query%'와 동일한 결과 집합)
+            for corp_code in self._names.candidates(query_key):
+                entry = self._entries[corp_code]
+                if query_key in entry.name_key:
+                    ranked[corp_code] = (match_priority(entry.name_key, query_key), entry.corp_name)
+
+            # 2. 초성 일치 (예: ㅅㅅㅈㅈ -> 삼성전자)
+            if is_choseong_query(query_key):
+                self._rank_secondary(ranked, self._choseong, "choseong_key", query_key)
+
+            # 3. 자모 분해 일치 (조합 중인 입력, 예: 삼성저 / 삼ㅅ -> 삼성전자)
+            if has_compat_jamo(query_key) or limit is None or len(ranked) < limit:
+                self._rank_secondary(ranked, self._jamo, "jamo_key", to_jamo(query_key))
+
+            if limit is None:
+                top = sorted(ranked.items(), key=lambda kv: kv[1])
+            else:
+                top = heapq.nsmallest(limit, ranked.items(), key=lambda kv: kv[1])
+            return [self._entries[corp_code].to_record() for corp_code, _ in top]
+
+    def _rank_secondary(self, ranked: dict, postings: NGramPostings, attr: str, query_key: str):
+        for corp_code in postings.candidates(query_key):
+            if corp_code in ranked:
+                continue
+            key = getattr(self._entries[corp_code], attr)
+            if query_key in key:
+                priority = JAMO_PRIORITY_OFFSET + match_priority(key, query_key)
+                ranked[corp_code] = (priority, self._entries[corp_code].corp_name)
+
+    def __len__(self):
+        return len(self._entries)
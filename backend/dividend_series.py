@@ -0,0 +1,144 @@
+"""
+[배당 시계열 조회 (Keyset Pagination / NDJSON Streaming)]
+/api/dividends 전체 기업 조회를 한 번에 메모리에 올리지 않고 나누어 응답하기 위한 모듈입니다.
+배당 시계열 Materialized View(dart_dividend_series)의 Unique Index 순서
+(stock_knd, corp_code, period_key, reprt_code)를 그대로 Keyset으로 사용합니다.
+
+Roles:
+1. Query: 조회 컬럼/필터/정렬 SQL 생성 (asyncpg $n 파라미터, 전체/페이지/스트림 공용)
+2. Pagination: 마지막 행의 (corp_code, period_key, reprt_code)를 불투명 Cursor 문자열로 인코딩
+   - 다음 페이지는 Row 비교 `(corp_code, period_key, reprt_code) > (...)`로 Index 위치에서 바로 시작 (OFFSET 미사용)
+3. Streaming: asyncpg 서버측 Cursor에서 batch_rows 행씩 읽어 NDJSON(행당 JSON 1줄) bytes로 전달
+   - 메모리는 batch 크기로 제한되며, 첫 batch 조회 직후 첫 바이트를 전송
+
+Usage:
+    body, next_cursor = await fetch_page(get_async_engine(), "보통주", limit=1000, cursor=None)
+    StreamingResponse(stream_ndjson(get_async_engine(), "보통주"), media_type=NDJSON_MEDIA_TYPE)
+"""
+
+import base64
+import binascii
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+import orjson
+
+from data.schema.db_models import DIVIDEND_SERIES_VIEW
+from backend.json_rows import dumps, dumps_ndjson, query_json_async
+
+# 응답 컬럼 (기존 /api/dividends 응답 형식 유지)
+DIVIDEND_COLUMNS = """
+    corp_code,
+    corp_name,
+    bsns_year AS year,
+    reprt_code,
+    stock_knd,
+    dps,
+    dividend_yield AS yield,
+    payout_ratio
+"""
+
+# Keyset 정렬 키 (View Unique Index 순서, stock_knd는 항상 등호 조건)
+KEYSET_COLUMNS = "corp_code, period_key, reprt_code"
+
+# 페이지 크기: cursor만 지정 시 기본값, limit 상한
+PAGE_LIMIT_DEFAULT = int(os.getenv("DIVIDENDS_PAGE_LIMIT", "1000"))
+PAGE_LIMIT_MAX = int(os.getenv("DIVIDENDS_PAGE_LIMIT_MAX", "5000"))
+# 스트리밍 시 서버측 Cursor에서 한 번에 읽는 행 수 (= 전송 Chunk 단위)
+STREAM_BATCH_ROWS = int(os.getenv("DIVIDENDS_STREAM_BATCH", "500"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def build_query(stock_knd: str, corp_code: Optional[str] = None, after: Optional[tuple] = None,
+                limit: Optional[int] = None, with_key: bool = False) -> Tuple[str, list]:
+    """
+    조회 SQL과 asyncpg 파라미터 목록을 반환한다.
+    after: 직전 페이지 마지막 행의 Keyset (corp_code, period_key, reprt_code)
+    with_key: 다음 Cursor 생성을 위해 period_key 컬럼을 마지막에 추가
+    """
+    args: list = [stock_knd]
+    columns = DIVIDEND_COLUMNS + (", period_key" if with_key else "")
+    query = f"SELECT {columns} FROM {DIVIDEND_SERIES_VIEW} WHERE stock_knd = $1"
+
+    # 기업 코드로 필터링이 필요한 경우 (확장성 고려)
+    if corp_code:
+        args.append(corp_code)
+        query += f" AND corp_code = ${len(args)}"
+    if after is not None:
+        args.extend(after)
+        n = len(args)
+        query += f" AND ({KEYSET_COLUMNS}) > (${n - 2}, ${n - 1}, ${n})"
+    query += f" ORDER BY {KEYSET_COLUMNS}"
+    if limit is not None:
+        args.append(limit)
+        query += f" LIMIT ${len(args)}"
+    return query, args
+
+
+def encode_cursor(corp_code: str, period_key: int, reprt_code: str) -> str:
+    """Keyset을 URL에 그대로 쓸 수 있는 불투명 문자열로 인코딩 (base64url, padding 제거)"""
+    raw = orjson.dumps([corp_code, period_key, reprt_code])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> tuple:
+    """encode_cursor의 역변환. 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        corp_code, period_key, reprt_code = orjson.loads(raw)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError(f"잘못된 cursor: {token}")
+    if not (isinstance(corp_code, str) and isinstance(period_key, int) and isinstance(reprt_code, str)):
+        raise ValueError(f"잘못된 cursor: {token}")
+    return corp_code, period_key, reprt_code
+
+
+async def fetch_all(async_engine, stock_knd: str, corp_code: Optional[str] = None) -> bytes:
+    """전체(또는 기업 지정) 조회 결과를 JSON 배열 bytes로 반환한다. (기존 응답)"""
+    query, args = build_query(stock_knd, corp_code)
+    return await query_json_async(async_engine, query, *args)
+
+
+async def fetch_page(async_engine, stock_knd: str, corp_code: Optional[str] = None,
+                     limit: int = PAGE_LIMIT_DEFAULT, cursor: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+    """
+    cursor 이후 최대 limit행을 JSON 배열 bytes로 반환한다.
+    limit + 1행을 조회하여 다음 페이지가 있을 때만 다음 cursor를 반환한다. (마지막 페이지면 None)
+    """
+    after = decode_cursor(cursor) if cursor else None
+    query, args = build_query(stock_knd, corp_code, after=after, limit=limit + 1, with_key=True)
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        records = await raw.driver_connection.fetch(query, *args)
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor(last['corp_code'], last['period_key'], last['reprt_code'])
+    rows: List[dict] = []
+    for record in records:
+        row = dict(record)
+        del row['period_key']
+        rows.append(row)
+    return dumps(rows), next_cursor
+
+
+async def stream_ndjson(async_engine, stock_knd: str, corp_code: Optional[str] = None,
+                        batch_rows: int = STREAM_BATCH_ROWS) -> AsyncIterator[bytes]:
+    """
+    서버측 Cursor(읽기 전용 Transaction)로 조회하며 batch_rows행마다 NDJSON bytes를 생성한다.
+    전송이 끝나거나 클라이언트 연결이 끊기면 Transaction을 닫고 연결을 Pool에 반환한다.
+    """
+    query, args = build_query(stock_knd, corp_code)
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        async with driver.transaction(readonly=True):
+            cursor = await driver.cursor(query, *args)
+            while True:
+                records = await cursor.fetch(batch_rows)
+                if not records:
+                    break
+                yield dumps_ndjson(map(dict, records))
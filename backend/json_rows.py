@@ -0,0 +1,101 @@
+"""
+[경량 JSON 응답 경로 (pandas-free Row Serialization)]
+조회 결과를 pandas DataFrame이나 FastAPI 기본 인코더(jsonable_encoder -> json.dumps)를 거치지 않고,
+DB 드라이버 Cursor의 Row Tuple에서 바로 orjson으로 인코딩한 JSON bytes를 응답하는 모듈입니다.
+
+Roles:
+1. Row Fetch: psycopg2 Cursor로 실행하여 SQLAlchemy Result/Row 객체 생성 생략 (컬럼명은 cursor.description)
+   - Async: asyncpg 비동기 엔진으로 실행 (이벤트 루프에서 대기, Threadpool 미사용)
+2. Encoding: orjson 1회 호출로 bytes 생성 (NaN/Infinity -> null, datetime -> ISO 8601, Decimal -> float)
+   - NDJSON: 행마다 JSON 1줄 (스트리밍 응답용)
+3. Response: 인코딩된 bytes를 그대로 전송하는 JSONBytesResponse (FastAPI 재직렬화 없음)
+
+Usage:
+    body = query_json(engine, "SELECT ... WHERE corp_code = %(corp_code)s", {"corp_code": corp_code})
+    body = await query_json_async(get_async_engine(), "SELECT ... WHERE corp_code = $1", corp_code)
+    return JSONBytesResponse(body)
+    return JSONBytesResponse(dumps(records))
+"""
+
+from decimal import Decimal
+from typing import Any, List, Optional
+
+import orjson
+from fastapi.responses import Response
+
+# orjson 기본 옵션: dict 외 키(예: int)를 문자열로 변환
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any):
+    """orjson이 기본 지원하지 않는 타입 변환 (NUMERIC 컬럼 등)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"JSON 직렬화를 지원하지 않는 타입: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON bytes 인코딩. float NaN/Infinity는 null로 변환된다. (orjson 기본 동작)"""
+    return orjson.dumps(obj, default=_default, option=DUMPS_OPTIONS)
+
+
+def dumps_ndjson(rows) -> bytes:
+    """
+    행마다 JSON 1줄(NDJSON)로 인코딩한 bytes. (개행 포함)
+    orjson 결과 bytes는 크기와 무관하게 내부 버퍼(약 4KB)를 유지하므로 목록으로 모으지 않고 바로 이어붙인다.
+    """
+    option = DUMPS_OPTIONS | orjson.OPT_APPEND_NEWLINE
+    buffer = bytearray()
+    for row in rows:
+        buffer += orjson.dumps(row, default=_default, option=option)
+    return bytes(buffer)
+
+
+def fetch_records(engine, query: str, params: Optional[dict] = None) -> List[dict]:
+    """
+    DBAPI Cursor로 쿼리를 실행하여 {컬럼명: 값} 목록을 반환한다.
+    query는 드라이버 파라미터 형식(psycopg2: %(name)s)을 사용한다.
+    """
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or {})
+        columns = [c[0] for c in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.commit()
+    finally:
+        conn.close()
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def query_json(engine, query: str, params: Optional[dict] = None) -> bytes:
+    """쿼리 결과를 JSON 배열 bytes로 반환한다."""
+    return dumps(fetch_records(engine, query, params))
+
+
+async def fetch_records_async(async_engine, query: str, *args) -> List[dict]:
+    """
+    비동기 엔진 Pool의 asyncpg 연결로 쿼리를 실행하여 {컬럼명: 값} 목록을 반환한다.
+    query는 asyncpg 파라미터 형식($1, $2, ...)을 사용한다.
+    SQLAlchemy Result 계층을 거치지 않고 asyncpg Prepared Statement 캐시(statement_cache_size)를 직접 사용한다.
+    """
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        records = await raw.driver_connection.fetch(query, *args)
+    return [dict(record) for record in records]
+
+
+async def query_json_async(async_engine, query: str, *args) -> bytes:
+    """쿼리 결과를 JSON 배열 bytes로 반환한다. (비동기)"""
+    return dumps(await fetch_records_async(async_engine, query, *args))
+
+
+class JSONBytesResponse(Response):
+    """이미 인코딩된 JSON bytes를 그대로 전송하는 응답 (dict/list를 받으면 orjson으로 인코딩)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
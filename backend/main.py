@@ -1,23 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, text
-import pandas as pd
-import numpy as np
+from sqlalchemy import create_engine
 import os
 import sys
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
-# LangChain Imports
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-
 # Add project root to sys.path to import modules from 'data'
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from data.collectors.crawler.naver_news_crawler import crawl_naver_news
+from data.collectors.crawler.naver_news_crawler import crawl_naver_news_async, close_async_client, augment_financial_query
+from data.collectors.crawler.article_store import get_article_store
+from data.collectors.crawler.news_db import search_local_news, upsert_news_items, record_news_request
+from data.collectors.crawler.news_ingest_worker import NewsIngestWorker, start_background_worker
 
 import json
 from pathlib import Path
@@ -28,7 +25,103 @@ from pathlib import Path
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
 load_dotenv(dotenv_path=env_path)
 
-app = FastAPI(title="Financial Agent API")
+# 앱 수명 동안 공유하는 LLM 클라이언트 및 응답 캐시 (lifespan에서 생성)
+chat_llm = None
+chat_cache = None
+history_compactor = None
+rag_retriever = None
+
+# 챗 응답 캐시 유지 시간 (초, 0이면 비활성)
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+# 마지막 질문 임베딩 유사도 기반 Semantic Match 임계값 (미설정 시 Exact Match만 사용, 예: 0.95)
+CHAT_CACHE_SIMILARITY = os.getenv("CHAT_CACHE_SIMILARITY")
+# 대화 이력 토큰 예산 및 원문 유지 최근 메시지 수 (초과분은 요약/축약)
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "6000"))
+CHAT_RECENT_MESSAGES = int(os.getenv("CHAT_RECENT_MESSAGES", "6"))
+
+# 검색 증강(RAG) 설정: 색인 저장소(memory | pgvector), 임베딩(hashing | openai), 주입 Chunk 수, 최소 유사도, 색인 갱신 주기(초)
+# OpenAI 임베딩은 유료 API 호출이므로 명시 설정 시에만 사용 (memory 색인과 함께 쓰면 프로세스 시작마다 전체 재임베딩)
+RAG_ENABLED = os.getenv("RAG_ENABLED", "1") == "1"
+RAG_BACKEND = os.getenv("RAG_BACKEND", "memory")
+RAG_EMBEDDER = os.getenv("RAG_EMBEDDER", "hashing")
+RAG_TOP_K = int(os.getenv("RAG_TOP_K", "5"))
+RAG_MIN_SCORE = float(os.getenv("RAG_MIN_SCORE", "0.2"))
+RAG_REFRESH_INTERVAL = float(os.getenv("RAG_REFRESH_INTERVAL", "3600"))
+# 색인 대상 뉴스의 최대 수집 경과 일수 (0이면 제한 없음)
+RAG_NEWS_MAX_AGE_DAYS = float(os.getenv("RAG_NEWS_MAX_AGE_DAYS", "30"))
+
+def create_rag_retriever(llm_service):
+    """
+    환경변수 설정에 따라 임베딩/색인 저장소를 선택하여 RAG 검색기를 생성합니다.
+    LLM 클라이언트가 없으면(OpenAI 미설정) Hashing 임베딩으로 대체합니다.
+    """
+    if RAG_EMBEDDER != "hashing" and llm_service is None:
+        print("[RAG] LLM 클라이언트 미설정: Hashing 임베딩으로 대체합니다.")
+    if RAG_EMBEDDER == "hashing" or llm_service is None:
+        embedder, model_name = HashingEmbedder(), HashingEmbedder().model_name
+    else:
+        embedder, model_name = llm_service.get_embeddings(), EMBEDDING_MODEL
+        if RAG_BACKEND != "pgvector":
+            print("[RAG] OpenAI 임베딩 + memory 색인: 프로세스 시작마다 전체 Chunk를 재임베딩합니다. (RAG_BACKEND=pgvector 권장)")
+    index = PgVectorIndex(engine, model_name) if RAG_BACKEND == "pgvector" else InMemoryVectorIndex()
+    return RagRetriever(engine, embedder, index, top_k=RAG_TOP_K, min_score=RAG_MIN_SCORE,
+                        news_max_age_days=RAG_NEWS_MAX_AGE_DAYS or None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 시 공용 리소스를 생성하고 정리합니다.
+    - 배당 시계열 Materialized View 확인 (없으면 생성)
+    - LLM 클라이언트(Connection Pool) 및 Chain 1회 구성, 챗 응답 캐시 및 대화 이력 압축기(Tokenizer 로드) 생성
+      (OpenAI 미설정 등으로 생성 실패 시 /api/chat만 503으로 응답하고 나머지 API는 정상 구동)
+    - RAG 색인 주기 갱신 Task 구동 (최초 색인 완료 전에는 검색 없이 응답)
+    - 뉴스 백그라운드 수집 Worker 구동 (NEWS_INGEST_INTERVAL 설정 시)
+    - 종료 시 DART/뉴스 크롤러/LLM HTTP 클라이언트 및 비동기 DB Connection Pool 정리
+    """
+    global chat_llm, chat_cache, history_compactor, rag_retriever, news_ingest_stop
+    try:
+        # /api/dividends 배당 시계열 View가 없는 기존 DB 대비 (이미 존재하면 무시)
+        create_dividend_series(engine)
+    except Exception as e:
+        print(f"[Dividends] 배당 시계열 View 생성 실패: {e}")
+    try:
+        chat_llm = ChatLLMService()
+    except Exception as e:
+        chat_llm = None
+        print(f"[ChatLLM] LLM 클라이언트 생성 실패, /api/chat 비활성: {e}")
+    history_compactor = HistoryCompactor(token_budget=CHAT_TOKEN_BUDGET, recent_messages=CHAT_RECENT_MESSAGES)
+    if CHAT_CACHE_TTL > 0:
+        cache_embedder = None
+        if CHAT_CACHE_SIMILARITY:
+            cache_embedder = chat_llm.get_embedder() if chat_llm else HashingEmbedder().aembed_query
+        chat_cache = ChatResponseCache(
+            ttl=CHAT_CACHE_TTL,
+            embedder=cache_embedder,
+            similarity_threshold=float(CHAT_CACHE_SIMILARITY or 1.0),
+        )
+    rag_task = None
+    if RAG_ENABLED:
+        try:
+            rag_retriever = create_rag_retriever(chat_llm)
+            rag_task = asyncio.create_task(rag_retriever.refresh_forever(RAG_REFRESH_INTERVAL))
+        except Exception as e:
+            print(f"[RAG] 검색기 초기화 실패, 검색 없이 동작: {e}")
+    if NEWS_INGEST_INTERVAL > 0:
+        news_ingest_stop = start_background_worker(NewsIngestWorker(interval=NEWS_INGEST_INTERVAL))
+    try:
+        yield
+    finally:
+        if rag_task is not None:
+            rag_task.cancel()
+        if news_ingest_stop is not None:
+            news_ingest_stop.set()
+        if chat_llm is not None:
+            await chat_llm.aclose()
+        await dispose_async_engine()
+        await dart_client.aclose()
+        await close_async_client()
+
+app = FastAPI(title="Financial Agent API", lifespan=lifespan)
 
 class Message(BaseModel):
     role: str
@@ -36,6 +129,9 @@ class Message(BaseModel):
 
 class ChatRequest(BaseModel):
     messages: List[Message]
+    # 검색 증강 옵션: 대상 기업(해당 기업 자료 + 뉴스만 검색), 검색 사용 여부
+    corp_code: Optional[str] = None
+    retrieval: bool = True
 
 app.add_middleware(
     CORSMiddleware,
@@ -43,10 +139,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저에서 다음 페이지 Cursor 헤더를 읽을 수 있도록 노출
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Import engine from shared module
-from data.schema.db_models import engine
+from data.schema.db_models import engine, get_async_engine, dispose_async_engine, create_dividend_series
+from backend.corp_index import CorpNameIndex
+from backend.query_cache import QueryResultCache
+from backend.json_rows import JSONBytesResponse
+from backend.dividend_series import (
+    fetch_all as fetch_all_dividends, fetch_page as fetch_dividend_page, stream_ndjson as stream_dividend_rows,
+    NDJSON_MEDIA_TYPE, PAGE_LIMIT_DEFAULT as DIVIDENDS_PAGE_LIMIT, PAGE_LIMIT_MAX as DIVIDENDS_PAGE_LIMIT_MAX,
+)
+from backend.chat_llm import ChatLLMService, EMBEDDING_MODEL, to_langchain_messages
+from backend.chat_cache import ChatResponseCache, replay
+from backend.chat_history import HistoryCompactor
+from backend.rag_index import HashingEmbedder, InMemoryVectorIndex, PgVectorIndex, RagRetriever, attach_context, question_of
+
+# 기업명 자동완성 인덱스 (프로세스 내 단일 인스턴스)
+corp_index = CorpNameIndex(engine, refresh_interval=300)
 
 @app.get("/")
 def read_root():
@@ -57,57 +169,36 @@ import requests
 # ... (기존 코드 유지)
 
 @app.get("/api/search/corps")
-def search_corps(query: str):
+async def search_corps(query: str, limit: int = 20):
     """
     입력된 쿼리에 맞는 기업명 목록을 추천합니다.
-    PostgreSQL DB에서 stock_code가 있는 상장사만 검색합니다.
+    stock_code가 있는 상장사만 대상으로 하며, DB 대신 메모리 인덱스(corp_index)에서 검색합니다.
+    정렬: Exact Match -> Starts With -> Contains -> 초성/자모 일치, 동일 순위 내 기업명 가나다순
+    결과는 orjson으로 바로 인코딩하여 전송합니다.
+    색인 적재/증분 갱신은 비동기 엔진으로 조회하므로 Threadpool을 점유하지 않습니다.
     """
     if not query or len(query) < 1:
-        return []
+        return JSONBytesResponse([])
     
     try:
-        # 1. SQL: 조건에 맞는 데이터를 모두 가져옵니다 (정렬은 Python에서 처리)
-        sql = text("""
-            SELECT corp_code, corp_name, stock_code 
-            FROM dart_corps 
-            WHERE stock_code IS NOT NULL 
-              AND stock_code != '' 
-              AND corp_name ILIKE :query
-        """)
-        
-        df_matches = pd.read_sql(sql, engine, params={"query": f"%{query}%"})
-        
-        if df_matches.empty:
-            return []
-
-        # 2. Python Sort: 우선순위 점수 계산 (낮을수록 상위)
-        # Priority 1: Exact Match (0)
-        # Priority 2: Starts With (1)
-        # Priority 3: Contains (2)
-        query_lower = query.lower()
-        
-        def calculate_priority(name):
-            name_lower = name.lower()
-            if name_lower == query_lower:
-                return 0
-            elif name_lower.startswith(query_lower):
-                return 1
-            else:
-                return 2
-
-        df_matches['priority'] = df_matches['corp_name'].apply(calculate_priority)
-        
-        # 3. Sort: Priority(오름차순) -> CorpName(가나다순)
-        # Python의 문자열 정렬은 유니코드 표준을 따르므로 한글 가나다순이 정확함
-        df_matches = df_matches.sort_values(by=['priority', 'corp_name'], ascending=[True, True])
-        
-        return df_matches[['corp_code', 'corp_name', 'stock_code']].to_dict(orient="records")
+        # 최초 요청 시 dart_corps 적재, 이후 주기적으로 변경분(modify_date)만 반영
+        await corp_index.ensure_fresh_async(get_async_engine())
+        return JSONBytesResponse(corp_index.search(query, limit=max(1, min(limit, 100))))
     except Exception as e:
         print(f"DB Search Error: {e}")
-        return []
+        return JSONBytesResponse([])
 
-import httpx
 import asyncio
+import time
+from datetime import datetime, timezone
+from data.collectors.dart.fs_cache import FinancialStatementCache
+from data.collectors.dart.dart_client import get_dart_client
+
+# DART 재무제표 응답 캐시 (data/storage/raw/dart/fs_*.json 공유)
+fs_cache = FinancialStatementCache()
+
+# 공용 DART 클라이언트 (Connection Pool, Rate Limit, Retry 공유)
+dart_client = get_dart_client()
 
 # ... (기존 import)
 
@@ -120,8 +211,6 @@ async def get_financial_statements(corp_code: str, start_year: str = "2023", end
     if not api_key:
         raise HTTPException(status_code=500, detail="DART API KEY not configured")
 
-    url = "https://opendart.fss.or.kr/api/fnlttSinglAcnt.json"
-    
     # 보고서 코드 매핑 (1Q, 2Q, 3Q, 4Q)
     # 1분기: 11013, 반기: 11012, 3분기: 11014, 사업보고서: 11011
     reprt_codes = [
@@ -134,20 +223,18 @@ async def get_financial_statements(corp_code: str, start_year: str = "2023", end
     tasks = []
     years = range(int(start_year), int(end_year) + 1)
 
-    async with httpx.AsyncClient() as client:
-        for year in years:
-            for code, q_name in reprt_codes:
-                params = {
-                    "crtfc_key": api_key,
-                    "corp_code": corp_code,
-                    "bsns_year": str(year),
-                    "reprt_code": code
-                }
-                # 각 요청을 비동기 태스크로 생성
-                tasks.append(fetch_dart_data(client, url, params, str(year), q_name))
-        
-        # 병렬 실행
-        results = await asyncio.gather(*tasks)
+    for year in years:
+        for code, q_name in reprt_codes:
+            params = {
+                "corp_code": corp_code,
+                "bsns_year": str(year),
+                "reprt_code": code
+            }
+            # 각 요청을 비동기 태스크로 생성
+            tasks.append(fetch_dart_data(params, str(year), q_name))
+    
+    # 병렬 실행 (동시 요청 수 및 초당 호출량은 공용 DART 클라이언트에서 제한)
+    results = await asyncio.gather(*tasks)
 
     # 결과 필터링 및 평탄화 (Flatten)
     # 에러가 있거나 데이터가 없는 분기는 제외, 유효한 데이터만 하나의 리스트로 합침
@@ -158,6 +245,8 @@ async def get_financial_statements(corp_code: str, start_year: str = "2023", end
             year = res['year']
             quarter = res['quarter']
             for item in res['list']:
+                # 캐시된 원본 응답이 변형되지 않도록 복사본에 필드 추가
+                item = dict(item)
                 item['period_name'] = f"{year}.{quarter}"
                 # 정렬을 위한 정수형 키 추가 (20231, 20232...)
                 item['sort_key'] = int(f"{year}{quarter[0]}") 
@@ -168,166 +257,220 @@ async def get_financial_statements(corp_code: str, start_year: str = "2023", end
 
     return {"status": "000", "message": "정상", "list": all_data}
 
-async def fetch_dart_data(client, url, params, year, quarter):
-    try:
-        response = await client.get(url, params=params)
-        data = response.json()
-        data['year'] = year
-        data['quarter'] = quarter
-        return data
-    except Exception as e:
-        print(f"Error fetching {year} {quarter}: {e}")
-        return None
+async def fetch_dart_data(params, year, quarter):
+    corp_code, bsns_year, reprt_code = params["corp_code"], params["bsns_year"], params["reprt_code"]
+
+    # 1. 캐시 조회 (확정 공시는 무기한, 진행 중인 보고서는 TTL 내에서만 유효)
+    data = await fs_cache.aget(corp_code, bsns_year, reprt_code)
+
+    # 2. Cache Miss: DART API 호출 후 원본 응답 저장
+    if data is None:
+        started = time.perf_counter()
+        try:
+            data = await dart_client.get_json("fnlttSinglAcnt.json", params)
+            fs_cache.record_upstream((time.perf_counter() - started) * 1000)
+            await fs_cache.aput(corp_code, bsns_year, reprt_code, data)
+        except Exception as e:
+            fs_cache.record_upstream((time.perf_counter() - started) * 1000, ok=False)
+            print(f"Error fetching {year} {quarter}: {e}")
+            return None
+
+    return {**data, "year": year, "quarter": quarter}
+
+@app.get("/api/financial_statements/cache")
+def get_financial_statements_cache_stats():
+    """재무제표 응답 캐시의 Hit/Miss 및 DART 호출 지연시간 통계를 반환합니다."""
+    return fs_cache.snapshot()
 
 # ... (기존 API들 유지)
 
 @app.get("/api/dividends")
-def get_dividends(corp_code: Optional[str] = None, stock_knd: str = "보통주"):
+async def get_dividends(corp_code: Optional[str] = None, stock_knd: str = "보통주",
+                        limit: Optional[int] = Query(None, ge=1, le=DIVIDENDS_PAGE_LIMIT_MAX),
+                        cursor: Optional[str] = None):
     """
     데이터베이스에서 배당 데이터를 가져옵니다.
     주식 종류 필터링 및 시계열 정렬을 백엔드에서 수행하여 데이터 정합성을 보장합니다.
+    기업명 병합과 정수 기간 키(period_key)가 미리 계산된 Materialized View(dart_dividend_series)를
+    (stock_knd, corp_code, period_key) Covering Index 순서대로 읽으므로 JOIN/정렬 연산 없이 응답합니다.
+    조회 Row는 orjson으로 바로 인코딩하여 전송합니다. (FastAPI 기본 인코더 생략)
+    비동기 엔진(asyncpg)으로 조회하여 동시 요청이 Threadpool을 점유하지 않습니다.
+
+    limit 또는 cursor 지정 시 Keyset Pagination으로 (corp_code, 연도, 분기) 순서의 한 페이지만 반환하며,
+    다음 페이지가 있으면 X-Next-Cursor 헤더의 값을 cursor로 다시 요청합니다. (응답 본문 형식은 동일)
     """
     try:
-        # SQL 쿼리 정의 (시계열 정렬 로직 포함)
-        query = text("""
-            SELECT 
-                d.corp_code,
-                c.corp_name,
-                d.bsns_year AS year,
-                d.reprt_code,
-                d.stock_knd,
-                d.dps,
-                d.dividend_yield AS yield,
-                d.payout_ratio
-            FROM dart_dividends d
-            JOIN dart_corps c ON d.corp_code = c.corp_code
-            WHERE d.stock_knd = :stock_knd
-            ORDER BY 
-                d.corp_code,
-                CAST(d.bsns_year AS INTEGER) ASC,
-                CASE d.reprt_code
-                    WHEN '1Q' THEN 1
-                    WHEN '2Q' THEN 2
-                    WHEN '3Q' THEN 3
-                    WHEN '4Q' THEN 4
-                    ELSE 9
-                END ASC
-        """)
-        
-        params = {"stock_knd": stock_knd}
-        
-        # 기업 코드로 필터링이 필요한 경우 (확장성 고려)
-        if corp_code:
-            # 쿼리에 조건 추가 (간단한 구현을 위해 텍스트 조작 대신 파라미터 활용)
-            query = text("""
-                SELECT 
-                    d.corp_code,
-                    c.corp_name,
-                    d.bsns_year AS year,
-                    d.reprt_code,
-                    d.stock_knd,
-                    d.dps,
-                    d.dividend_yield AS yield,
-                    d.payout_ratio
-                FROM dart_dividends d
-                JOIN dart_corps c ON d.corp_code = c.corp_code
-                WHERE d.stock_knd = :stock_knd AND d.corp_code = :corp_code
-                ORDER BY 
-                    CAST(d.bsns_year AS INTEGER) ASC,
-                    CASE d.reprt_code
-                        WHEN '1Q' THEN 1
-                        WHEN '2Q' THEN 2
-                        WHEN '3Q' THEN 3
-                        WHEN '4Q' THEN 4
-                        ELSE 9
-                    END ASC
-            """)
-            params["corp_code"] = corp_code
-
-        df = pd.read_sql(query, engine, params=params)
-        
-        # JSON 직렬화를 위해 NaN을 None(null)으로 변환
-        df = df.replace({np.nan: None})
-        
-        return df.to_dict(orient="records")
+        if limit is None and cursor is None:
+            return JSONBytesResponse(await fetch_all_dividends(get_async_engine(), stock_knd, corp_code))
+
+        body, next_cursor = await fetch_dividend_page(get_async_engine(), stock_knd, corp_code,
+                                                      limit=limit or DIVIDENDS_PAGE_LIMIT, cursor=cursor)
+        return JSONBytesResponse(body, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/dividends/stream")
+async def stream_dividends(corp_code: Optional[str] = None, stock_knd: str = "보통주"):
+    """
+    배당 데이터를 NDJSON(행당 JSON 1줄)으로 스트리밍합니다.
+    서버측 Cursor에서 읽는 대로(DIVIDENDS_STREAM_BATCH행 단위) 전송하므로
+    전체 결과를 메모리에 올리지 않고 첫 행을 바로 받을 수 있습니다. 행 형식과 정렬 순서는 /api/dividends와 동일합니다.
+    """
+    return StreamingResponse(stream_dividend_rows(get_async_engine(), stock_knd, corp_code),
+                             media_type=NDJSON_MEDIA_TYPE)
+
 @app.post("/api/chat")
 async def chat(request: ChatRequest):
     """
     LangChain을 사용하여 챗봇 응답을 스트리밍으로 생성합니다.
     System Prompt와 User History를 체계적으로 관리합니다.
+    LLM 클라이언트와 Prompt/Chain은 앱 시작 시 1회 구성된 공용 인스턴스(chat_llm)를 사용합니다.
+    동일(또는 유사 질문) 대화는 응답 캐시에서 재생하며, 적중 여부는 X-Chat-Cache 헤더로 전달합니다.
+    대화 이력은 토큰 예산 내로 압축하며, 전송/절감 토큰 수는 X-Prompt-Tokens(-Saved) 헤더로 전달합니다.
+    저장된 배당/재무제표/뉴스 중 질문과 관련된 상위 k개 자료만 검색하여 주입합니다. (corp_code 지정 시 해당 기업 한정)
+    LLM 클라이언트가 설정되지 않은 경우 503을 반환합니다.
     """
-    # LangChain Chat Model 초기화
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        streaming=True,
-        api_key=os.getenv("OPENAI_API_KEY")
-    )
-
-    # Prompt Template 정의
-    prompt = ChatPromptTemplate.from_messages([
-        ("system",
-        "당신은 전문적인 금융 분석 보조 에이전트입니다.\n"
-        "사용자에게 정확하고 신뢰할 수 있는 금융 정보를 제공하세요.\n"
-        "제공된 기사나 데이터가 있다면 이를 기반으로 얻을 수 있는 인사이트를 추출하고 답변하세요.\n"
-        "'기사 출처: 링크'의 형태로 출처를 밝히세요\n"),
-        MessagesPlaceholder(variable_name="history"),
-    ])
-
-    # 메시지 변환 (Pydantic -> LangChain)
-    history = []
-    for m in request.messages:
-        if m.role == "user":
-            history.append(HumanMessage(content=m.content))
-        elif m.role == "assistant":
-            history.append(AIMessage(content=m.content))
-        elif m.role == "system":
-            # 클라이언트에서 시스템 메시지를 보낼 경우 처리 (선택 사항)
-            history.append(SystemMessage(content=m.content))
-
-    # Chain 생성
-    chain = prompt | llm
+    if chat_llm is None:
+        raise HTTPException(status_code=503, detail="Chat LLM not configured")
+
+    # 1. 응답 캐시 조회 (Exact -> Semantic, 검색 대상 기업이 다르면 별도 항목)
+    scope = (request.corp_code or '') if request.retrieval else 'no-retrieval'
+    lookup = await chat_cache.lookup(request.messages, scope=scope) if chat_cache else None
+    if lookup and lookup.answer is not None:
+        return StreamingResponse(replay(lookup.answer), media_type="text/event-stream",
+                                 headers={"X-Chat-Cache": lookup.match})
+
+    # 2. 검색 증강: 마지막 사용자 질문과 관련된 Chunk만 해당 질문 메시지 앞부분에 주입
+    messages = list(request.messages)
+    retrieved = []
+    if request.retrieval and rag_retriever is not None:
+        try:
+            retrieved = await rag_retriever.retrieve(question_of(messages), corp_code=request.corp_code)
+        except Exception as e:
+            print(f"RAG Retrieval Error: {e}")
+    last_user = max((i for i, m in enumerate(messages) if m.role == "user"), default=None)
+    if retrieved and last_user is not None:
+        messages[last_user] = Message(role="user", content=attach_context(messages[last_user].content,
+                                                                           RagRetriever.format_context(retrieved)))
+
+    # 3. 대화 이력 압축 (최근 메시지 원문 유지, 이전 대화 요약, 토큰 예산 적용) 후 변환 (Pydantic -> LangChain)
+    messages, report = history_compactor.compact(messages)
+    history = to_langchain_messages(messages)
+    if report['saved_tokens']:
+        print(f"[ChatHistory] Prompt {report['original_tokens']} -> {report['prompt_tokens']} 토큰 "
+              f"(요약 {report['summarized_messages']}건, 제외 {report['dropped_messages']}건)")
 
     async def generate():
+        tokens = []
         try:
-            # LangChain astream을 사용하여 스트리밍
-            async for chunk in chain.astream({"history": history}):
-                if chunk.content:
-                    yield chunk.content
+            # 공용 Chain의 astream으로 스트리밍 (요청별 TTFT는 chat_llm에서 기록)
+            async for token in chat_llm.stream(history):
+                tokens.append(token)
+                yield token
         except Exception as e:
             print(f"Chat Stream Error: {e}")
             yield f"Error: {str(e)}"
+            return
+        # 정상 완료된 응답만 캐시에 저장 (클라이언트 연결 종료로 중단된 응답 제외)
+        if lookup is not None:
+            chat_cache.store(lookup, ''.join(tokens))
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"X-Chat-Cache": "miss" if lookup else "off",
+                                      "X-Prompt-Tokens": str(report['prompt_tokens']),
+                                      "X-Prompt-Tokens-Saved": str(report['saved_tokens']),
+                                      "X-Rag-Chunks": str(len(retrieved))})
+
+@app.get("/api/chat/stats")
+def get_chat_stats():
+    """/api/chat의 TTFT(Time To First Token), 전체 응답 시간, 응답 캐시, 이력 압축(절감 토큰) 및 RAG 색인 통계를 반환합니다."""
+    if chat_llm is None:
+        raise HTTPException(status_code=503, detail="Chat LLM not configured")
+    return {**chat_llm.snapshot(),
+            "cache": chat_cache.snapshot() if chat_cache else None,
+            "history": history_compactor.snapshot(),
+            "retrieval": rag_retriever.snapshot() if rag_retriever else None}
+
+
+# 뉴스 본문 크롤링 전체 제한 시간 (초과 기사는 본문 없이 반환)
+NEWS_CRAWL_DEADLINE = 3.0
+
+# 확장 질의 단위 결과 캐시 (60초 신선, 10분까지 Stale 응답 후 백그라운드 갱신)
+news_cache = QueryResultCache(fresh_ttl=60, stale_ttl=600)
+
+# 로컬 저장 기사 우선 응답 조건 (최근 1시간 이내 수집된 기사가 3건 이상이면 네이버 호출 생략)
+# Watchlist 질의가 1시간 이내 백그라운드 수집된 경우에는 수집 시각과 무관하게 로컬 결과 사용
+NEWS_LOCAL_MAX_AGE = 3600
+NEWS_LOCAL_MIN_ITEMS = 3
+
+# 뉴스 백그라운드 수집 주기 (초, 0이면 비활성. 별도 프로세스로 news_ingest_worker.py 실행 가능)
+NEWS_INGEST_INTERVAL = float(os.getenv("NEWS_INGEST_INTERVAL", "0"))
+news_ingest_stop = None
+
+def lookup_local_news(query: str) -> list:
+    """Watchlist에 조회를 기록하고, 로컬 저장 기사로 응답 가능한 경우 결과를 반환한다."""
+    watch = record_news_request(query)
+    last_polled_at = watch and watch['last_polled_at']
+    if last_polled_at and (datetime.now(timezone.utc) - last_polled_at).total_seconds() < NEWS_LOCAL_MAX_AGE:
+        return search_local_news(query, 10)
+    items = search_local_news(query, 10, NEWS_LOCAL_MAX_AGE)
+    return items if len(items) >= NEWS_LOCAL_MIN_ITEMS else []
+
+def persist_news(items: list):
+    try:
+        upsert_news_items(items)
+    except Exception as e:
+        print(f"News Persist Error: {e}")
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
-
-# Financial keywords for query augmentation
-FINANCIAL_KEYWORDS = ["주가", "실적", "공시", "배당", "증권", "투자", "매출", "영업이익", "수주", "이익"]
+async def fetch_live_news(augmented_query: str):
+    result = await crawl_naver_news_async(augmented_query, display=10, sort='sim',
+                                          crawl_content=True, deadline=NEWS_CRAWL_DEADLINE)
+    if result and 'items' in result:
+        # 수집 결과는 응답 지연 없이 백그라운드에서 DB에 저장
+        asyncio.get_running_loop().run_in_executor(None, persist_news, result['items'])
+        return result['items']
+    return []
 
 @app.get("/api/news")
-def get_live_news(query: str):
+async def get_live_news(query: str):
     """
     네이버 뉴스 API를 통해 실시간 뉴스 3개를 가져옵니다.
+    최근 수집되어 DB에 저장된 기사가 있으면 로컬 검색 결과를 먼저 반환합니다.
     금융 관련 키워드를 자동으로 추가하여 정확도를 높이고 유사도순(sim)으로 정렬합니다.
     """
     try:
-        # Query Augmentation: (query) AND (keyword1 | keyword2 | ...)
-        keyword_part = " | ".join(FINANCIAL_KEYWORDS)
-        augmented_query = f"{query} ({keyword_part})"
-        
-        # 본문 크롤링 활성화 및 유사도순(sim) 정렬 유지
-        result = crawl_naver_news(augmented_query, display=10, sort='sim', crawl_content=True)
+        # 1. 로컬 저장소 조회 (백그라운드 수집 대상이거나 최근 수집된 기사가 충분하면 즉시 응답)
+        try:
+            local_items = await asyncio.to_thread(lookup_local_news, query)
+            if local_items:
+                return local_items
+        except Exception as e:
+            print(f"Local News Search Error: {e}")
+
+        # 2. Query Augmentation: (query) AND (keyword1 | keyword2 | ...)
+        augmented_query = augment_financial_query(query)
         
-        if result and 'items' in result:
-            return result['items']
-        return []
+        # 본문 크롤링 활성화 및 유사도순(sim) 정렬 유지 (동일 질의 동시 요청은 하나의 크롤링을 공유)
+        key = news_cache.normalize_key(augmented_query)
+        return await news_cache.get_or_fetch(key, lambda: fetch_live_news(augmented_query))
     except Exception as e:
         print(f"News API Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/news/cache")
+def get_news_cache_stats():
+    """/api/news 질의 결과 캐시의 Hit Rate 및 요청 병합(Coalescing) 현황을 반환합니다."""
+    return news_cache.snapshot()
+
+@app.get("/api/news/article_store")
+def get_article_store_stats():
+    """뉴스 기사 본문 저장소의 Hit Rate 및 보관 건수를 반환합니다."""
+    return get_article_store().snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+[쿼리 단위 결과 캐시 (Single-flight + Stale-While-Revalidate)]
+/api/news처럼 동일 질의가 짧은 시간에 몰리는 외부 호출 결과를 프로세스 내에서 공유하기 위한 비동기 캐시 모듈입니다.
+
+Roles:
+1. Short TTL: 신선 기간(fresh_ttl) 내 동일 키 요청은 저장된 결과를 즉시 반환
+2. Single-flight: 동일 키에 대한 동시 요청은 하나의 Upstream 작업(Task)을 공유 (중복 크롤링 방지)
+3. Stale-While-Revalidate: 신선 기간이 지났으나 허용 기간(stale_ttl) 이내인 결과는 즉시 반환하고, 갱신은 백그라운드에서 수행
+   - 빈 결과(Upstream 실패 시 [] 반환 포함)는 저장하지 않으며, 갱신 실패 시 기존 결과를 유지
+4. Metrics: Hit/Stale/Miss/Coalesced 집계
+
+Usage:
+    cache = QueryResultCache(fresh_ttl=60, stale_ttl=600)
+    items = await cache.get_or_fetch(key, lambda: crawl(...))
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class QueryResultCache:
+    """
+    asyncio 기반 결과 캐시. 단일 이벤트 루프(FastAPI 앱) 안에서 공유한다.
+    Upstream 작업이 예외를 발생시키면 결과를 저장하지 않으며, 대기 중인 요청 모두에 예외가 전달된다.
+    should_cache(value)가 False인 결과(기본: None 및 빈 결과)는 요청에는 반환하되 저장하지 않는다.
+    """
+
+    def __init__(self, fresh_ttl: float = 60.0, stale_ttl: float = 600.0, max_entries: int = 512,
+                 should_cache: Optional[Callable[[Any], bool]] = None):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.should_cache = should_cache or bool
+        # key -> (value, fetched_at monotonic)
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'uncached': 0,
+            'evictions': 0,
+        }
+
+    @staticmethod
+    def normalize_key(query: str) -> str:
+        """공백 차이로 인한 캐시 분산 방지 (연속 공백 축약, 소문자화)"""
+        return ' '.join(query.split()).lower()
+
+    def _store(self, key: str, value: Any):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _start_fetch(self, key: str, fetcher: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        async def run():
+            try:
+                value = await fetcher()
+                # 빈 결과는 저장하지 않음 (Stale 항목 갱신 실패 시 기존 결과가 stale_ttl까지 유지됨)
+                if self.should_cache(value):
+                    self._store(key, value)
+                else:
+                    self.stats['uncached'] += 1
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        # 대기 중인 요청이 모두 취소된 경우에도 예외가 회수되도록 처리
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    def _refresh_in_background(self, key: str, fetcher: Callable[[], Awaitable[Any]]):
+        if key in self._inflight:
+            return
+        self.stats['refreshes'] += 1
+        task = self._start_fetch(key, fetcher)
+
+        def on_done(t: asyncio.Task):
+            if not t.cancelled() and t.exception() is not None:
+                self.stats['refresh_errors'] += 1
+                print(f"[QueryCache] 백그라운드 갱신 실패 ({key}): {t.exception()}")
+
+        task.add_done_callback(on_done)
+
+    async def get_or_fetch(self, key: str, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시된 결과를 반환하거나, Upstream 작업을 (공유하여) 실행한다."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.fresh_ttl:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return value
+            if age < self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stats['stale_hits'] += 1
+                self._refresh_in_background(key, fetcher)
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['misses'] += 1
+            task = self._start_fetch(key, fetcher)
+        # 한 요청의 취소(클라이언트 연결 종료)가 공유 작업을 취소하지 않도록 보호
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> dict:
+        """모니터링용 캐시 통계를 반환한다."""
+        stats = dict(self.stats)
+        stats['entries'] = len(self._entries)
+        stats['inflight'] = len(self._inflight)
+        served = stats['hits'] + stats['stale_hits'] + stats['coalesced']
+        lookups = served + stats['misses']
+        stats['hit_rate'] = round(served / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,395 @@
+"""
+[RAG 벡터 색인 및 검색 (Retrieval Index)]
+배당/재무제표/뉴스 Chunk(rag_sources.py)를 임베딩하여 색인하고, /api/chat 질문과 관련된 상위 k개 Chunk만 반환하는 모듈입니다.
+
+Roles:
+1. Embedder: OpenAI 임베딩(공용 Connection Pool) 또는 오프라인용 HashingEmbedder(어절/문자 bigram Feature Hashing)
+2. Index:
+   - InMemoryVectorIndex: numpy 정규화 행렬 + 내적(코사인) Top-k (프로세스 내, 테스트/단일 인스턴스용)
+   - PgVectorIndex: PostgreSQL pgvector 확장의 rag_chunks 테이블 (`<=>` 코사인 거리, 다중 인스턴스 공유)
+3. Incremental Refresh: ref_key별 content_hash를 비교하여 변경/추가된 Chunk만 임베딩, 사라진 Chunk는 삭제
+4. Retrieval: 질문 임베딩으로 Top-k 검색 (corp_code 지정 시 해당 기업 Chunk + 기업 미지정 뉴스만 대상)
+   - corp_code 미지정 시 질문에 포함된 기업명(색인된 자료 기준, 가장 긴 이름 우선)으로 대상 기업 결정
+
+Usage:
+    retriever = RagRetriever(engine, HashingEmbedder(), InMemoryVectorIndex(), top_k=5)
+    await retriever.refresh()
+    results = await retriever.retrieve("삼성전자 배당 추이 알려줘", corp_code="00126380")
+    context = retriever.format_context(results)
+    question = attach_context(question, context)
+"""
+
+import asyncio
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import text
+
+from backend.rag_sources import Chunk, dividend_chunks, financial_chunks, news_chunks
+from data.collectors.crawler.news_db import WORD_PATTERN
+
+SOURCE_LABELS = {'dividend': '배당', 'financial': '재무제표', 'news': '뉴스'}
+
+# 프론트엔드가 자료를 직접 주입한 메시지에서 실제 질문이 시작되는 표식 (ChatBot.jsx, NewsGrid.jsx)
+QUESTION_MARKERS = ('[질문]', '[보고서 작성 요청]')
+# 검색 질의로 사용할 최대 길이 (문자 수)
+MAX_QUERY_CHARS = 1000
+
+CONTEXT_HEADER = ("[검색된 참고 자료] 아래는 질문과 관련하여 저장된 데이터에서 검색한 자료입니다. "
+                  "자료에 근거하여 답변하고, 뉴스를 인용할 경우 출처 링크를 밝히세요.")
+
+
+class HashingEmbedder(Embeddings):
+    """
+    외부 호출 없는 결정적 임베딩 (Feature Hashing).
+    어절 전체와 어절 내 문자 bigram을 dim 차원에 부호 해싱한다. (반복 Feature는 sqrt로 완화 후 L2 정규화)
+    의미 유사도는 학습 임베딩보다 약하지만 기업명/계정명/키워드 일치에 강하며 오프라인 검증에 사용한다.
+    """
+
+    def __init__(self, dim: int = 1024, word_weight: float = 4.0):
+        self.dim = dim
+        self.word_weight = word_weight
+        self.model_name = f"hashing-{dim}-w{word_weight:g}"
+
+    def _vector(self, value: str) -> List[float]:
+        counts: Dict[str, float] = {}
+        for word in WORD_PATTERN.findall(value.lower()):
+            # 어절 전체 일치(기업명, 계정명)는 부분 bigram 일치보다 가중
+            if word.isdigit():
+                # 수치는 연도(4자리)만 사용 (금액/비율 숫자는 의미 없이 해시 충돌만 유발)
+                if len(word) == 4:
+                    counts[word] = counts.get(word, 0) + 1
+                continue
+            counts[word] = counts.get(word, 0) + self.word_weight
+            for i in range(len(word) - 1):
+                counts[word[i:i + 2]] = counts.get(word[i:i + 2], 0) + 1
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in counts.items():
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % self.dim] += np.sqrt(count) if (h >> 16) & 1 else -np.sqrt(count)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+def question_of(messages: Iterable) -> str:
+    """마지막 사용자 메시지에서 검색 질의를 추출한다. 주입된 참고 자료가 있으면 질문 표식 이후 문장만 사용."""
+    question = ''
+    for m in messages:
+        role = m["role"] if isinstance(m, dict) else m.role
+        if role == 'user':
+            question = m["content"] if isinstance(m, dict) else m.content
+    for marker in QUESTION_MARKERS:
+        if marker in question:
+            question = question.rsplit(marker, 1)[1]
+    return question.strip()[:MAX_QUERY_CHARS]
+
+
+def attach_context(content: str, context: str) -> str:
+    """
+    검색 자료를 사용자 메시지 앞에 붙인다. (System 메시지로 주입하면 대화 이력 압축 시 대화 맨 앞으로 이동하므로 질문과 같은 메시지에 둔다)
+    질문 표식이 없으면 '[질문]'을 붙여 자료와 질문을 구분한다.
+    """
+    if not any(marker in content for marker in QUESTION_MARKERS):
+        content = f"{QUESTION_MARKERS[0]}\n{content}"
+    return f"{context}\n\n{content}"
+
+
+def normalize_rows(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def allowed(chunk: Chunk, corp_code: Optional[str], sources: Optional[Iterable[str]]) -> bool:
+    if sources is not None and chunk.source not in sources:
+        return False
+    return corp_code is None or chunk.corp_code in (None, corp_code)
+
+
+class InMemoryVectorIndex:
+    """numpy 기반 프로세스 내 벡터 색인 (Exact Top-k)"""
+
+    blocking = False
+
+    def __init__(self):
+        self._chunks: Dict[str, Chunk] = {}
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def known_hashes(self) -> Dict[str, str]:
+        return {key: chunk.content_hash for key, chunk in self._chunks.items()}
+
+    def upsert(self, chunks: List[Chunk], vectors: Sequence[Sequence[float]]):
+        if not chunks:
+            return
+        for chunk, vector in zip(chunks, normalize_rows(vectors)):
+            self._chunks[chunk.ref_key] = chunk
+            self._vectors[chunk.ref_key] = vector
+        self._matrix = None
+
+    def remove(self, ref_keys: Iterable[str]):
+        for key in ref_keys:
+            self._chunks.pop(key, None)
+            self._vectors.pop(key, None)
+        self._matrix = None
+
+    def count(self) -> int:
+        return len(self._chunks)
+
+    def search(self, vector: Sequence[float], k: int, corp_code: str = None,
+               sources: Iterable[str] = None) -> List[Tuple[Chunk, float]]:
+        if not self._chunks:
+            return []
+        if self._matrix is None:
+            self._keys = list(self._chunks)
+            self._matrix = np.stack([self._vectors[key] for key in self._keys])
+
+        scores = self._matrix @ normalize_rows([vector])[0]
+        if corp_code is not None or sources is not None:
+            mask = np.array([allowed(self._chunks[key], corp_code, sources) for key in self._keys])
+            scores = np.where(mask, scores, -np.inf)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._chunks[self._keys[i]], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+class PgVectorIndex:
+    """
+    pgvector(rag_chunks 테이블) 기반 벡터 색인.
+    임베딩 모델별로 행을 구분하므로 모델을 바꿔도 기존 색인과 섞이지 않는다.
+    """
+
+    blocking = True
+
+    SCHEMA = [
+        "CREATE EXTENSION IF NOT EXISTS vector",
+        """
+        CREATE TABLE IF NOT EXISTS rag_chunks (
+            id SERIAL PRIMARY KEY,
+            embedding_model VARCHAR(100) NOT NULL,
+            ref_key TEXT NOT NULL,
+            source VARCHAR(20) NOT NULL,
+            corp_code VARCHAR(8),
+            title TEXT,
+            link TEXT,
+            content TEXT NOT NULL,
+            content_hash VARCHAR(40) NOT NULL,
+            embedding vector NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uix_rag_chunk_ref UNIQUE (embedding_model, ref_key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_rag_chunks_corp_code ON rag_chunks (embedding_model, corp_code)",
+        # 뉴스 Chunk 키(news:{url_key}:{n})는 url_key(최대 512자)를 포함하므로 길이 제한 없이 저장 (VARCHAR(300)으로 생성된 기존 테이블 변환)
+        "ALTER TABLE rag_chunks ALTER COLUMN ref_key TYPE TEXT",
+    ]
+
+    def __init__(self, engine, embedding_model: str):
+        self.engine = engine
+        self.embedding_model = embedding_model
+        with engine.begin() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(text(statement))
+
+    @staticmethod
+    def to_literal(vector: Sequence[float]) -> str:
+        return '[' + ','.join(f"{float(x):.7g}" for x in vector) + ']'
+
+    def known_hashes(self) -> Dict[str, str]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT ref_key, content_hash FROM rag_chunks WHERE embedding_model = :m"),
+                                {'m': self.embedding_model}).all()
+        return {row.ref_key: row.content_hash for row in rows}
+
+    def upsert(self, chunks: List[Chunk], vectors: Sequence[Sequence[float]]):
+        if not chunks:
+            return
+        sql = text("""
+            INSERT INTO rag_chunks (embedding_model, ref_key, source, corp_code, title, link, content, content_hash, embedding, updated_at)
+            VALUES (:m, :ref_key, :source, :corp_code, :title, :link, :content, :content_hash, CAST(:embedding AS vector), now())
+            ON CONFLICT ON CONSTRAINT uix_rag_chunk_ref DO UPDATE SET
+                source = EXCLUDED.source, corp_code = EXCLUDED.corp_code, title = EXCLUDED.title,
+                link = EXCLUDED.link, content = EXCLUDED.content, content_hash = EXCLUDED.content_hash,
+                embedding = EXCLUDED.embedding, updated_at = EXCLUDED.updated_at
+        """)
+        params = [
+            {'m': self.embedding_model, 'ref_key': c.ref_key, 'source': c.source, 'corp_code': c.corp_code,
+             'title': c.title, 'link': c.link, 'content': c.content, 'content_hash': c.content_hash,
+             'embedding': self.to_literal(v)}
+            for c, v in zip(chunks, normalize_rows(vectors))
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(sql, params)
+
+    def remove(self, ref_keys: Iterable[str]):
+        ref_keys = list(ref_keys)
+        if not ref_keys:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM rag_chunks WHERE embedding_model = :m AND ref_key = ANY(:keys)"),
+                         {'m': self.embedding_model, 'keys': ref_keys})
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT count(*) FROM rag_chunks WHERE embedding_model = :m"),
+                                {'m': self.embedding_model}).scalar()
+
+    def search(self, vector: Sequence[float], k: int, corp_code: str = None,
+               sources: Iterable[str] = None) -> List[Tuple[Chunk, float]]:
+        sql = """
+            SELECT ref_key, source, corp_code, title, link, content, content_hash,
+                   1 - (embedding <=> CAST(:q AS vector)) AS score
+            FROM rag_chunks
+            WHERE embedding_model = :m
+        """
+        params = {'q': self.to_literal(normalize_rows([vector])[0]), 'm': self.embedding_model, 'k': k}
+        if corp_code is not None:
+            sql += " AND (corp_code = :corp_code OR corp_code IS NULL)"
+            params['corp_code'] = corp_code
+        if sources is not None:
+            sql += " AND source = ANY(:sources)"
+            params['sources'] = list(sources)
+        sql += " ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(sql), params).mappings().all()
+        return [
+            (Chunk(ref_key=r['ref_key'], source=r['source'], corp_code=r['corp_code'], title=r['title'],
+                   link=r['link'], content=r['content'], content_hash=r['content_hash']), float(r['score']))
+            for r in rows
+        ]
+
+
+class RagRetriever:
+    """
+    Chunk 수집 -> 증분 임베딩/색인 -> 질문별 Top-k 검색을 담당한다.
+    색인이 비어 있는 동안(최초 refresh 전)에는 검색 결과 없이 동작한다.
+    """
+
+    SOURCES = {
+        'dividend': dividend_chunks,
+        'financial': financial_chunks,
+        'news': news_chunks,
+    }
+
+    def __init__(self, engine, embedder: Embeddings, index, top_k: int = 5, min_score: float = 0.2,
+                 batch_size: int = 64, sources: Iterable[str] = ('dividend', 'financial', 'news'),
+                 news_max_age_days: Optional[float] = 30.0):
+        self.engine = engine
+        self.embedder = embedder
+        self.index = index
+        self.top_k = top_k
+        self.min_score = min_score
+        self.batch_size = batch_size
+        self.sources = list(sources)
+        # 출처별 Chunk 생성 옵션 (뉴스는 최근 수집 기사만 색인하여 색인 크기/임베딩 비용 제한)
+        self.source_options = {'news': {'max_age_days': news_max_age_days}}
+        self.ready = False
+        # 질문 내 기업명 인식용 (이름 길이 내림차순: '기업10'이 '기업1'보다 먼저 일치)
+        self._corp_names: List[Tuple[str, str]] = []
+        self.stats = {'refreshes': 0, 'embedded_chunks': 0, 'removed_chunks': 0, 'indexed_chunks': 0,
+                      'last_refresh_ms': 0.0, 'queries': 0, 'resolved_corps': 0, 'refresh_errors': 0}
+
+    def _collect(self) -> List[Chunk]:
+        chunks = []
+        for source in self.sources:
+            try:
+                chunks.extend(self.SOURCES[source](self.engine, **self.source_options.get(source, {})))
+            except Exception as e:
+                print(f"[RAG] {source} Chunk 생성 실패: {e}")
+        return chunks
+
+    async def _call(self, fn, *args, **kwargs):
+        if self.index.blocking:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def refresh(self) -> dict:
+        """저장 데이터로 Chunk를 다시 생성하고 변경분만 임베딩하여 색인에 반영한다."""
+        started = time.perf_counter()
+        chunks = await asyncio.to_thread(self._collect)
+        known = await self._call(self.index.known_hashes)
+
+        current = {chunk.ref_key for chunk in chunks}
+        changed = [chunk for chunk in chunks if known.get(chunk.ref_key) != chunk.content_hash]
+        removed = [key for key in known if key not in current]
+
+        for i in range(0, len(changed), self.batch_size):
+            batch = changed[i:i + self.batch_size]
+            vectors = await self.embedder.aembed_documents([chunk.content for chunk in batch])
+            await self._call(self.index.upsert, batch, vectors)
+        await self._call(self.index.remove, removed)
+
+        names = {chunk.corp_name: chunk.corp_code for chunk in chunks if chunk.corp_code and chunk.corp_name}
+        self._corp_names = sorted(((name, code) for name, code in names.items() if len(name) >= 2),
+                                  key=lambda pair: -len(pair[0]))
+
+        self.stats['refreshes'] += 1
+        self.stats['embedded_chunks'] += len(changed)
+        self.stats['removed_chunks'] += len(removed)
+        self.stats['indexed_chunks'] = await self._call(self.index.count)
+        self.stats['last_refresh_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        self.ready = True
+        print(f"[RAG] 색인 갱신: 전체 {len(chunks)}건, 임베딩 {len(changed)}건, 삭제 {len(removed)}건 "
+              f"({self.stats['last_refresh_ms']:.0f}ms)")
+        return {'chunks': len(chunks), 'embedded': len(changed), 'removed': len(removed)}
+
+    async def refresh_forever(self, interval: float):
+        """interval(초) 주기로 색인을 갱신한다. (lifespan에서 Task로 구동, 취소 시 종료)"""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['refresh_errors'] += 1
+                print(f"[RAG] 색인 갱신 실패: {e}")
+            await asyncio.sleep(interval)
+
+    def resolve_corp(self, question: str) -> Optional[str]:
+        """질문에 포함된 기업명 중 가장 긴 이름의 corp_code를 반환한다."""
+        for name, code in self._corp_names:
+            if name in question:
+                return code
+        return None
+
+    async def retrieve(self, question: str, corp_code: str = None, k: int = None) -> List[Tuple[Chunk, float]]:
+        """
+        질문과 관련된 상위 k개 Chunk와 유사도를 반환한다.
+        min_score 미만은 제외하되, 대상 기업(corp_code 지정 또는 질문 내 기업명)의 Chunk는 유지한다.
+        """
+        if not self.ready or not question.strip():
+            return []
+        self.stats['queries'] += 1
+        if corp_code is None:
+            corp_code = self.resolve_corp(question)
+            self.stats['resolved_corps'] += corp_code is not None
+        vector = await self.embedder.aembed_query(question)
+        results = await self._call(self.index.search, vector, k or self.top_k, corp_code)
+        return [(chunk, score) for chunk, score in results
+                if score >= self.min_score or (corp_code is not None and chunk.corp_code == corp_code)]
+
+    @staticmethod
+    def format_context(results: List[Tuple[Chunk, float]]) -> str:
+        """검색 결과를 질문 메시지에 주입할 문자열로 변환한다. (attach_context)"""
+        blocks = [CONTEXT_HEADER]
+        for i, (chunk, _) in enumerate(results, 1):
+            label = SOURCE_LABELS.get(chunk.source, chunk.source)
+            source_line = f"\n출처: {chunk.link}" if chunk.link else ''
+            blocks.append(f"[자료 {i}] ({label})\n{chunk.content}{source_line}")
+        return '\n\n'.join(blocks)
+
+    def snapshot(self) -> dict:
+        return {**self.stats, 'ready': self.ready, 'backend': type(self.index).__name__,
+                'top_k': self.top_k, 'min_score': self.min_score}
@@ -0,0 +1,196 @@
+"""
+[RAG 검색 대상 Chunk 생성 (Retrieval Sources)]
+/api/chat 검색 단계(rag_index.py)에서 색인할 문서 조각(Chunk)을 저장된 데이터로부터 생성하는 모듈입니다.
+
+Sources:
+1. Dividend: dart_dividends를 (기업, 주식 종류) 단위로 묶어 연도/분기별 배당 추이 1건
+2. Financial: data/storage/raw/dart/fs_*.json(단일회사 주요계정)을 (보고서, 재무제표 구분, 재무제표 종류) 단위로 1건
+3. News: news_articles + news_article_bodies 기사를 제목 + 본문 문단(약 600자) 단위로 분할
+
+Chunk:
+    ref_key(출처 내 고유 키), source, corp_code/corp_name(기업 필터용, 뉴스는 None), title, link, content, content_hash
+    content_hash가 같은 Chunk는 재색인 시 임베딩을 생략한다.
+
+Usage:
+    chunks = dividend_chunks(engine) + financial_chunks(engine) + news_chunks(engine)
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from data.collectors.dart.fs_cache import STORAGE_DIR as FS_STORAGE_DIR
+
+# 보고서 코드 -> 표기 (fs_*.json 파일명 기준)
+REPORT_NAMES = {
+    '11013': '1분기보고서(1Q)',
+    '11012': '반기보고서(2Q)',
+    '11014': '3분기보고서(3Q)',
+    '11011': '사업보고서(4Q)',
+}
+
+# 뉴스 본문 Chunk 최대 길이 (문자 수)
+NEWS_CHUNK_CHARS = 600
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?다])\s+')
+
+
+@dataclass
+class Chunk:
+    ref_key: str
+    source: str
+    content: str
+    corp_code: Optional[str] = None
+    corp_name: Optional[str] = None
+    title: Optional[str] = None
+    link: Optional[str] = None
+    content_hash: str = field(default='', compare=False)
+
+    def __post_init__(self):
+        if not self.content_hash:
+            self.content_hash = hashlib.sha1(self.content.encode('utf-8')).hexdigest()
+
+
+def format_number(value) -> str:
+    return f"{value:,}" if isinstance(value, int) else str(value)
+
+
+def dividend_chunks(engine) -> List[Chunk]:
+    """기업/주식 종류별 배당 시계열 Chunk (연도 -> 분기 순)"""
+    sql = text("""
+        SELECT d.corp_code, c.corp_name, d.stock_knd, d.bsns_year, d.reprt_code,
+               d.dps, d.dividend_yield, d.payout_ratio, d.eps
+        FROM dart_dividends d
+        JOIN dart_corps c ON d.corp_code = c.corp_code
+        ORDER BY d.corp_code, d.stock_knd, d.bsns_year, d.reprt_code
+    """)
+    groups: Dict[tuple, List] = {}
+    with engine.connect() as conn:
+        for row in conn.execute(sql).mappings():
+            groups.setdefault((row['corp_code'], row['corp_name'], row['stock_knd']), []).append(row)
+
+    chunks = []
+    for (corp_code, corp_name, stock_knd), rows in groups.items():
+        lines = [f"[배당] {corp_name}({corp_code}) {stock_knd} 배당 추이"]
+        for row in rows:
+            values = []
+            if row['dps'] is not None:
+                values.append(f"주당배당금 {format_number(row['dps'])}원")
+            if row['dividend_yield'] is not None:
+                values.append(f"시가배당률 {row['dividend_yield']}%")
+            if row['payout_ratio'] is not None:
+                values.append(f"배당성향 {row['payout_ratio']}%")
+            if row['eps'] is not None:
+                values.append(f"EPS {format_number(row['eps'])}원")
+            lines.append(f"{row['bsns_year']}.{row['reprt_code']}: {', '.join(values) or '정보 없음'}")
+        chunks.append(Chunk(
+            ref_key=f"dividend:{corp_code}:{stock_knd}",
+            source='dividend',
+            corp_code=corp_code,
+            corp_name=corp_name,
+            title=f"{corp_name} {stock_knd} 배당",
+            content='\n'.join(lines),
+        ))
+    return chunks
+
+
+def financial_chunks(engine, storage_dir: Path = FS_STORAGE_DIR) -> List[Chunk]:
+    """저장된 재무제표 응답(fs_*.json)의 보고서/재무제표 종류별 주요계정 Chunk"""
+    paths = sorted(Path(storage_dir).glob('fs_*.json'))
+    if not paths:
+        return []
+
+    corp_codes = list({p.stem.split('_')[1] for p in paths})
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT corp_code, corp_name FROM dart_corps WHERE corp_code = ANY(:codes)"),
+                            {'codes': corp_codes}).all()
+    corp_names = {row.corp_code: row.corp_name for row in rows}
+
+    chunks = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get('status') != '000':
+            continue
+
+        groups: Dict[tuple, List[dict]] = {}
+        for item in data.get('list', []):
+            groups.setdefault((item.get('fs_nm'), item.get('sj_nm'), item.get('fs_div'), item.get('sj_div')), []).append(item)
+
+        for (fs_nm, sj_nm, fs_div, sj_div), items in groups.items():
+            first = items[0]
+            corp_code = first['corp_code']
+            corp_name = corp_names.get(corp_code, corp_code)
+            report = REPORT_NAMES.get(first['reprt_code'], first['reprt_code'])
+            lines = [f"[재무제표] {corp_name}({corp_code}) {first['bsns_year']} {report} {fs_nm} {sj_nm} (단위: {first.get('currency', 'KRW')})"]
+            for item in items:
+                line = f"{item['account_nm']}: 당기({item.get('thstrm_nm', '')}) {item.get('thstrm_amount', '-')}"
+                if item.get('frmtrm_amount'):
+                    line += f", 전기 {item['frmtrm_amount']}"
+                lines.append(line)
+            chunks.append(Chunk(
+                ref_key=f"financial:{corp_code}:{first['bsns_year']}:{first['reprt_code']}:{fs_div}:{sj_div}",
+                source='financial',
+                corp_code=corp_code,
+                corp_name=corp_names.get(corp_code),
+                title=f"{corp_name} {first['bsns_year']} {report} {sj_nm}",
+                content='\n'.join(lines),
+            ))
+    return chunks
+
+
+def split_passages(content: str, max_chars: int = NEWS_CHUNK_CHARS) -> List[str]:
+    """문장 경계 기준으로 max_chars 이하 문단으로 분할한다. (한 문장이 더 길면 문자 단위 분할)"""
+    passages, current = [], ''
+    for sentence in SENTENCE_PATTERN.split(content.strip()):
+        while len(sentence) > max_chars:
+            if current:
+                passages.append(current)
+                current = ''
+            passages.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            passages.append(current)
+            current = ''
+        current = f"{current} {sentence}".strip()
+    if current:
+        passages.append(current)
+    return passages
+
+
+def news_chunks(engine, max_age_days: Optional[float] = None) -> List[Chunk]:
+    """저장된 뉴스 기사의 제목 + 본문 문단 Chunk (본문이 없으면 요약 사용, max_age_days 지정 시 최근 수집 기사만)"""
+    sql = """
+        SELECT a.url_key, a.title, a.link, a.description, a.pub_date, b.content
+        FROM news_articles a
+        LEFT JOIN news_article_bodies b ON b.url_key = a.url_key
+    """
+    params = {}
+    if max_age_days is not None:
+        sql += " WHERE a.crawled_at >= now() - make_interval(secs => :max_age)"
+        params['max_age'] = max_age_days * 86400
+    with engine.connect() as conn:
+        rows = conn.execute(text(sql), params).mappings().all()
+
+    chunks = []
+    for row in rows:
+        published = row['pub_date'].strftime('%Y-%m-%d') if row['pub_date'] else '날짜 미상'
+        header = f"[뉴스] {row['title']} ({published})"
+        body = row['content'] or row['description'] or ''
+        for i, passage in enumerate(split_passages(body) or ['']):
+            chunks.append(Chunk(
+                ref_key=f"news:{row['url_key']}:{i}",
+                source='news',
+                title=row['title'],
+                link=row['link'],
+                content=f"{header}\n{passage}".strip(),
+            ))
+    return chunks
@@ -0,0 +1,291 @@
+"""
+[뉴스 기사 본문 저장소 (Article Content Store)]
+크롤링한 네이버 뉴스 기사 본문을 SQLite 파일에 영속 보관하여 동일 기사의 재다운로드/재파싱을 방지하는 모듈입니다.
+
+Roles:
+1. Keying: 정규화 URL(트래킹 파라미터 제거, 네이버 기사 URL은 언론사/기사 ID 기준 정규형)을 기본 키로 사용
+2. Dedup: 원문 링크(originallink)로도 조회하여 동일 기사의 중복 수집 방지
+   - 제목 해시는 같은 언론사(원문 링크 도메인)의 신선 기간 내 기사만 일치로 인정 ("[속보]", "[인사]" 등 범용 제목 충돌 방지)
+3. Revalidation: 신선 기간(fresh_ttl)이 지난 기사는 ETag/Last-Modified 조건부 요청으로 재검증 (304 시 본문 재사용)
+4. Eviction: 최대 보관 기간(max_age) 초과 항목 삭제 후, 최대 건수 초과분은 최근 접근 시각 기준(LRU) 삭제
+5. Metrics: Hit/Revalidation/Miss 집계 및 Hit Rate 보고
+
+Usage:
+    store = get_article_store()
+    entry = store.lookup(link, original_url=originallink, title=title)
+    store.put(link, content, etag=..., last_modified=..., original_url=originallink, title=title)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+STORAGE_DIR = Path(__file__).resolve().parents[2] / 'storage' / 'raw' / 'crawler'
+DEFAULT_DB_PATH = STORAGE_DIR / 'article_store.sqlite3'
+
+# 기사 식별과 무관한 추적/섹션 파라미터
+TRACKING_PARAMS = {'sid', 'input', 'from', 'ref', 'fbclid', 'gclid', 'cid', 'type', 'rc', 'ntype'}
+TRACKING_PREFIXES = ('utm_',)
+
+# 네이버 뉴스 기사 URL 패턴 (mnews/article/{oid}/{aid}, article/{oid}/{aid}, read.naver?oid=&aid=)
+NAVER_ARTICLE_PATH = re.compile(r'^/(?:mnews/)?article/(\d+)/(\d+)')
+NAVER_HOSTS = {'news.naver.com', 'n.news.naver.com', 'm.news.naver.com'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_key       TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    original_key  TEXT,
+    title_hash    TEXT,
+    content       TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    validated_at  REAL NOT NULL,
+    accessed_at   REAL NOT NULL,
+    hits          INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_articles_original_key ON articles (original_key);
+CREATE INDEX IF NOT EXISTS ix_articles_title_hash ON articles (title_hash);
+CREATE INDEX IF NOT EXISTS ix_articles_accessed_at ON articles (accessed_at);
+"""
+
+COLUMNS = ['url_key', 'url', 'original_key', 'title_hash', 'content', 'etag', 'last_modified',
+           'fetched_at', 'validated_at', 'accessed_at', 'hits']
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    기사 URL을 정규화한다.
+    - scheme/host 소문자화, fragment 및 추적 파라미터 제거, 남은 파라미터 정렬
+    - 네이버 뉴스 기사는 https://n.news.naver.com/article/{oid}/{aid} 형태로 통일
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = parse_qsl(parts.query, keep_blank_values=False)
+
+    if host in NAVER_HOSTS:
+        match = NAVER_ARTICLE_PATH.match(parts.path)
+        if match:
+            return f"https://n.news.naver.com/article/{match.group(1)}/{match.group(2)}"
+        params = dict(query)
+        if 'oid' in params and 'aid' in params:
+            return f"https://n.news.naver.com/article/{params['oid']}/{params['aid']}"
+
+    query = sorted((k, v) for k, v in query
+                   if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def title_hash(title: Optional[str]) -> Optional[str]:
+    """공백/문장부호를 제거한 제목의 해시 (언론사별 표기 차이를 흡수한 중복 판단용)"""
+    if not title:
+        return None
+    normalized = re.sub(r'[\W_]+', '', title).lower()
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:20]
+
+
+class ArticleStore:
+    """
+    SQLite 기반 기사 본문 저장소.
+    Thread-safe: 단일 Connection을 Lock으로 보호하여 여러 Worker Thread/이벤트 루프가 공유한다.
+    """
+
+    def __init__(self,
+                 db_path: Path = DEFAULT_DB_PATH,
+                 fresh_ttl: float = 6 * 3600,
+                 max_age: float = 30 * 24 * 3600,
+                 max_entries: int = 50000,
+                 evict_every: int = 200):
+        self.db_path = Path(db_path)
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+        self.stats = {
+            'hits': 0,            # 신선 기간 내 저장본 반환
+            'title_hits': 0,      # 그 중 제목 해시/원문 링크로 찾은 중복 기사
+            'revalidated': 0,     # 조건부 요청 결과 304 (본문 재사용)
+            'stale': 0,           # 재검증 필요 (조건부 요청 발생)
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    # --- Lookup ---
+
+    def _fetch_one(self, where: str, value: str) -> Optional[dict]:
+        row = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM articles WHERE {where} = ? ORDER BY fetched_at DESC LIMIT 1",
+            (value,)
+        ).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def _fetch_same_press_title(self, t_hash: str, original_key: str) -> Optional[dict]:
+        """제목 해시가 같고 원문 링크 도메인(언론사)이 같은 최근 기사 (정규화 URL은 https://{host}/ 형태)"""
+        host = urlsplit(original_key).netloc
+        row = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM articles WHERE title_hash = ? AND substr(original_key, 1, ?) = ? "
+            "ORDER BY fetched_at DESC LIMIT 1",
+            (t_hash, len(host) + 9, f"https://{host}/")
+        ).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def lookup(self, url: str, original_url: Optional[str] = None, title: Optional[str] = None) -> Optional[dict]:
+        """
+        저장된 기사를 조회한다. (정규화 URL -> 원문 링크 -> 같은 언론사 제목 해시 순)
+        반환 dict의 'fresh'가 False이면 호출 측에서 etag/last_modified로 조건부 재요청해야 한다.
+        제목 해시 일치는 신선 기간 내 저장본만 사용하며, 그 외에는 Miss로 처리한다. (다른 기사 본문 반환 방지)
+        """
+        url_key = normalize_url(url)
+        original_key = normalize_url(original_url)
+        t_hash = title_hash(title)
+        now = time.time()
+
+        with self._lock:
+            entry = self._fetch_one('url_key', url_key) if url_key else None
+            via_alias = False
+            if entry is None and original_key:
+                entry = self._fetch_one('original_key', original_key)
+                via_alias = entry is not None
+            if entry is None and t_hash and original_key:
+                entry = self._fetch_same_press_title(t_hash, original_key)
+                if entry is not None and now - entry['validated_at'] >= self.fresh_ttl:
+                    entry = None
+                via_title = entry is not None
+            else:
+                via_title = False
+
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE articles SET accessed_at = ?, hits = hits + 1 WHERE url_key = ?",
+                               (now, entry['url_key']))
+            entry['fresh'] = now - entry['validated_at'] < self.fresh_ttl
+            # 원문 링크가 같은 중복 기사는 재검증 대상이 아니므로 그대로 사용
+            if via_alias:
+                entry['fresh'] = True
+            if via_alias or via_title:
+                self.stats['title_hits'] += 1
+            if entry['fresh']:
+                self.stats['hits'] += 1
+            else:
+                self.stats['stale'] += 1
+            return entry
+
+    def conditional_headers(self, entry: Optional[dict]) -> dict:
+        """재검증용 조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    # --- Write ---
+
+    def mark_validated(self, url_key: str):
+        """304 Not Modified 응답 시 재검증 시각만 갱신한다."""
+        with self._lock:
+            self._conn.execute("UPDATE articles SET validated_at = ? WHERE url_key = ?", (time.time(), url_key))
+            self.stats['revalidated'] += 1
+
+    def put(self, url: str, content: Optional[str], etag: Optional[str] = None, last_modified: Optional[str] = None,
+            original_url: Optional[str] = None, title: Optional[str] = None):
+        """기사 본문을 저장한다. 본문 추출에 실패한 기사(None)는 저장하지 않는다."""
+        url_key = normalize_url(url)
+        if not url_key or not content:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO articles (url_key, url, original_key, title_hash, content, etag, last_modified,
+                                      fetched_at, validated_at, accessed_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                ON CONFLICT (url_key) DO UPDATE SET
+                    url = excluded.url,
+                    original_key = COALESCE(excluded.original_key, articles.original_key),
+                    title_hash = COALESCE(excluded.title_hash, articles.title_hash),
+                    content = excluded.content,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at,
+                    validated_at = excluded.validated_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (url_key, url, normalize_url(original_url), title_hash(title), content, etag, last_modified,
+                 now, now, now)
+            )
+            self.stats['stores'] += 1
+            self._writes += 1
+            should_evict = self._writes % self.evict_every == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """보관 기간 초과 항목과 최대 건수 초과분(LRU)을 삭제한다."""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM articles WHERE fetched_at < ?",
+                                         (time.time() - self.max_age,)).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                removed += self._conn.execute(
+                    "DELETE FROM articles WHERE url_key IN "
+                    "(SELECT url_key FROM articles ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+            self.stats['evictions'] += removed
+        return removed
+
+    def snapshot(self) -> dict:
+        """모니터링용 저장소 통계를 반환한다."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        served = stats['hits'] + stats['revalidated']
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = round(served / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[ArticleStore] = None
+_default_lock = threading.Lock()
+
+
+def get_article_store() -> ArticleStore:
+    """프로세스 공용 ArticleStore 인스턴스를 반환한다. (경로: ARTICLE_STORE_PATH 환경변수로 변경 가능)"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ArticleStore(Path(os.getenv('ARTICLE_STORE_PATH', DEFAULT_DB_PATH)))
+        return _default_store
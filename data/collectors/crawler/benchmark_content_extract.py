@@ -0,0 +1,177 @@
+"""
+[뉴스 본문 추출 벤치마크 및 정합성 검증]
+content_extractor.py의 lxml 경로(Fast Path)와 기존 BeautifulSoup 경로를 기사 HTML Fixture 묶음으로 비교하는 스크립트입니다.
+
+Corpus:
+    --html_dir 지정 시 해당 디렉토리의 *.html 파일을 사용합니다.
+    미지정 시 data/storage/raw/crawler/naver_news_*.json의 기사 본문으로 네이버 뉴스 상세 페이지 구조의 HTML을 합성합니다.
+    (--save_fixtures로 합성 HTML을 파일로 저장하여 이후 동일 Corpus로 재측정 가능)
+
+Checks:
+1. Parity: 기사별 본문 추출 결과 및 제목/요약 태그 제거 결과가 동일한지 검증 (불일치 시 종료 코드 1)
+2. Benchmark: 기사당 추출 시간 비교 (BeautifulSoup / lxml / lxml + Process Pool)
+
+Usage:
+    python benchmark_content_extract.py
+    python benchmark_content_extract.py --repeat 20 --workers 4
+    python benchmark_content_extract.py --html_dir /path/to/saved_html
+"""
+
+import argparse
+import html
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.collectors.crawler.content_extractor import extract_content_lxml, extract_content_soup, strip_tags
+
+CRAWLER_DIR = Path(__file__).resolve().parents[2] / 'storage' / 'raw' / 'crawler'
+
+# 네이버 뉴스 상세 페이지의 본문 외 영역 (헤더/메뉴/관련기사 등)을 흉내낸 반복 블록
+PAGE_CHROME = ''.join(
+    f'<li class="Nlist_item"><a href="/section/{i}" class="Nitem_link"><span class="Nitem_link_menu">메뉴 {i}</span></a></li>'
+    for i in range(120)
+)
+RELATED = ''.join(
+    f'<div class="rankingnews_box"><a href="/article/{i}"><strong class="list_title">관련 기사 {i} &middot; 경제</strong></a>'
+    f'<span class="list_time">{i}분 전</span></div>'
+    for i in range(60)
+)
+
+
+def synthesize_article_html(index: int, item: dict) -> str:
+    """JSON 덤프의 기사 본문으로 네이버 뉴스(#dic_area) 구조의 상세 페이지 HTML을 생성한다."""
+    content = item.get('content') or item.get('description') or ''
+    sentences = [s for s in content.replace('다.', '다.\n').split('\n') if s.strip()]
+    body = []
+    for i, sentence in enumerate(sentences):
+        body.append(html.escape(sentence, quote=False))
+        body.append('<br>' if i % 3 else '<br><br>')
+        if i == 1:
+            body.append('<span class="end_photo_org"><img src="https://imgnews.pstatic.net/a.jpg">'
+                        '<em class="img_desc">사진 설명입니다 (사진=연합뉴스)</em></span>')
+        if i == 4:
+            body.append('<!-- ad slot --><script type="text/javascript">window.ad = {"slot": 1};</script>')
+        if i % 5 == 2:
+            body.append(f'<strong> 강조 문구 {i} </strong>')
+    # 본문 영역 selector를 문서마다 순환 (#dic_area, #newsct_article, #articleBodyContents, .news_end)
+    selector = ['id="dic_area" class="go_trans _article_content"',
+                'id="newsct_article" class="go_trans _article_content"',
+                'id="articleBodyContents" class="go_trans _article_content"',
+                'class="news_end go_trans _article_content"'][index % 4]
+
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f'<title>{html.escape(item.get("title", ""))}</title>'
+        '<style>.media_end_head { color: #000; }</style><script>var g_ssc = "news.article";</script></head>'
+        f'<body><div id="ct_wrap"><ul class="Nlist">{PAGE_CHROME}</ul>'
+        f'<div class="media_end_head"><h2 id="title_area"><span>{html.escape(item.get("title", ""))}</span></h2></div>'
+        f'<article {selector}>\n{"".join(body)}\n'
+        '<div class="byline"><p class="byline_p"><span class="byline_s">홍길동 기자 (gildong@example.com)</span></p></div>'
+        '</article>'
+        '<div class="copyright"><p>Copyright ⓒ 연합뉴스. All rights reserved. 무단 전재-재배포, AI 학습 및 활용 금지.</p></div>'
+        f'<div class="reporter_area">기자 프로필</div><aside>{RELATED}</aside></div></body></html>'
+    )
+
+
+def load_corpus(html_dir: str = None) -> list:
+    if html_dir:
+        return [p.read_text(encoding='utf-8') for p in sorted(Path(html_dir).glob('*.html'))]
+
+    items = []
+    for path in sorted(CRAWLER_DIR.glob('naver_news_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            items.extend(json.load(f).get('items', []))
+    return [synthesize_article_html(i, item) for i, item in enumerate(items)]
+
+
+def load_titles() -> list:
+    """검색 API 원형(<b> 강조 태그 + Entity) 형태의 제목/요약 문자열 생성"""
+    texts = []
+    for path in sorted(CRAWLER_DIR.glob('naver_news_*.json')):
+        keyword = path.stem.replace('naver_news_', '')
+        with open(path, 'r', encoding='utf-8') as f:
+            for item in json.load(f).get('items', []):
+                for text in (item.get('title', ''), item.get('description', '')):
+                    escaped = html.escape(text)
+                    texts.append(escaped.replace(keyword, f'<b>{keyword}</b>'))
+    # 이스케이프되지 않은 부등호가 포함된 요약 (태그로 오인하여 사이 문장이 삭제되지 않는지 확인)
+    texts += [
+        '기준<b>금리</b> < 3% 유지 시 성장률 > 2% 전망',
+        '영업이익률 <5% 구간 기업 비중 증가, PER > 10배',
+    ]
+    return texts
+
+
+def timed(label: str, fn, n_docs: int, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = time.perf_counter() - started
+    per_doc_ms = elapsed / (n_docs * repeat) * 1000
+    print(f"{label:>22}: {elapsed:.3f}s ({per_doc_ms:.3f} ms/doc)")
+    return result, per_doc_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='뉴스 본문 추출 경로 벤치마크 및 정합성 검증')
+    parser.add_argument('--html_dir', type=str, help='기사 HTML Fixture 디렉토리 (*.html)')
+    parser.add_argument('--save_fixtures', type=str, help='합성 HTML Corpus를 저장할 디렉토리')
+    parser.add_argument('--repeat', type=int, default=10, help='반복 측정 횟수')
+    parser.add_argument('--workers', type=int, default=4, help='Process Pool Worker 수')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.html_dir)
+    if not corpus:
+        print("[ERROR] HTML Corpus가 비어 있습니다.")
+        sys.exit(1)
+    if args.save_fixtures:
+        out_dir = Path(args.save_fixtures)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for i, page in enumerate(corpus):
+            (out_dir / f"article_{i:04d}.html").write_text(page, encoding='utf-8')
+        print(f"Fixture 저장: {out_dir} ({len(corpus)}건)")
+
+    avg_kb = sum(len(p.encode('utf-8')) for p in corpus) / len(corpus) / 1024
+    print(f"Corpus: {len(corpus)}건 (평균 {avg_kb:.1f} KB)")
+
+    soup_out, t_soup = timed("BeautifulSoup", lambda: [extract_content_soup(p) for p in corpus],
+                             len(corpus), args.repeat)
+    lxml_out, t_lxml = timed("lxml", lambda: [extract_content_lxml(p) for p in corpus], len(corpus), args.repeat)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(extract_content_lxml, corpus[:args.workers]))  # Worker 기동 비용 제외
+        pool_out, t_pool = timed(f"lxml + Pool({args.workers})",
+                                 lambda: list(pool.map(extract_content_lxml, corpus, chunksize=8)),
+                                 len(corpus), args.repeat)
+
+    titles = load_titles()
+    strip_soup, t_ts = timed("Title (BeautifulSoup)",
+                             lambda: [BeautifulSoup(t, 'html.parser').get_text() for t in titles],
+                             len(titles), args.repeat)
+    strip_fast, t_tf = timed("Title (strip_tags)", lambda: [strip_tags(t) for t in titles],
+                             len(titles), args.repeat)
+
+    mismatches = 0
+    for i, (a, b, c) in enumerate(zip(soup_out, lxml_out, pool_out)):
+        if not (a == b == c):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[Parity] 문서 {i} 불일치:\n  soup={a!r:.200}\n  lxml={b!r:.200}")
+    title_mismatches = sum(1 for a, b in zip(strip_soup, strip_fast) if a != b)
+
+    print("=" * 60)
+    print(f"Content Speedup: x{t_soup / t_lxml:.1f} (single) | x{t_soup / t_pool:.1f} (pool)")
+    print(f"Title Speedup:   x{t_ts / t_tf:.1f}")
+    ok = mismatches == 0 and title_mismatches == 0
+    print(f"Parity: {'OK' if ok else 'FAILED'} (content {mismatches}/{len(corpus)}, title {title_mismatches}/{len(titles)})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+[뉴스 본문 추출 엔진 (Article Content Extractor)]
+네이버 뉴스 상세 페이지 HTML에서 본문 텍스트를 추출하는 모듈입니다.
+
+Roles:
+1. Fast Path: lxml(libxml2) 파서 + XPath로 본문 영역만 탐색 (BeautifulSoup html.parser 대비 수 배 빠름)
+2. Legacy Path: 기존 BeautifulSoup 구현 유지 (정합성 비교 기준)
+3. Tag Stripper: 검색 API 제목/요약의 <b> 태그 및 HTML Entity를 정규식으로 제거 (파서 생성 없음)
+4. Process Pool: 모듈 수준 순수 함수로 구성하여 ProcessPoolExecutor에서 그대로 실행 가능
+
+두 경로의 출력은 BeautifulSoup get_text(strip=True)와 동일하도록 맞춥니다.
+(각 텍스트 노드를 strip 후 빈 문자열을 제외하고 연결, 주석/script/style 텍스트 제외)
+"""
+
+import html
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# 금융/경제 뉴스 본문에 주로 사용되는 selector (우선순위 순)
+CONTENT_SELECTORS = [
+    '#dic_area',           # 일반 뉴스 (최신)
+    '#newsct_article',     # 일반 뉴스 (구형)
+    '#articleBodyContents', # 경제/사회 구형
+    '.news_end'            # 일부 경제지
+]
+
+# 본문 내 제거 대상 (사진 설명, 스크립트, 기자 정보 등)
+NOISE_SELECTOR = '.img_desc, .end_photo_org, script, style, .reporter_area, .copyright, .byline'
+
+
+def css_to_xpath(selector: str, descendant: bool = True) -> str:
+    """단순 CSS selector(#id, .class, tag)를 XPath로 변환한다. (cssselect 의존성 없이 사용하는 범위로 한정)"""
+    prefix = './/' if descendant else '//'
+    selector = selector.strip()
+    if selector.startswith('#'):
+        return f"{prefix}*[@id='{selector[1:]}']"
+    if selector.startswith('.'):
+        return f"{prefix}*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    return f"{prefix}{selector}"
+
+
+CONTENT_XPATHS = [etree.XPath(css_to_xpath(s, descendant=False)) for s in CONTENT_SELECTORS]
+NOISE_XPATH = etree.XPath(' | '.join(css_to_xpath(s) for s in NOISE_SELECTOR.split(',')))
+
+# BeautifulSoup get_text()가 제외하는 텍스트 컨테이너 (script/style은 NOISE_SELECTOR에 포함)
+NON_TEXT_XPATH = etree.XPath('.//template')
+
+# 태그 형태(<b>, </b>, <br/> 등)만 제거 (본문 중 이스케이프되지 않은 비교 부등호 '금리 < 3%'는 유지)
+TAG_PATTERN = re.compile(r'</?[A-Za-z][^<>]*>')
+
+
+def extract_content_soup(page_html: str) -> Optional[str]:
+    """기존 BeautifulSoup(html.parser) 기반 본문 추출 (Legacy)"""
+    soup = BeautifulSoup(page_html, 'html.parser')
+
+    content_element = None
+    for selector in CONTENT_SELECTORS:
+        content_element = soup.select_one(selector)
+        if content_element:
+            break
+
+    if content_element:
+        # 불필요한 태그 제거
+        for tag in content_element.select(NOISE_SELECTOR):
+            tag.decompose()
+        return content_element.get_text(strip=True)
+    return None
+
+
+def extract_content_lxml(page_html: str) -> Optional[str]:
+    """lxml + XPath 기반 본문 추출 (Fast Path)"""
+    if not page_html or not page_html.strip():
+        return None
+    try:
+        root = lxml.html.fromstring(page_html)
+    except (etree.ParserError, ValueError):
+        return None
+
+    content_element = None
+    for xpath in CONTENT_XPATHS:
+        found = xpath(root)
+        if found:
+            content_element = found[0]
+            break
+
+    if content_element is None:
+        return None
+
+    # 노이즈 제거 (drop_tree는 뒤따르는 텍스트(tail)를 보존하므로 decompose와 동일)
+    for node in NOISE_XPATH(content_element):
+        node.drop_tree()
+    for node in NON_TEXT_XPATH(content_element):
+        node.drop_tree()
+
+    parts = []
+    _collect_text(content_element, parts)
+    return ''.join(parts)
+
+
+def _append_stripped(parts: list, text: Optional[str]):
+    if text:
+        text = text.strip()
+        if text:
+            parts.append(text)
+
+
+def _collect_text(element, parts: list):
+    """문서 순서(text -> 자식 -> 자식의 tail)대로 텍스트 노드를 수집한다. 주석/PI 자체 텍스트는 제외."""
+    _append_stripped(parts, element.text)
+    for child in element:
+        if isinstance(child.tag, str):
+            _collect_text(child, parts)
+        _append_stripped(parts, child.tail)
+
+
+def strip_tags(text: Optional[str]) -> Optional[str]:
+    """검색 API 제목/요약의 HTML 태그(<b> 등)와 Entity(&quot; 등)를 제거한다."""
+    if not text:
+        return text
+    return html.unescape(TAG_PATTERN.sub('', text))
+
+
+# --- Process Pool ---
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_extract_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    본문 추출용 공용 ProcessPoolExecutor를 반환한다.
+    (기본 Worker 수: NEWS_EXTRACT_WORKERS 환경변수, 미지정 시 min(4, CPU 수))
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max_workers or int(os.getenv('NEWS_EXTRACT_WORKERS', min(4, os.cpu_count() or 1)))
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def shutdown_extract_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
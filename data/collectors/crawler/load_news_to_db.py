@@ -0,0 +1,58 @@
+"""
+[뉴스 JSON 덤프 DB 적재 (News Batch ETL)]
+naver_news_crawler.py가 저장한 data/storage/raw/crawler/naver_news_*.json 파일을 news_articles / news_article_bodies 테이블에 적재하는 스크립트입니다.
+수집 시각은 각 JSON 파일의 수정 시각을 사용합니다.
+
+Usage:
+    python load_news_to_db.py
+    python load_news_to_db.py --pattern "naver_news_삼성전자*.json"
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가 (schema 모듈 import용)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.schema.db_models import init_db
+from data.collectors.crawler.news_db import upsert_news_items
+
+CRAWLER_DIR = Path(__file__).resolve().parents[2] / 'storage' / 'raw' / 'crawler'
+
+
+def load_news_dumps(directory: Path = CRAWLER_DIR, pattern: str = 'naver_news_*.json') -> int:
+    """JSON 덤프 파일을 순회하며 기사 항목을 Upsert 한다."""
+    paths = sorted(Path(directory).glob(pattern))
+    if not paths:
+        print(f"[ERROR] 적재할 JSON 파일이 없습니다: {directory / pattern}")
+        return 0
+
+    started = time.perf_counter()
+    total = 0
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get('items', [])
+        except (OSError, ValueError) as e:
+            print(f"[Skip] {path.name}: {e}")
+            continue
+        crawled_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+        count = upsert_news_items(items, crawled_at=crawled_at)
+        total += count
+        print(f"[Load] {path.name}: {count}건")
+
+    print(f"[Done] {len(paths)}개 파일, 기사 {total}건 적재 ({time.perf_counter() - started:.2f}s)")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='뉴스 JSON 덤프 DB 적재 스크립트')
+    parser.add_argument('--dir', type=str, default=str(CRAWLER_DIR), help='JSON 덤프 디렉토리')
+    parser.add_argument('--pattern', type=str, default='naver_news_*.json', help='파일 Glob 패턴')
+    args = parser.parse_args()
+
+    init_db()
+    load_news_dumps(Path(args.dir), args.pattern)
@@ -1,15 +1,23 @@
 import os
 import sys
+import asyncio
+import urllib.parse
 import urllib.request
 import json
+import httpx
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from pathlib import Path
 from tqdm import tqdm
 import time
 import argparse
 
+# 프로젝트 루트 경로 추가 (crawler 하위 모듈 import용)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.collectors.crawler.article_store import get_article_store
+from data.collectors.crawler.content_extractor import extract_content_lxml, get_extract_executor, strip_tags
+from data.collectors.crawler.news_dedup import cluster_news_items
+
 # Load environment variables explicitly from project root
 base_dir = Path(__file__).resolve().parent.parent.parent.parent
 env_path = base_dir / ".env"
@@ -49,6 +57,16 @@ def get_news_list(keyword, display=10, start=1, sort='sim'):
         print(f"Error during API request: {e}")
         return None
 
+# 금융 관련 키워드 (검색 질의 확장용)
+FINANCIAL_KEYWORDS = ["주가", "실적", "공시", "배당", "증권", "투자", "매출", "영업이익", "수주", "이익"]
+
+def augment_financial_query(query):
+    """
+    Query Augmentation: (query) AND (keyword1 | keyword2 | ...)
+    """
+    keyword_part = " | ".join(FINANCIAL_KEYWORDS)
+    return f"{query} ({keyword_part})"
+
 def check_is_excluded_domain(url):
     """
     해당 URL이 금융 정보 에이전트에서 배제해야 할 도메인(스포츠, 연예)인지 확인합니다.
@@ -62,59 +80,77 @@ def check_is_excluded_domain(url):
     ]
     return any(domain in url for domain in excluded_domains)
 
-def get_news_content(url):
+# 네이버 뉴스 본문 요청 헤더
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+# 본문 추출을 Process Pool에서 수행할지 여부 (기본: Worker Thread)
+EXTRACT_IN_PROCESS = os.getenv("NEWS_EXTRACT_IN_PROCESS", "0") == "1"
+
+def extract_news_content(html):
     """
-    네이버 뉴스 상세 페이지에서 본문 내용을 추출합니다.
+    기사 HTML에서 본문 텍스트를 추출합니다. (lxml 기반 Fast Path)
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    
+    return extract_content_lxml(html)
+
+async def extract_news_content_async(html):
+    """
+    이벤트 루프를 막지 않도록 본문 추출을 Worker Thread 또는 Process Pool로 위임합니다.
+    """
+    if EXTRACT_IN_PROCESS:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_extract_executor(), extract_content_lxml, html)
+    return await asyncio.to_thread(extract_content_lxml, html)
+
+def fetch_article(url, original_url=None, title=None, store=None):
+    """
+    기사 저장소를 먼저 조회한 뒤, 필요한 경우에만 네이버 뉴스 상세 페이지를 요청합니다.
+    신선 기간이 지난 저장본은 ETag/Last-Modified 조건부 요청으로 재검증합니다.
+    Returns: (content, from_network)
+    """
+    store = store or get_article_store()
+    entry = store.lookup(url, original_url=original_url, title=title)
+    if entry and entry['fresh']:
+        return entry['content'], False
+
     try:
+        headers = {**REQUEST_HEADERS, **store.conditional_headers(entry)}
         response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and entry:
+            store.mark_validated(entry['url_key'])
+            return entry['content'], True
         if response.status_code != 200:
-            return None
-            
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 금융/경제 뉴스 본문에 주로 사용되는 selector
-        selectors = [
-            '#dic_area',           # 일반 뉴스 (최신)
-            '#newsct_article',     # 일반 뉴스 (구형)
-            '#articleBodyContents', # 경제/사회 구형
-            '.news_end'            # 일부 경제지
-        ]
-        
-        content_element = None
-        for selector in selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                break
-            
-        if content_element:
-            # 불필요한 태그 제거
-            for tag in content_element.select('.img_desc, .end_photo_org, script, style, .reporter_area, .copyright, .byline'):
-                tag.decompose()
-            return content_element.get_text(strip=True)
-        return None
+            return None, True
+        content = extract_news_content(response.text)
+        store.put(url, content, etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'),
+                  original_url=original_url, title=title)
+        return content, True
             
     except Exception as e:
         print(f"Error scraping {url}: {e}")
-        return None
+        return None, True
 
-def crawl_naver_news(keyword, display=10, sort='sim', crawl_content=False):
+def get_news_content(url, original_url=None, title=None):
     """
-    네이버 뉴스 검색 및 본문 수집을 수행합니다.
-    배제 도메인을 필터링합니다.
+    네이버 뉴스 상세 페이지에서 본문 내용을 추출합니다. (기사 저장소 우선 조회)
     """
-    search_result = get_news_list(keyword, display=display, sort=sort)
-    
-    if not search_result or 'items' not in search_result:
-        return None
-    
-    items = search_result['items']
-    collected_data = []
-    
+    content, _ = fetch_article(url, original_url=original_url, title=title)
+    return content
+
+def is_crawlable(item):
+    """네이버 뉴스 도메인인 경우에만 크롤링 시도 (성공률과 속도 고려)"""
+    target_url = item['link']
+    return 'news.naver.com' in target_url or 'n.news.naver.com' in target_url
+
+def prepare_items(items, dedup=False):
+    """
+    검색 결과에서 배제 도메인을 제거하고 제목/요약의 HTML 태그를 정리합니다.
+    dedup=True이면 제목/요약 기준 유사 중복 기사를 대표 기사 1건으로 병합합니다. (대체 출처는 'alternates')
+    대표 기사는 본문 크롤링이 가능한 기사를 우선 선택합니다.
+    Returns: [(item, can_crawl)] - 네이버 뉴스 도메인인 경우에만 본문 크롤링 대상
+    """
+    filtered = []
     for item in items:
         # 배제 도메인 체크 (link와 originallink 모두 검사)
         is_excluded = check_is_excluded_domain(item['link'])
@@ -124,27 +160,150 @@ def crawl_naver_news(keyword, display=10, sort='sim', crawl_content=False):
         if is_excluded:
             continue # 스포츠/연예 뉴스는 건너뜀
 
-        # HTML 태그 제거
-        item['title'] = BeautifulSoup(item['title'], 'html.parser').get_text()
-        item['description'] = BeautifulSoup(item['description'], 'html.parser').get_text()
-        
-        # 네이버 뉴스 도메인인 경우에만 크롤링 시도 (성공률과 속도 고려)
-        target_url = item['link']
-        can_crawl = 'news.naver.com' in target_url or 'n.news.naver.com' in target_url
-        
+        # HTML 태그 제거 (<b> 강조 태그 및 Entity)
+        item['title'] = strip_tags(item['title'])
+        item['description'] = strip_tags(item['description'])
+        filtered.append(item)
+
+    if dedup:
+        filtered = cluster_news_items(filtered, use_content=False, prefer=is_crawlable)
+
+    return [(item, is_crawlable(item)) for item in filtered]
+
+def crawl_naver_news(keyword, display=10, sort='sim', crawl_content=False, start=1, dedup=True):
+    """
+    네이버 뉴스 검색 및 본문 수집을 수행합니다.
+    배제 도메인을 필터링합니다. start로 검색 결과 페이지 시작 위치를 지정합니다. (증분 수집용)
+    dedup=True이면 유사 중복 기사는 대표 기사만 본문을 수집하고, 본문 수집 후 한 번 더 병합합니다.
+    """
+    search_result = get_news_list(keyword, display=display, start=start, sort=sort)
+    
+    if not search_result or 'items' not in search_result:
+        return None
+    
+    collected_data = []
+    
+    for item, can_crawl in prepare_items(search_result['items'], dedup=dedup):
         if crawl_content and can_crawl:
-            content = get_news_content(target_url)
+            content, from_network = fetch_article(item['link'], item.get('originallink'), item['title'])
             item['content'] = content
-            if content:
+            if content and from_network:
                 time.sleep(0.1)
         else:
             item['content'] = None
             
         collected_data.append(item)
             
+    if dedup and crawl_content:
+        collected_data = cluster_news_items(collected_data)
     search_result['items'] = collected_data
     return search_result
 
+# 비동기 크롤링용 공용 httpx.AsyncClient (이벤트 루프 단위로 생성, Keep-Alive 재사용)
+ASYNC_POOL_SIZE = 20
+_async_client = None
+_async_client_loop = None
+
+def get_async_client():
+    """
+    현재 이벤트 루프에 종속된 공용 AsyncClient를 반환합니다. (요청마다 TCP/TLS 연결을 새로 맺지 않도록 재사용)
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            headers=REQUEST_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=ASYNC_POOL_SIZE, max_keepalive_connections=ASYNC_POOL_SIZE),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+async def close_async_client():
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
+
+async def fetch_news_content_async(client, url, host_limits, per_host, timeout, original_url=None, title=None):
+    """
+    기사 본문을 비동기로 요청하고, HTML 파싱은 Worker Thread에서 수행합니다.
+    동일 호스트에 대한 동시 요청 수는 per_host로 제한하며, 기사 저장소를 먼저 조회합니다.
+    기사 저장소(SQLite) 조회/저장은 Blocking I/O이므로 Worker Thread에서 수행합니다.
+    """
+    store = get_article_store()
+    entry = await asyncio.to_thread(store.lookup, url, original_url=original_url, title=title)
+    if entry and entry['fresh']:
+        return entry['content']
+
+    host = urllib.parse.urlsplit(url).netloc
+    semaphore = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+    try:
+        async with semaphore:
+            response = await client.get(url, headers=store.conditional_headers(entry), timeout=timeout)
+        if response.status_code == 304 and entry:
+            await asyncio.to_thread(store.mark_validated, entry['url_key'])
+            return entry['content']
+        if response.status_code != 200:
+            return None
+        # HTML 파싱은 CPU 작업이므로 이벤트 루프 밖에서 수행
+        content = await extract_news_content_async(response.text)
+        await asyncio.to_thread(store.put, url, content, etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'),
+                                original_url=original_url, title=title)
+        return content
+    except Exception as e:
+        print(f"Error scraping {url}: {e}")
+        return None
+
+async def crawl_naver_news_async(keyword, display=10, sort='sim', crawl_content=False,
+                                 deadline=5.0, per_host=4, article_timeout=4.0, dedup=True):
+    """
+    crawl_naver_news의 비동기 버전입니다.
+    기사 본문을 Connection Pool 기반으로 동시에 수집하며, 전체 제한 시간(deadline) 내에 완료되지 않은 기사는
+    content=None으로 반환합니다. (Partial Result)
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    # 검색 API 호출 (urllib 동기 호출을 Thread로 위임)
+    search_result = await asyncio.to_thread(get_news_list, keyword, display, 1, sort)
+    
+    if not search_result or 'items' not in search_result:
+        return None
+
+    prepared = prepare_items(search_result['items'], dedup=dedup)
+    for item, _ in prepared:
+        item['content'] = None
+
+    targets = [item for item, can_crawl in prepared if crawl_content and can_crawl]
+    if targets:
+        client = get_async_client()
+        host_limits = {}
+        tasks = {
+            asyncio.create_task(fetch_news_content_async(client, item['link'], host_limits, per_host, article_timeout,
+                                                       item.get('originallink'), item['title'])): item
+            for item in targets
+        }
+        remaining = max(0.0, deadline - (loop.time() - started))
+        done, pending = await asyncio.wait(tasks.keys(), timeout=remaining)
+
+        for task in done:
+            tasks[task]['content'] = task.result()
+        # 제한 시간 초과 기사는 취소 후 본문 없이 반환
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            print(f"[Crawler] 제한 시간({deadline}s) 초과: {len(pending)}/{len(targets)}건 본문 생략")
+
+    items = [item for item, _ in prepared]
+    if dedup and targets:
+        items = cluster_news_items(items)
+    search_result['items'] = items
+    return search_result
+
 def save_to_json(data, filename):
     save_dir = Path(__file__).parent.parent.parent / "storage" / "raw" / "crawler"
     save_dir.mkdir(parents=True, exist_ok=True)
@@ -159,10 +318,22 @@ if __name__ == "__main__":
     parser.add_argument('--keyword', type=str, default='삼성전자', help='Search keyword for news')
     parser.add_argument('--display', type=int, default=10, help='Number of articles to crawl (max 100)')
     parser.add_argument('--sort', type=str, default='sim', choices=['sim', 'date'], help='Sort order: sim (similarity) or date (date)')
+    parser.add_argument('--content', action='store_true', help='Crawl article bodies concurrently (async mode)')
+    parser.add_argument('--deadline', type=float, default=10.0, help='Overall deadline (seconds) for article crawling')
     
     args = parser.parse_args()
     
-    result = crawl_naver_news(args.keyword, display=args.display, sort=args.sort)
+    if args.content:
+        async def run_async():
+            try:
+                return await crawl_naver_news_async(args.keyword, display=args.display, sort=args.sort,
+                                                    crawl_content=True, deadline=args.deadline)
+            finally:
+                await close_async_client()
+        result = asyncio.run(run_async())
+    else:
+        result = crawl_naver_news(args.keyword, display=args.display, sort=args.sort)
+    print(f"[ArticleStore] {get_article_store().snapshot()}")
     
     if result:
         save_to_json(result, f"naver_news_{args.keyword}.json")
@@ -0,0 +1,255 @@
+"""
+[뉴스 기사 DB 저장 및 검색 (News Repository)]
+크롤링한 네이버 뉴스 기사를 news_articles / news_article_bodies 테이블에 저장하고, 로컬 검색을 제공하는 모듈입니다.
+
+Roles:
+1. Upsert: 정규화 URL(url_key) 기준 메타데이터 Upsert, 본문은 수집된 경우에만 갱신 (기존 본문을 NULL로 덮어쓰지 않음)
+2. Indexing: 제목/요약/본문을 어절 단위 문자 bigram으로 분해하여 tsvector로 저장 (GIN 인덱스)
+   - 확장 모듈(pg_trgm, 형태소 분석기) 없이 '삼성전자가', '삼성전자의' 등 조사가 붙은 어절도 부분 일치 검색
+3. Search: bigram tsquery로 후보를 인덱스 탐색한 뒤 ILIKE로 실제 포함 여부를 재확인
+4. Watchlist: /api/news 조회 질의를 news_watchlist에 기록하고, 백그라운드 수집 대상(상장사 일치 질의)을 선정
+
+Usage:
+    upsert_news_items(result['items'])
+    items = search_local_news('삼성전자', limit=10, max_age=3600)
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+
+from data.collectors.crawler.article_store import normalize_url
+from data.collectors.crawler.content_extractor import strip_tags
+from data.collectors.crawler.news_dedup import cluster_news_items
+from data.schema.db_models import SessionLocal, NewsArticle, NewsArticleBody
+
+UPSERT_BATCH_SIZE = 500
+
+# 네이버 검색 API pubDate 표기 기준 (KST)
+KST = timezone(timedelta(hours=9))
+
+# 검색 색인 대상 문자 (한글/영문/숫자 어절)
+WORD_PATTERN = re.compile(r'[0-9A-Za-z가-힣]+')
+
+
+def ngram_tokens(*texts: Optional[str]) -> List[str]:
+    """어절별 문자 bigram 목록을 생성한다. (1글자 어절은 그대로 사용, 중복 제거)"""
+    tokens = {}
+    for value in texts:
+        if not value:
+            continue
+        for word in WORD_PATTERN.findall(value.lower()):
+            if len(word) == 1:
+                tokens[word] = None
+            else:
+                for i in range(len(word) - 1):
+                    tokens[word[i:i + 2]] = None
+    return list(tokens)
+
+
+def parse_pub_date(value: Optional[str]) -> Optional[datetime]:
+    """네이버 검색 API pubDate (RFC 2822, 예: 'Fri, 09 Jan 2026 19:09:00 +0900') 파싱"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_rows(items: Iterable[dict], crawled_at: datetime):
+    """검색 결과 항목을 (기사 행, 본문 행) 목록으로 변환한다. 동일 url_key는 마지막 항목 기준."""
+    articles, bodies = {}, {}
+    for item in items:
+        url_key = normalize_url(item.get('link'))
+        if not url_key or not item.get('title'):
+            continue
+        content = item.get('content')
+        # 검색 API 원형 그대로 저장된 덤프(<b> 태그, Entity 포함)도 정리하여 적재
+        title = strip_tags(item['title'])
+        description = strip_tags(item.get('description'))
+        articles[url_key] = {
+            'url_key': url_key,
+            'link': item['link'],
+            'originallink': item.get('originallink'),
+            'title': title,
+            'description': description,
+            'pub_date': parse_pub_date(item.get('pubDate')),
+            'crawled_at': crawled_at,
+            'tokens': ' '.join(ngram_tokens(title, description, content)),
+        }
+        if content:
+            bodies[url_key] = {'url_key': url_key, 'content': content, 'updated_at': crawled_at}
+    return list(articles.values()), list(bodies.values())
+
+
+def _upsert_articles(session, rows: List[dict], merge_vector: bool):
+    """
+    기사 메타데이터 Upsert.
+    merge_vector=True: 이번 수집에 본문이 없는 기사 -> 기존 색인(저장된 본문 포함)에 제목/요약 토큰을 병합
+    """
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[i:i + UPSERT_BATCH_SIZE]
+        # bigram 토큰은 소문자 영숫자/한글로만 구성되므로 tsvector 입력 형식(공백 구분 Lexeme)으로 바로 전달
+        stmt = insert(NewsArticle).values([
+            {**{k: v for k, v in row.items() if k != 'tokens'}, 'search_vector': row['tokens']}
+            for row in batch
+        ])
+        search_vector = stmt.excluded.search_vector
+        if merge_vector:
+            search_vector = func.coalesce(NewsArticle.search_vector, text("''::tsvector")).op('||')(search_vector)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uix_news_article_url',
+            set_={
+                'link': stmt.excluded.link,
+                'originallink': stmt.excluded.originallink,
+                'title': stmt.excluded.title,
+                'description': stmt.excluded.description,
+                'pub_date': stmt.excluded.pub_date,
+                'crawled_at': stmt.excluded.crawled_at,
+                'search_vector': search_vector,
+            }
+        )
+        session.execute(stmt)
+
+
+def upsert_news_items(items: Iterable[dict], crawled_at: Optional[datetime] = None) -> int:
+    """뉴스 항목을 DB에 Upsert하고 반영된 기사 수를 반환한다."""
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    articles, bodies = build_rows(items, crawled_at)
+    if not articles:
+        return 0
+
+    has_body = {b['url_key'] for b in bodies}
+    with SessionLocal() as session:
+        _upsert_articles(session, [a for a in articles if a['url_key'] in has_body], merge_vector=False)
+        _upsert_articles(session, [a for a in articles if a['url_key'] not in has_body], merge_vector=True)
+
+        for i in range(0, len(bodies), UPSERT_BATCH_SIZE):
+            batch = bodies[i:i + UPSERT_BATCH_SIZE]
+            stmt = insert(NewsArticleBody).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['url_key'],
+                set_={'content': stmt.excluded.content, 'updated_at': stmt.excluded.updated_at}
+            )
+            session.execute(stmt)
+        session.commit()
+    return len(articles)
+
+
+def search_local_news(query: str, limit: int = 10, max_age: Optional[float] = None) -> List[dict]:
+    """
+    저장된 기사 중 질의어를 포함하는 기사를 네이버 검색 API 항목과 동일한 형식으로 반환한다.
+    max_age(초) 지정 시 해당 시간 이내에 수집된 기사만 대상으로 한다.
+    정렬: 제목 일치 우선 -> 발행 시각 최신순
+    서로 다른 수집 시점에 저장된 유사 중복 기사는 대표 기사로 병합한다. (후보를 limit의 2배까지 조회)
+    """
+    tokens = ngram_tokens(query)
+    if not tokens:
+        return []
+    pattern = f"%{query.strip()}%"
+
+    sql = """
+        SELECT a.title, a.originallink, a.link, a.description, a.pub_date, b.content
+        FROM news_articles a
+        LEFT JOIN news_article_bodies b ON b.url_key = a.url_key
+        WHERE a.search_vector @@ plainto_tsquery('simple', :tokens)
+          AND (a.title ILIKE :pattern OR a.description ILIKE :pattern OR b.content ILIKE :pattern)
+    """
+    params = {'tokens': ' '.join(tokens), 'pattern': pattern, 'limit': limit * 2}
+    if max_age is not None:
+        sql += " AND a.crawled_at >= :min_crawled_at"
+        params['min_crawled_at'] = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    sql += " ORDER BY (a.title ILIKE :pattern) DESC, a.pub_date DESC NULLS LAST LIMIT :limit"
+
+    with SessionLocal() as session:
+        rows = session.execute(text(sql), params).mappings().all()
+
+    items = [
+        {
+            'title': row['title'],
+            'originallink': row['originallink'],
+            'link': row['link'],
+            'description': row['description'],
+            'pubDate': row['pub_date'].astimezone(KST).strftime('%a, %d %b %Y %H:%M:%S %z') if row['pub_date'] else None,
+            'content': row['content'],
+        }
+        for row in rows
+    ]
+    return cluster_news_items(items)[:limit]
+
+
+def existing_url_keys(url_keys: Iterable[str]) -> set:
+    """이미 저장된 기사의 url_key 집합을 반환한다."""
+    url_keys = [k for k in url_keys if k]
+    if not url_keys:
+        return set()
+    with SessionLocal() as session:
+        rows = session.query(NewsArticle.url_key).filter(NewsArticle.url_key.in_(url_keys)).all()
+    return {row.url_key for row in rows}
+
+
+def record_news_request(query: str) -> Optional[dict]:
+    """
+    조회 질의를 Watchlist에 기록(조회 수 증가)하고, 해당 질의의 최근 수집 이력을 반환한다.
+    질의가 상장사 기업명과 정확히 일치하면 corp_code를 함께 기록한다.
+    """
+    query = ' '.join(query.split())
+    if not query:
+        return None
+    sql = text("""
+        INSERT INTO news_watchlist (query, corp_code, request_count, last_requested_at)
+        VALUES (:query,
+                (SELECT corp_code FROM dart_corps WHERE corp_name = :query AND stock_code IS NOT NULL LIMIT 1),
+                1, :now)
+        ON CONFLICT ON CONSTRAINT uix_news_watch_query DO UPDATE SET
+            request_count = news_watchlist.request_count + 1,
+            last_requested_at = EXCLUDED.last_requested_at
+        RETURNING query, corp_code, request_count, last_polled_at, last_pub_date
+    """)
+    with SessionLocal() as session:
+        row = session.execute(sql, {'query': query, 'now': datetime.now(timezone.utc)}).mappings().first()
+        session.commit()
+    return dict(row) if row else None
+
+
+def list_due_watches(min_interval: float, active_days: float, corps_only: bool = True) -> List[dict]:
+    """
+    백그라운드 수집 대상 질의 목록을 반환한다.
+    최근 active_days 이내 조회되었고, 마지막 수집 후 min_interval(초)이 지난 질의 (조회 수 많은 순)
+    """
+    now = datetime.now(timezone.utc)
+    sql = """
+        SELECT query, corp_code, request_count, last_polled_at, last_pub_date
+        FROM news_watchlist
+        WHERE last_requested_at >= :active_since
+          AND (last_polled_at IS NULL OR last_polled_at < :polled_before)
+    """
+    if corps_only:
+        sql += " AND corp_code IS NOT NULL"
+    sql += " ORDER BY request_count DESC, last_requested_at DESC"
+    params = {
+        'active_since': now - timedelta(days=active_days),
+        'polled_before': now - timedelta(seconds=min_interval),
+    }
+    with SessionLocal() as session:
+        return [dict(row) for row in session.execute(text(sql), params).mappings().all()]
+
+
+def mark_polled(query: str, last_pub_date: Optional[datetime] = None):
+    """질의의 백그라운드 수집 완료 시각 및 최신 기사 발행 시각을 기록한다."""
+    with SessionLocal() as session:
+        session.execute(
+            text("""
+                UPDATE news_watchlist
+                SET last_polled_at = :now,
+                    last_pub_date = GREATEST(last_pub_date, :last_pub_date)
+                WHERE query = :query
+            """),
+            {'query': query, 'now': datetime.now(timezone.utc), 'last_pub_date': last_pub_date}
+        )
+        session.commit()
@@ -0,0 +1,156 @@
+"""
+[뉴스 유사 중복 기사 군집화 (Near-duplicate Clustering)]
+통신사 기사 전재 등으로 검색 결과에 반복되는 유사 기사를 MinHash + LSH로 묶어 대표 기사 1건만 남기는 모듈입니다.
+
+Roles:
+1. Shingling: 공백/문장부호를 제거한 문자 3-gram 집합 (한국어 조사/어미 차이에 강건)
+2. MinHash: numpy로 64개 해시 함수의 최솟값 서명을 일괄 계산 (서명 일치 비율 ≈ Jaccard 유사도)
+3. LSH: 서명을 밴드(16 x 4행) 단위로 버킷팅하여 후보 쌍만 비교 (전체 쌍 비교 회피)
+4. Clustering: 추정 유사도가 임계값 이상인 기사들을 Union-Find로 군집화, 대표 기사 + 대체 출처(alternates) 목록 반환
+
+Pipeline:
+    본문 수집 전: 제목 + 요약 기준 군집화 -> 대표 기사만 본문 수집 (크롤링 감소)
+    본문 수집 후: 본문 포함 재군집화 -> 제목이 달라도 본문이 같은 기사 병합 (저장/LLM 전달량 감소)
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.6
+
+# Universal Hashing 파라미터 (고정 Seed로 프로세스 간 동일한 서명 보장)
+# x, a, b < p = 2^31 - 1 이므로 a * x + b < 2^62 로 uint64 범위 안에서 overflow 없이 mod p 계산
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(1)
+PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+
+def shingles(text: Optional[str], k: int = SHINGLE_SIZE) -> set:
+    """정규화(소문자, 공백/문장부호 제거)한 문자열의 문자 k-gram 집합"""
+    if not text:
+        return set()
+    normalized = NON_WORD_PATTERN.sub('', text.lower())
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+def minhash_signature(shingle_set: set) -> Optional[np.ndarray]:
+    """MinHash 서명 (길이 NUM_PERM). 빈 집합은 None."""
+    if not shingle_set:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set),
+                         dtype=np.uint64, count=len(shingle_set)) % MERSENNE_PRIME
+    # (a * x + b) mod p 를 [shingle x perm] 행렬로 일괄 계산
+    permuted = (np.outer(hashes, PERM_A) + PERM_B) % MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+
+def estimate_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """두 MinHash 서명의 일치 비율 (Jaccard 유사도 추정치)"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def item_text(item: dict, use_content: bool = True) -> str:
+    parts = [item.get('title') or '', item.get('description') or '']
+    if use_content and item.get('content'):
+        parts.append(item['content'])
+    return ' '.join(parts)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 먼저 등장한(검색 순위가 높은) 항목을 루트로 유지
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_clusters(signatures: List[Optional[np.ndarray]], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """LSH 후보 쌍 중 유사도 임계값 이상인 항목을 묶어 군집(인덱스 목록)을 반환한다. 입력 순서 유지."""
+    uf = _UnionFind(len(signatures))
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for idx, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes())
+            buckets[key].append(idx)
+
+    checked = set()
+    for members in buckets.values():
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                a, b = members[i], members[j]
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if estimate_similarity(signatures[a], signatures[b]) >= threshold:
+                    uf.union(a, b)
+
+    clusters: Dict[int, List[int]] = {}
+    for idx in range(len(signatures)):
+        clusters.setdefault(uf.find(idx), []).append(idx)
+    return list(clusters.values())
+
+
+def source_of(item: dict) -> dict:
+    """대체 출처 목록에 기록할 기사 요약 정보"""
+    return {
+        'title': item.get('title'),
+        'link': item.get('link'),
+        'originallink': item.get('originallink'),
+        'pubDate': item.get('pubDate'),
+    }
+
+
+def cluster_news_items(items: List[dict], threshold: float = DEFAULT_THRESHOLD, use_content: bool = True,
+                       prefer: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+    """
+    유사 중복 기사를 군집화하여 군집별 대표 기사 목록을 반환한다.
+    - 대표 기사: 본문이 있는 기사 우선, 다음으로 prefer(item)이 참인 기사(예: 본문 수집 가능), 그 외에는 검색 순위가 가장 높은 기사
+    - 대표 기사의 'alternates'에 나머지 기사의 출처 정보를 기록 (이전 단계에서 병합된 출처 포함)
+    - 반환 순서: 각 군집에서 가장 먼저 등장한 기사의 순서
+    """
+    if len(items) < 2:
+        for item in items:
+            item.setdefault('alternates', [])
+        return items
+
+    signatures = [minhash_signature(shingles(item_text(item, use_content))) for item in items]
+    representatives = []
+    for members in find_clusters(signatures, threshold):
+        rep_idx = next((i for i in members if items[i].get('content')), None)
+        if rep_idx is None and prefer is not None:
+            rep_idx = next((i for i in members if prefer(items[i])), None)
+        if rep_idx is None:
+            rep_idx = members[0]
+        rep = items[rep_idx]
+        alternates = list(rep.get('alternates') or [])
+        for idx in members:
+            if idx != rep_idx:
+                alternates.append(source_of(items[idx]))
+                alternates.extend(items[idx].get('alternates') or [])
+        rep['alternates'] = alternates
+        representatives.append(rep)
+    return representatives
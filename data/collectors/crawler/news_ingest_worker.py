@@ -0,0 +1,159 @@
+"""
+[뉴스 백그라운드 수집 Worker (News Ingestion Worker)]
+사용자가 조회한 기업(news_watchlist)의 최신 뉴스를 주기적으로 수집하여 news_articles 테이블에 저장하는 모듈입니다.
+/api/news는 수집된 기사를 로컬 검색으로 응답하므로 요청 경로에서 크롤링 지연이 발생하지 않습니다.
+
+Roles:
+1. Watchlist: 최근 조회된 상장사 질의 중 마지막 수집 후 일정 시간이 지난 질의만 선정 (조회 수 많은 순)
+2. Incremental Polling: sort='date'(최신순)로 start를 증가시키며 페이지 단위 조회,
+                        이미 저장된 기사를 만나면 이후 페이지는 더 오래된 기사이므로 중단
+3. Content: 목록(crawl_naver_news, 본문 제외) 조회 후 새로 발견된 기사만 본문 수집 (기사 저장소 경유)
+4. Schedule: --once(1회 실행) 또는 --interval 주기 반복 실행. Backend에서는 NEWS_INGEST_INTERVAL 설정 시 Thread로 구동
+
+Usage:
+    python news_ingest_worker.py --once
+    python news_ingest_worker.py --interval 600 --max_pages 5
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.schema.db_models import init_db
+from data.collectors.crawler.article_store import normalize_url
+from data.collectors.crawler.naver_news_crawler import crawl_naver_news, fetch_article, augment_financial_query
+from data.collectors.crawler.news_db import (
+    existing_url_keys, list_due_watches, mark_polled, parse_pub_date, upsert_news_items
+)
+
+# 네이버 검색 API 제한 (display 최대 100, start 최대 1000)
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+
+class NewsIngestWorker:
+    """Watchlist 기반 뉴스 증분 수집기"""
+
+    def __init__(self,
+                 interval: float = 600.0,
+                 display: int = 50,
+                 max_pages: int = 5,
+                 active_days: float = 7.0,
+                 crawl_content: bool = True,
+                 corps_only: bool = True):
+        self.interval = interval
+        self.display = min(display, MAX_DISPLAY)
+        self.max_pages = max_pages
+        self.active_days = active_days
+        self.crawl_content = crawl_content
+        self.corps_only = corps_only
+        self.stats = {'rounds': 0, 'queries': 0, 'pages': 0, 'new_articles': 0, 'errors': 0}
+
+    def ingest_query(self, query: str) -> dict:
+        """질의 1건을 최신순으로 증분 수집한다. 이미 저장된 기사에 도달하면 중단."""
+        augmented_query = augment_financial_query(query)
+        new_total, pages, newest = 0, 0, None
+
+        for page in range(self.max_pages):
+            start = 1 + page * self.display
+            if start > MAX_START:
+                break
+
+            listing = crawl_naver_news(augmented_query, display=self.display, sort='date', start=start)
+            if not listing or not listing.get('items'):
+                break
+            pages += 1
+
+            stored = existing_url_keys(normalize_url(item['link']) for item in listing['items'])
+            new_items = [item for item in listing['items'] if normalize_url(item['link']) not in stored]
+
+            # 새로 발견된 기사만 본문 수집 (네이버 뉴스 도메인 한정, 기사 저장소 경유)
+            for item in new_items:
+                if self.crawl_content and 'news.naver.com' in item['link']:
+                    item['content'], from_network = fetch_article(item['link'], item.get('originallink'), item['title'])
+                    if from_network:
+                        time.sleep(0.1)
+
+            if new_items:
+                upsert_news_items(new_items)
+                new_total += len(new_items)
+                dates = [d for d in (parse_pub_date(item.get('pubDate')) for item in new_items) if d]
+                if dates:
+                    newest = max([newest, *dates]) if newest else max(dates)
+
+            # 최신순 정렬이므로 저장된 기사가 포함된 페이지 이후는 모두 기존 기사
+            # (배제 도메인 필터링으로 items 수가 줄 수 있으므로 마지막 페이지 판단은 검색 결과 total 기준)
+            if stored or start + self.display > listing.get('total', 0):
+                break
+
+        mark_polled(query, newest)
+        return {'query': query, 'pages': pages, 'new_articles': new_total}
+
+    def run_once(self) -> list:
+        """수집 주기가 도래한 Watchlist 질의를 모두 수집한다."""
+        results = []
+        watches = list_due_watches(self.interval, self.active_days, corps_only=self.corps_only)
+        for watch in watches:
+            try:
+                result = self.ingest_query(watch['query'])
+                results.append(result)
+                self.stats['queries'] += 1
+                self.stats['pages'] += result['pages']
+                self.stats['new_articles'] += result['new_articles']
+                print(f"[NewsIngest] {result['query']}: 신규 {result['new_articles']}건 ({result['pages']}페이지)")
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"[NewsIngest] {watch['query']} 수집 실패: {e}")
+        self.stats['rounds'] += 1
+        return results
+
+    def run_forever(self, stop_event: threading.Event = None):
+        """interval 주기로 run_once를 반복한다. stop_event 설정 시 종료."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"[NewsIngest] 수집 라운드 실패: {e}")
+            # 라운드 간격은 Watchlist 재수집 주기의 1/4 (주기가 도래한 질의를 늦지 않게 처리)
+            stop_event.wait(max(1.0, self.interval / 4 - (time.monotonic() - started)))
+
+
+def start_background_worker(worker: NewsIngestWorker) -> threading.Event:
+    """Worker를 Daemon Thread로 구동하고 종료용 Event를 반환한다."""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=worker.run_forever, args=(stop_event,), name='news-ingest', daemon=True)
+    thread.start()
+    return stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watchlist 기반 뉴스 백그라운드 수집기')
+    parser.add_argument('--once', action='store_true', help='1회 수집 후 종료')
+    parser.add_argument('--interval', type=float, default=600, help='질의별 재수집 주기 (초)')
+    parser.add_argument('--display', type=int, default=50, help='페이지당 기사 수 (최대 100)')
+    parser.add_argument('--max_pages', type=int, default=5, help='질의당 최대 조회 페이지 수')
+    parser.add_argument('--active_days', type=float, default=7, help='최근 N일 이내 조회된 질의만 수집')
+    parser.add_argument('--no_content', action='store_true', help='본문 수집 생략 (메타데이터만 저장)')
+    parser.add_argument('--all_queries', action='store_true', help='상장사와 일치하지 않는 질의도 수집')
+    args = parser.parse_args()
+
+    init_db()
+    worker = NewsIngestWorker(interval=args.interval, display=args.display, max_pages=args.max_pages,
+                              active_days=args.active_days, crawl_content=not args.no_content,
+                              corps_only=not args.all_queries)
+    if args.once:
+        worker.run_once()
+        print(f"[NewsIngest] {worker.stats}")
+    else:
+        worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
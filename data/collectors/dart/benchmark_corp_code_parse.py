@@ -0,0 +1,91 @@
+"""
+[CORPCODE.xml 파싱 벤치마크]
+get_corp_code.py의 Streaming 파서(iterparse)와 기존 BeautifulSoup 파서를 합성 corpCode.zip으로 비교하는 스크립트입니다.
+
+Checks:
+1. Parity: 두 파서가 동일한 DataFrame을 생성하는지 검증
+2. Benchmark: 파싱 소요 시간 및 Peak RSS 비교 (파서별 독립 프로세스에서 측정)
+
+Usage:
+    python benchmark_corp_code_parse.py --corps 100000
+    python benchmark_corp_code_parse.py --zip /path/to/corpCode.zip   # 실제 DART 응답 파일 사용
+"""
+
+import argparse
+import io
+import multiprocessing as mp
+import resource
+import sys
+import time
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+PARSERS = {
+    'streaming': 'parse_corp_code_xml',
+    'soup': 'parse_corp_code_xml_soup',
+}
+
+
+def make_corp_code_zip(n_corps: int) -> bytes:
+    """DART corpCode.xml과 동일한 구조의 합성 ZIP 생성 (상장사 비율 약 3%)"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<result>']
+    for i in range(n_corps):
+        stock_code = f"{i:06d}" if i % 30 == 0 else ' '
+        lines.append(
+            f"<list><corp_code>{i:08d}</corp_code><corp_name>합성기업{i}</corp_name>"
+            f"<stock_code>{stock_code}</stock_code><modify_date>2024{i % 12 + 1:02d}01</modify_date></list>"
+        )
+    lines.append('</result>')
+
+    buf = io.BytesIO()
+    with ZipFile(buf, 'w', ZIP_DEFLATED) as zf:
+        zf.writestr('CORPCODE.xml', '\n'.join(lines).encode('utf-8'))
+    return buf.getvalue()
+
+
+def run_parser(name: str, content: bytes, queue):
+    """독립 프로세스에서 파서를 실행하고 소요 시간, Peak RSS 증가분, 결과를 전달한다."""
+    from data.collectors.dart import get_corp_code
+
+    parse = getattr(get_corp_code, PARSERS[name])
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    with ZipFile(io.BytesIO(content)) as zf:
+        with zf.open('CORPCODE.xml') as f:
+            df = parse(f)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss 단위: Linux KB
+    queue.put((name, elapsed, (rss_after - rss_before) / 1024, rss_after / 1024, df))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CORPCODE.xml 파서 벤치마크')
+    parser.add_argument('--corps', type=int, default=100_000, help='합성 기업 수')
+    parser.add_argument('--zip', type=str, help='실제 corpCode.zip 경로 (지정 시 합성 데이터 대신 사용)')
+    args = parser.parse_args()
+
+    content = Path(args.zip).read_bytes() if args.zip else make_corp_code_zip(args.corps)
+    print(f"입력 ZIP: {len(content) / 1024 / 1024:.1f} MB")
+
+    ctx = mp.get_context('spawn')
+    results = {}
+    for name in PARSERS:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=run_parser, args=(name, content, queue))
+        proc.start()
+        name, elapsed, rss_delta, rss_peak, df = queue.get()
+        proc.join()
+        results[name] = df
+        print(f"{name:>10}: {elapsed:.2f}s | Peak RSS +{rss_delta:.0f} MB (total {rss_peak:.0f} MB) | {len(df)} corps")
+
+    same = results['streaming'].equals(results['soup'])
+    print(f"Parity: {'OK' if same else 'FAILED'}")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+[대용량 CSV 적재기 (COPY-based Bulk Loader)]
+CSV 파일을 PostgreSQL COPY로 임시 Staging 테이블에 스트리밍한 뒤, 단일 Set-based Upsert로 대상 테이블에 병합하는 모듈입니다.
+
+Roles:
+1. Staging: CSV 헤더 기준 TEXT 컬럼 임시 테이블 생성 (ON COMMIT DROP) 후 COPY FROM STDIN
+2. Merge: INSERT ... SELECT DISTINCT ON (키) ... ON CONFLICT DO UPDATE 1회 실행 (행 단위 Round-trip 제거)
+3. Change Filter: 값이 동일한 행은 UPDATE 생략 (IS DISTINCT FROM) -> 불필요한 Dead Tuple 방지
+4. Metrics: 적재 행 수 및 처리량(rows/s) 보고
+
+Targets:
+    corps          -> dart_corps          (corp_code.csv, get_corp_code.py 산출물)
+    dividends      -> dart_dividends      (Mart 형식 CSV, 예: export_to_csv.py 산출물)
+    dividends_raw  -> dart_dividends_raw  (Raw 형식 CSV: rcept_no, se, thstrm 등 API 응답 필드)
+
+Usage:
+    python bulk_loader.py --target corps --csv ../../storage/raw/dart/corp_code.csv
+    python bulk_loader.py --target dividends --csv ../../storage/processed/dart/dividends_mart.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가 (schema 모듈 import용)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.schema.db_models import engine, init_db, refresh_dividend_series
+
+STORAGE_DIR = Path(__file__).resolve().parents[2] / 'storage'
+
+# 대상 테이블별 병합 규칙
+#   columns: (컬럼명, Staging TEXT -> 대상 타입 변환 SQL 식)
+#   conflict: ON CONFLICT 대상 (컬럼 목록 혹은 제약조건)
+#   refresh_series: 병합된 행이 있으면 배당 시계열 View(dart_dividend_series) 갱신
+TARGETS = {
+    'corps': {
+        'table': 'dart_corps',
+        'keys': ['corp_code'],
+        'conflict': '(corp_code)',
+        'columns': [
+            ('corp_code', 's.corp_code'),
+            ('corp_name', 's.corp_name'),
+            ('stock_code', "NULLIF(TRIM(s.stock_code), '')"),
+            ('modify_date', 's.modify_date'),
+        ],
+        'default_csv': STORAGE_DIR / 'raw' / 'dart' / 'corp_code.csv',
+        'refresh_series': True,
+    },
+    'dividends': {
+        'table': 'dart_dividends',
+        'keys': ['corp_code', 'bsns_year', 'reprt_code', 'stock_knd'],
+        'conflict': 'ON CONSTRAINT uix_dividend_clean_identifier',
+        'columns': [
+            ('corp_code', 's.corp_code'),
+            ('corp_name', 's.corp_name'),
+            ('bsns_year', 's.bsns_year'),
+            ('reprt_code', 's.reprt_code'),
+            ('stock_knd', 's.stock_knd'),
+            ('dps', "ROUND(NULLIF(s.dps, '')::numeric)::integer"),
+            ('dividend_yield', "NULLIF(s.dividend_yield, '')::double precision"),
+            ('total_dividend', "ROUND(NULLIF(s.total_dividend, '')::numeric)::bigint"),
+            ('net_income', "ROUND(NULLIF(s.net_income, '')::numeric)::bigint"),
+            ('eps', "ROUND(NULLIF(s.eps, '')::numeric)::integer"),
+            ('payout_ratio', "NULLIF(s.payout_ratio, '')::double precision"),
+            ('stlm_dt', 's.stlm_dt'),
+        ],
+        # FK(dart_corps) 위반 행은 병합 대상에서 제외
+        'filter': 'EXISTS (SELECT 1 FROM dart_corps c WHERE c.corp_code = s.corp_code)',
+        'default_csv': STORAGE_DIR / 'processed' / 'dart' / 'dividends_mart.csv',
+        'refresh_series': True,
+    },
+    'dividends_raw': {
+        'table': 'dart_dividends_raw',
+        'keys': ['corp_code', 'bsns_year', 'reprt_code', 'se', 'stock_knd'],
+        'conflict': 'ON CONSTRAINT uix_dividend_raw_identifier',
+        'columns': [
+            ('rcept_no', 's.rcept_no'),
+            ('corp_code', 's.corp_code'),
+            ('corp_name', 's.corp_name'),
+            ('bsns_year', 's.bsns_year'),
+            ('reprt_code', 's.reprt_code'),
+            ('se', 's.se'),
+            ('stock_knd', "COALESCE(s.stock_knd, '')"),  # get_dividends.py와 동일하게 NULL -> 빈 문자열
+            ('thstrm', 's.thstrm'),
+            ('frmtrm', 's.frmtrm'),
+            ('lwfr', 's.lwfr'),
+            ('stlm_dt', 's.stlm_dt'),
+        ],
+        'default_csv': STORAGE_DIR / 'raw' / 'dart' / 'dividends.csv',
+    },
+}
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def read_header(csv_path: Path) -> list:
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f))
+
+
+def build_merge_sql(spec: dict, staging: str) -> str:
+    """Staging -> 대상 테이블 Set-based Upsert 구문 생성"""
+    cols = [c for c, _ in spec['columns']]
+    exprs = [f"{expr} AS {c}" for c, expr in spec['columns']]
+    keys = spec['keys']
+    non_keys = [c for c in cols if c not in keys]
+    # 중복 제거/정렬 키는 실제 적재 값 기준 (예: stock_knd NULL과 ''는 같은 대상 행)
+    key_exprs = ', '.join(dict(spec['columns']).get(k, f"s.{k}") for k in keys)
+
+    where = [f"s.{k} IS NOT NULL" for k in keys if k != 'stock_knd']
+    if spec.get('filter'):
+        where.append(spec['filter'])
+
+    target_cols = ', '.join(f"t.{c}" for c in non_keys)
+    excluded_cols = ', '.join(f"EXCLUDED.{c}" for c in non_keys)
+    return f"""
+        INSERT INTO {spec['table']} AS t ({', '.join(cols)})
+        SELECT DISTINCT ON ({key_exprs}) {', '.join(exprs)}
+        FROM {staging} s
+        WHERE {' AND '.join(where) if where else 'TRUE'}
+        ORDER BY {key_exprs}
+        ON CONFLICT {spec['conflict']} DO UPDATE SET
+            {', '.join(f'{c} = EXCLUDED.{c}' for c in non_keys)}
+        WHERE ({target_cols}) IS DISTINCT FROM ({excluded_cols})
+    """
+
+
+def bulk_load_csv(csv_path: Path, target: str) -> dict:
+    """CSV를 COPY로 Staging에 적재 후 대상 테이블로 병합한다. 전체 과정은 단일 트랜잭션으로 수행된다."""
+    spec = TARGETS[target]
+    csv_path = Path(csv_path)
+    header = read_header(csv_path)
+
+    required = {c for c, _ in spec['columns']}
+    missing = sorted(required - set(header))
+    if missing:
+        raise ValueError(f"CSV에 필요한 컬럼이 없습니다 ({target}): {missing}")
+
+    staging = f"staging_{spec['table']}"
+    started = time.perf_counter()
+
+    raw_conn = engine.raw_connection()
+    try:
+        cur = raw_conn.cursor()
+
+        # 1. Staging 테이블 생성 (CSV 헤더 그대로, 모든 컬럼 TEXT)
+        cur.execute(f"CREATE TEMP TABLE {staging} ({', '.join(f'{quote_ident(c)} TEXT' for c in header)}) ON COMMIT DROP")
+
+        # 2. COPY FROM STDIN (파일을 스트리밍 전송, 헤더 행은 직접 건너뜀)
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            f.readline()
+            cur.copy_expert(f"COPY {staging} FROM STDIN WITH (FORMAT csv)", f)
+        cur.execute(f"SELECT COUNT(*) FROM {staging}")
+        copied = cur.fetchone()[0]
+        copied_at = time.perf_counter()
+
+        # 3. Set-based Upsert (변경된 행만 UPDATE)
+        cur.execute(build_merge_sql(spec, staging))
+        merged = cur.rowcount
+
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    if spec.get('refresh_series') and merged:
+        refresh_dividend_series(engine)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'target': spec['table'],
+        'copied': copied,
+        'merged': merged,
+        'copy_sec': round(copied_at - started, 3),
+        'total_sec': round(elapsed, 3),
+        'rows_per_sec': round(copied / elapsed) if elapsed else 0,
+    }
+    print(f"[BulkLoad] {spec['table']}: COPY {copied}행 ({stats['copy_sec']}s), "
+          f"Upsert {merged}행 (신규/변경), 총 {stats['total_sec']}s, {stats['rows_per_sec']} rows/s")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='COPY 기반 CSV 대량 적재 스크립트')
+    parser.add_argument('--target', type=str, required=True, choices=TARGETS.keys(), help='적재 대상')
+    parser.add_argument('--csv', type=str, help='CSV 파일 경로 (기본: 대상별 표준 저장 경로)')
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv) if args.csv else TARGETS[args.target]['default_csv']
+    if not csv_path.exists():
+        print(f"[ERROR] CSV 파일을 찾을 수 없습니다: {csv_path}")
+        sys.exit(1)
+
+    init_db()
+    bulk_load_csv(csv_path, args.target)
+
+
+if __name__ == "__main__":
+    main()
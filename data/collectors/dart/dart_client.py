@@ -0,0 +1,266 @@
+"""
+[DART Open API 공용 클라이언트 (Shared Async DART Client)]
+Backend(FastAPI)와 수집기(Collectors)가 공유하는 DART API 호출 모듈입니다.
+
+Roles:
+1. Connection Pooling: 이벤트 루프 당 하나의 httpx.AsyncClient를 재사용 (Keep-Alive, TLS 세션 재사용)
+   - 루프 종료 시(asyncio.run 종료 또는 aclose) 해당 루프의 Client를 닫아 연결을 반환
+2. Rate Limiting: Token Bucket으로 초당 호출량 제한 + 일일 호출 한도(기본 20,000건) 관리
+3. Concurrency Cap: Semaphore로 동시 요청 수 제한 (asyncio.gather 팬아웃 보호)
+4. Retry: HTTP 오류/타임아웃 및 DART 요청 제한(status 020) 응답 시 Jittered Exponential Backoff 재시도
+
+Configuration (.env):
+    DART_RATE_PER_SEC   초당 허용 요청 수 (기본 10)
+    DART_DAILY_LIMIT    일일 허용 요청 수 (기본 20000)
+    DART_MAX_CONCURRENCY 동시 요청 수 (기본 8)
+
+Usage:
+    # 비동기 (Backend)
+    data = await get_dart_client().get_json('fnlttSinglAcnt.json', params)
+
+    # 동기 (Collector 스크립트)
+    data = get_dart_client().get_json_sync('alotMatter.json', params)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DART_BASE_URL = 'https://opendart.fss.or.kr/api/'
+
+# 재시도 대상 DART 응답 상태 (020: 요청 제한 초과, 900: 정의되지 않은 오류)
+RETRYABLE_DART_STATUS = {'020', '900'}
+RETRYABLE_HTTP_STATUS = {429, 500, 502, 503, 504}
+
+# DART 일일 한도는 한국 시간 기준으로 초기화
+KST = timezone(timedelta(hours=9))
+
+
+class DartQuotaExceeded(RuntimeError):
+    """일일 호출 한도 소진 시 발생"""
+
+
+class TokenBucket:
+    """
+    asyncio 기반 Token Bucket Rate Limiter.
+    rate(초당 토큰 보충량) 속도로 토큰이 채워지며, 최대 capacity만큼 순간 버스트를 허용한다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class DailyQuota:
+    """KST 자정 기준으로 초기화되는 일일 호출 카운터"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.day = None
+        self.used = 0
+
+    def consume(self):
+        today = datetime.now(KST).date()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+        if self.used >= self.limit:
+            raise DartQuotaExceeded(f"DART 일일 호출 한도 초과 ({self.used}/{self.limit})")
+        self.used += 1
+
+
+@dataclass
+class LoopSession:
+    """이벤트 루프에 종속되는 asyncio/httpx 객체 묶음"""
+    client: httpx.AsyncClient
+    bucket: TokenBucket
+    semaphore: asyncio.Semaphore
+    closer: Optional[AsyncIterator] = None
+
+
+class DartClient:
+    """DART Open API 비동기 클라이언트 (프로세스 단위 공유)"""
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 rate_per_sec: float = 10.0,
+                 daily_limit: int = 20000,
+                 max_concurrency: int = 8,
+                 max_retries: int = 4,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 timeout: float = 30.0):
+        self.api_key = api_key or os.getenv('DART_API_KEY')
+        self.rate_per_sec = rate_per_sec
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.quota = DailyQuota(daily_limit)
+
+        # asyncio 객체는 생성된 이벤트 루프에 종속되므로 루프별로 최초 사용 시점에 생성
+        # (Backend 루프와 동기 호출용 루프가 번갈아 사용해도 Client를 다시 만들지 않음, 닫힌 루프 항목은 GC 시 제거)
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopSession]" = weakref.WeakKeyDictionary()
+
+        # 동기 호출용 전용 이벤트 루프 (Collector 스크립트에서 사용)
+        self._sync_loop = None
+        self._sync_thread = None
+        self._sync_lock = threading.Lock()
+
+        self.stats = {'requests': 0, 'retries': 0, 'errors': 0}
+
+    # --- Lifecycle ---
+
+    async def _ensure_session(self) -> LoopSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None:
+            client = httpx.AsyncClient(
+                base_url=DART_BASE_URL,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            session = LoopSession(client, TokenBucket(self.rate_per_sec), asyncio.Semaphore(self.max_concurrency))
+            self._sessions[loop] = session
+            session.closer = self._close_on_shutdown(loop, session)
+            await session.closer.asend(None)
+        return session
+
+    async def _close_on_shutdown(self, loop, session: LoopSession):
+        """
+        루프 종료 시 해당 루프의 Client를 닫는 Async Generator.
+        첫 반복 이후 대기 상태로 두면 asyncio.run 종료 단계(loop.shutdown_asyncgens)가 루프를 닫기 전에 finally를 실행한다.
+        """
+        try:
+            yield
+        finally:
+            # Generator가 루프 Finalizer를 참조하므로 항목을 직접 제거해야 닫힌 루프가 GC됨
+            self._sessions.pop(loop, None)
+            await session.client.aclose()
+
+    async def aclose(self):
+        """현재 이벤트 루프의 Client를 닫는다. (Backend lifespan 종료 시 호출)"""
+        session = self._sessions.get(asyncio.get_running_loop())
+        if session is not None:
+            await session.closer.aclose()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full Jitter Backoff: [0, min(max, base * 2^attempt)] 구간의 임의 대기시간"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    # --- Request ---
+
+    async def request(self, endpoint: str, params: dict, expect: str = 'json'):
+        """
+        DART API를 호출한다.
+        expect='json'이면 파싱된 dict를, 'bytes'이면 응답 본문(예: corpCode.xml ZIP)을 반환한다.
+        """
+        session = await self._ensure_session()
+        params = {'crtfc_key': self.api_key, **params}
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+            async with session.semaphore:
+                await session.bucket.acquire()
+                self.quota.consume()
+                self.stats['requests'] += 1
+                try:
+                    res = await session.client.get(endpoint, params=params)
+                except httpx.TransportError as e:
+                    last_error = e
+                    continue
+
+            if res.status_code in RETRYABLE_HTTP_STATUS:
+                last_error = httpx.HTTPStatusError(f"HTTP {res.status_code}", request=res.request, response=res)
+                continue
+            res.raise_for_status()
+
+            if expect == 'bytes':
+                # 오류 시 DART는 ZIP 대신 JSON/XML 메시지를 반환하므로 Content-Type으로 구분
+                if 'json' not in res.headers.get('content-type', ''):
+                    return res.content
+                data = res.json()
+            else:
+                data = res.json()
+
+            if data.get('status') in RETRYABLE_DART_STATUS:
+                last_error = RuntimeError(f"DART status {data.get('status')}: {data.get('message')}")
+                continue
+            if expect == 'bytes':
+                raise RuntimeError(f"DART status {data.get('status')}: {data.get('message')}")
+            return data
+
+        self.stats['errors'] += 1
+        raise last_error
+
+    async def get_json(self, endpoint: str, params: dict) -> dict:
+        return await self.request(endpoint, params, expect='json')
+
+    async def get_bytes(self, endpoint: str, params: dict) -> bytes:
+        return await self.request(endpoint, params, expect='bytes')
+
+    # --- Sync Bridge ---
+
+    def _run_sync(self, coro):
+        """전용 백그라운드 이벤트 루프에서 코루틴을 실행하여 커넥션 풀과 Rate Limiter를 유지한다."""
+        with self._sync_lock:
+            if self._sync_loop is None:
+                self._sync_loop = asyncio.new_event_loop()
+                self._sync_thread = threading.Thread(target=self._sync_loop.run_forever,
+                                                     name='dart-client', daemon=True)
+                self._sync_thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._sync_loop).result()
+
+    def get_json_sync(self, endpoint: str, params: dict) -> dict:
+        return self._run_sync(self.get_json(endpoint, params))
+
+    def get_bytes_sync(self, endpoint: str, params: dict) -> bytes:
+        return self._run_sync(self.get_bytes(endpoint, params))
+
+
+_default_client: Optional[DartClient] = None
+_default_lock = threading.Lock()
+
+
+def get_dart_client() -> DartClient:
+    """프로세스 공용 DartClient 인스턴스를 반환한다."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = DartClient(
+                rate_per_sec=float(os.getenv('DART_RATE_PER_SEC', 10)),
+                daily_limit=int(os.getenv('DART_DAILY_LIMIT', 20000)),
+                max_concurrency=int(os.getenv('DART_MAX_CONCURRENCY', 8)),
+            )
+        return _default_client
@@ -0,0 +1,211 @@
+"""
+[DART 재무제표 응답 캐시 (fnlttSinglAcnt Response Cache)]
+DART '단일회사 주요계정' API 응답을 (corp_code, bsns_year, reprt_code) 단위로 캐싱하는 모듈입니다.
+
+Roles:
+1. Memory Layer: 최근 조회된 응답을 LRU 방식으로 보관 (용량 초과 시 가장 오래 사용되지 않은 항목부터 제거)
+2. Disk Layer: 수집기(get_financial_statements.py)와 동일한 data/storage/raw/dart/fs_*.json 레이아웃을 영속 저장소로 사용
+3. TTL Policy: 공시 제출 기한이 지난 시점에 수집된 정상 응답(000)은 확정 데이터로 보고 무기한 보관,
+               그 외(당기 진행 중인 보고서, 데이터 없음(013) 응답)는 짧은 TTL 적용 후 재조회
+               (013은 기한 이후 지연 제출/정정 공시로 데이터가 생길 수 있음)
+4. Metrics: Hit/Miss 및 Upstream(DART) 호출 지연시간 집계
+5. Async: Backend 이벤트 루프에서는 aget/aput 사용 (디스크 I/O만 Worker Thread에서 수행)
+
+Filing Deadline (자본시장법 기준):
+    1분기(11013): 당해 5/15, 반기(11012): 당해 8/14, 3분기(11014): 당해 11/14, 사업(11011): 익년 3/31
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+STORAGE_DIR = Path(__file__).resolve().parents[2] / 'storage' / 'raw' / 'dart'
+
+# 캐시 가능한 DART 응답 상태 (000: 정상, 013: 조회된 데이터 없음)
+CACHEABLE_STATUS = {'000', '013'}
+# 제출 기한 이후 확정 데이터로 무기한 보관하는 응답 상태
+FINAL_STATUS = {'000'}
+
+# 보고서별 제출 기한 (연도 오프셋, 월, 일)
+FILING_DEADLINES = {
+    '11013': (0, 5, 15),
+    '11012': (0, 8, 14),
+    '11014': (0, 11, 14),
+    '11011': (1, 3, 31),
+}
+
+
+def filing_deadline(bsns_year: str, reprt_code: str) -> Optional[datetime]:
+    """보고서 제출 기한(해당일 종료 시점)을 반환한다. 알 수 없는 보고서 코드는 None."""
+    rule = FILING_DEADLINES.get(reprt_code)
+    if rule is None:
+        return None
+    year_offset, month, day = rule
+    return datetime(int(bsns_year) + year_offset, month, day, 23, 59, 59)
+
+
+class FinancialStatementCache:
+    """
+    fnlttSinglAcnt 응답 캐시 (Memory LRU + Disk JSON).
+    Thread-safe: 동일 프로세스의 여러 요청이 공유한다.
+    """
+
+    def __init__(self, storage_dir: Path = STORAGE_DIR, max_entries: int = 2048, current_ttl: float = 3600.0):
+        self.storage_dir = Path(storage_dir)
+        self.max_entries = max_entries
+        self.current_ttl = current_ttl
+        self._lock = threading.Lock()
+        # key -> (data, fetched_at epoch)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evictions': 0,
+            'upstream_calls': 0,
+            'upstream_errors': 0,
+            'upstream_latency_total_ms': 0.0,
+            'upstream_latency_max_ms': 0.0,
+        }
+
+    # --- Policy ---
+
+    def is_final(self, bsns_year: str, reprt_code: str, fetched_at: float) -> bool:
+        """제출 기한 이후에 수집된 응답은 더 이상 변하지 않는 확정 데이터로 간주한다."""
+        deadline = filing_deadline(bsns_year, reprt_code)
+        if deadline is None:
+            return False
+        return datetime.fromtimestamp(fetched_at) > deadline
+
+    def _is_valid(self, key: tuple, data: dict, fetched_at: float) -> bool:
+        _, bsns_year, reprt_code = key
+        if data.get('status') in FINAL_STATUS and self.is_final(bsns_year, reprt_code, fetched_at):
+            return True
+        return time.time() - fetched_at < self.current_ttl
+
+    def _path(self, key: tuple) -> Path:
+        corp_code, bsns_year, reprt_code = key
+        return self.storage_dir / f"fs_{corp_code}_{bsns_year}_{reprt_code}.json"
+
+    # --- Memory Layer ---
+
+    def _remember(self, key: tuple, data: dict, fetched_at: float):
+        with self._lock:
+            self._entries[key] = (data, fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _get_memory(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_valid(key, entry[0], entry[1]):
+                    self._entries.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[0]
+                del self._entries[key]
+                self.stats['expired'] += 1
+        return None
+
+    # --- Disk Layer ---
+
+    def _get_disk(self, key: tuple) -> Optional[dict]:
+        """디스크 캐시 파일을 조회한다. (수집 시각은 파일 수정 시각으로 판단, 적중 시 메모리에 적재)"""
+        path = self._path(key)
+        try:
+            fetched_at = path.stat().st_mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('status') in CACHEABLE_STATUS:
+                if self._is_valid(key, data, fetched_at):
+                    self._remember(key, data, fetched_at)
+                    with self._lock:
+                        self.stats['disk_hits'] += 1
+                    return data
+                with self._lock:
+                    self.stats['expired'] += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"[FSCache] 캐시 파일 로드 실패 ({path.name}): {e}")
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def _put_disk(self, key: tuple, data: dict):
+        """원자적 쓰기 (임시 파일 작성 후 교체)"""
+        path = self._path(key)
+        try:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[FSCache] 캐시 파일 저장 실패 ({path.name}): {e}")
+
+    def _prepare_put(self, corp_code: str, bsns_year: str, reprt_code: str, data: dict) -> Optional[tuple]:
+        """저장 대상이면 메모리에 반영하고 키를 반환한다. 오류 응답은 None."""
+        if not data or data.get('status') not in CACHEABLE_STATUS:
+            return None
+        key = (corp_code, str(bsns_year), reprt_code)
+        self._remember(key, data, time.time())
+        return key
+
+    # --- Public API ---
+
+    def get(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[dict]:
+        """캐시된 응답을 반환한다. 없거나 만료된 경우 None."""
+        key = (corp_code, str(bsns_year), reprt_code)
+        data = self._get_memory(key)
+        return data if data is not None else self._get_disk(key)
+
+    def put(self, corp_code: str, bsns_year: str, reprt_code: str, data: dict):
+        """DART 원본 응답을 메모리와 디스크에 저장한다. 오류 응답은 저장하지 않는다."""
+        key = self._prepare_put(corp_code, bsns_year, reprt_code, data)
+        if key is not None:
+            self._put_disk(key, data)
+
+    async def aget(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[dict]:
+        """get의 비동기 버전. 메모리 적중은 바로 반환하고, 디스크 조회는 Worker Thread에서 수행한다."""
+        key = (corp_code, str(bsns_year), reprt_code)
+        data = self._get_memory(key)
+        return data if data is not None else await asyncio.to_thread(self._get_disk, key)
+
+    async def aput(self, corp_code: str, bsns_year: str, reprt_code: str, data: dict):
+        """put의 비동기 버전. 메모리에 바로 반영하고, 디스크 쓰기는 Worker Thread에서 수행한다."""
+        key = self._prepare_put(corp_code, bsns_year, reprt_code, data)
+        if key is not None:
+            await asyncio.to_thread(self._put_disk, key, data)
+
+    def record_upstream(self, latency_ms: float, ok: bool = True):
+        """DART API 호출 결과와 지연시간을 기록한다."""
+        with self._lock:
+            self.stats['upstream_calls'] += 1
+            if not ok:
+                self.stats['upstream_errors'] += 1
+            self.stats['upstream_latency_total_ms'] += latency_ms
+            self.stats['upstream_latency_max_ms'] = max(self.stats['upstream_latency_max_ms'], latency_ms)
+
+    def snapshot(self) -> dict:
+        """모니터링용 캐시 통계를 반환한다."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['upstream_latency_avg_ms'] = (
+            round(stats['upstream_latency_total_ms'] / stats['upstream_calls'], 2) if stats['upstream_calls'] else 0.0
+        )
+        return stats
@@ -4,34 +4,81 @@ DART에 등록된 모든 기업의 고유번호(corp_code), 종목코드(stock_c
 
 Roles:
 1. 마스터 데이터 관리: 전체 기업 목록(약 10만 개)을 최신 상태로 유지
-2. Delta Processing: 전체를 매번 새로 받되, 변경된 내역(신규/수정/삭제)을 감지하여 효율적으로 갱신
+2. Delta Processing: 전체를 매번 새로 받되, 행 단위 해시 비교로 변경된 내역(신규/수정/삭제)을 감지하여 효율적으로 갱신
+3. Direct DB Apply: --target db 지정 시 dart_corps에 변경분만 단일 트랜잭션으로 반영
 
 Output:
-    data/storage/raw/dart/corp_code.csv (CSV 파일 저장)
-    * 추후 DB 마스터 테이블로 이관 가능
+    data/storage/raw/dart/corp_code.csv (CSV 파일 저장, --target csv)
+    dart_corps 테이블 (--target db)
+    data/storage/raw/dart/corp_code_changelog.jsonl (변경 로그)
 
 Usage:
     python get_corp_code.py
+    python get_corp_code.py --target db
 """
 
-import requests
 import pandas as pd
 from zipfile import ZipFile
 from bs4 import BeautifulSoup
+from lxml import etree
 from pathlib import Path
+import argparse
 import io
+import json
 import os
 import sys
+from datetime import datetime
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# 프로젝트 루트 경로 추가 (공용 DART 클라이언트 import용)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.collectors.dart.dart_client import get_dart_client
+
 load_dotenv()
 
 # 환경 설정
 API_KEY = os.getenv('DART_API_KEY')
 BASE_DIR = Path(__file__).resolve().parents[2] # data/ 디렉토리 기준
 DATA_PATH = BASE_DIR / 'storage' / 'raw' / 'dart' / 'corp_code.csv'
-DART_URL = 'https://opendart.fss.or.kr/api/corpCode.xml'
+CHANGELOG_PATH = BASE_DIR / 'storage' / 'raw' / 'dart' / 'corp_code_changelog.jsonl'
+DART_ENDPOINT = 'corpCode.xml'
+
+CORP_FIELDS = ['corp_code', 'corp_name', 'stock_code', 'modify_date']
+
+def parse_corp_code_xml(stream) -> pd.DataFrame:
+    """
+    CORPCODE.xml을 Streaming 방식(iterparse)으로 파싱한다.
+    <list> 요소 단위로 필드를 컬럼별 리스트에 누적하고, 처리된 요소는 즉시 해제하여 메모리 사용량을 일정하게 유지한다.
+    """
+    columns = {field: [] for field in CORP_FIELDS}
+    for _, elem in etree.iterparse(stream, events=('end',), tag='list'):
+        for field in CORP_FIELDS:
+            columns[field].append(elem.findtext(field) or '')
+        # 처리 완료된 요소 및 이미 지나간 형제 노드 해제
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    columns['stock_code'] = [code.strip() for code in columns['stock_code']]
+    return pd.DataFrame(columns, columns=CORP_FIELDS)
+
+def parse_corp_code_xml_soup(stream) -> pd.DataFrame:
+    """CORPCODE.xml 전체를 BeautifulSoup 트리로 로드하여 파싱한다. (기존 방식, 벤치마크 비교 기준)"""
+    soup = BeautifulSoup(stream, 'lxml-xml')
+
+    data = []
+    tags = soup.find_all('list')
+    
+    # 진행률 표시 바 적용
+    for tag in tqdm(tags, desc="XML Parsing", unit="corp"):
+        data.append({
+            'corp_code': tag.find('corp_code').text,
+            'corp_name': tag.find('corp_name').text,
+            'stock_code': tag.find('stock_code').text.strip(),
+            'modify_date': tag.find('modify_date').text
+        })
+    
+    return pd.DataFrame(data)
 
 def fetch_dart_data(api_key: str) -> pd.DataFrame:
     """DART API로부터 기업 고유번호 데이터를 수집 및 파싱한다."""
@@ -39,27 +86,16 @@ def fetch_dart_data(api_key: str) -> pd.DataFrame:
         raise ValueError("DART_API_KEY가 설정되지 않았습니다.")
 
     try:
-        res = requests.get(DART_URL, params={'crtfc_key': api_key})
-        res.raise_for_status()
+        # 공용 클라이언트: 재시도 및 Rate Limit 적용, 응답 본문(ZIP) 반환
+        content = get_dart_client().get_bytes_sync(DART_ENDPOINT, {'crtfc_key': api_key})
 
-        # ZIP 압축 해제 및 XML 로드
-        with ZipFile(io.BytesIO(res.content)) as zf:
+        # ZIP 멤버를 압축 해제하며 바로 Streaming 파싱 (XML 전체를 메모리에 적재하지 않음)
+        with ZipFile(io.BytesIO(content)) as zf:
             with zf.open('CORPCODE.xml') as f:
-                soup = BeautifulSoup(f, 'lxml-xml')
-
-        data = []
-        tags = soup.find_all('list')
-        
-        # 진행률 표시 바 적용
-        for tag in tqdm(tags, desc="XML Parsing", unit="corp"):
-            data.append({
-                'corp_code': tag.find('corp_code').text,
-                'corp_name': tag.find('corp_name').text,
-                'stock_code': tag.find('stock_code').text.strip(),
-                'modify_date': tag.find('modify_date').text
-            })
-        
-        return pd.DataFrame(data)
+                df = parse_corp_code_xml(f)
+
+        print(f"XML Parsing 완료: {len(df)}개 기업")
+        return df
 
     except Exception as e:
         print(f"[ERROR] 데이터 수집 실패: {e}", file=sys.stderr)
@@ -72,35 +108,115 @@ def load_existing_data(path: Path) -> pd.DataFrame:
         return pd.read_csv(path, dtype=str)
     return pd.DataFrame(columns=['corp_code', 'corp_name', 'stock_code', 'modify_date'])
 
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    corp_code별 64bit 행 해시를 계산한다. (corp_name, stock_code, modify_date 대상, 벡터화)
+    CSV/DB/XML 간 표현 차이(NULL, 빈 문자열, 공백)는 빈 문자열로 정규화한 뒤 해싱한다.
+    """
+    norm = df[CORP_FIELDS].fillna('').astype(str)
+    norm['stock_code'] = norm['stock_code'].str.strip()
+    hashes = pd.util.hash_pandas_object(norm[['corp_name', 'stock_code', 'modify_date']], index=False)
+    return pd.Series(hashes.values, index=norm['corp_code'].values)
+
+def compute_delta(new_hashes: pd.Series, old_hashes: pd.Series):
+    """해시 비교로 신규/삭제/수정 corp_code 목록을 계산한다."""
+    added = new_hashes.index.difference(old_hashes.index)
+    removed = old_hashes.index.difference(new_hashes.index)
+    common = new_hashes.index.intersection(old_hashes.index)
+    changed_mask = new_hashes.loc[common].values != old_hashes.loc[common].values
+    updated = common[changed_mask]
+    return list(added), list(removed), list(updated)
+
+def load_db_master() -> pd.DataFrame:
+    """dart_corps 테이블의 현재 마스터 데이터를 로드한다."""
+    from data.schema.db_models import engine
+    return pd.read_sql("SELECT corp_code, corp_name, stock_code, modify_date FROM dart_corps", engine)
+
+def apply_delta_to_db(new_df: pd.DataFrame, old_df: pd.DataFrame, added: list, removed: list, updated: list) -> list:
+    """
+    변경분(Insert/Update/Delete)만 단일 트랜잭션으로 dart_corps에 반영하고 변경 로그를 반환한다.
+    배당 데이터(FK)가 연결된 기업은 삭제하지 않고 로그에 skipped로 기록한다.
+    뉴스 Watchlist가 참조하는 기업은 삭제 전에 참조를 NULL로 해제한다. (ondelete 없이 생성된 기존 테이블 대비)
+    """
+    from sqlalchemy import bindparam, delete, insert, select, update
+    from data.schema.db_models import engine, CorpCode, DartDividend, NewsWatch
+
+    new_rows = new_df.set_index('corp_code')
+    old_rows = old_df.set_index('corp_code')
+
+    def record(corp_code, frame):
+        row = frame.loc[corp_code]
+        stock_code = row['stock_code'].strip() if isinstance(row['stock_code'], str) else ''
+        return {
+            'corp_code': corp_code,
+            'corp_name': row['corp_name'],
+            'stock_code': stock_code or None,
+            'modify_date': row['modify_date'],
+        }
+
+    inserts = [record(c, new_rows) for c in added]
+    updates = [record(c, new_rows) for c in updated]
+    changelog = []
+    synced_at = datetime.now().isoformat(timespec='seconds')
+
+    with engine.begin() as conn:
+        if inserts:
+            conn.execute(insert(CorpCode), inserts)
+        if updates:
+            stmt = (
+                update(CorpCode)
+                .where(CorpCode.corp_code == bindparam('key'))
+                .values(corp_name=bindparam('corp_name'), stock_code=bindparam('stock_code'),
+                        modify_date=bindparam('modify_date'))
+            )
+            conn.execute(stmt, [{**r, 'key': r['corp_code']} for r in updates])
+
+        skipped = set()
+        if removed:
+            referenced = select(DartDividend.corp_code).where(DartDividend.corp_code.in_(removed)).distinct()
+            skipped = {row[0] for row in conn.execute(referenced)}
+            deletable = [c for c in removed if c not in skipped]
+            if deletable:
+                conn.execute(update(NewsWatch).where(NewsWatch.corp_code.in_(deletable)).values(corp_code=None))
+                conn.execute(delete(CorpCode).where(CorpCode.corp_code.in_(deletable)))
+
+    # 변경 로그 (이전/이후 값 포함)
+    for r in inserts:
+        changelog.append({'op': 'insert', 'corp_code': r['corp_code'], 'after': r, 'synced_at': synced_at})
+    for r in updates:
+        changelog.append({'op': 'update', 'corp_code': r['corp_code'], 'before': record(r['corp_code'], old_rows),
+                          'after': r, 'synced_at': synced_at})
+    for c in removed:
+        changelog.append({'op': 'delete' if c not in skipped else 'delete_skipped', 'corp_code': c,
+                          'before': record(c, old_rows), 'synced_at': synced_at})
+    return changelog
+
+def write_changelog(changelog: list, path: Path = CHANGELOG_PATH):
+    """변경 로그를 JSON Lines 형식으로 누적 저장한다."""
+    if not changelog:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for entry in changelog:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    print(f"변경 로그 기록: {path} ({len(changelog)}건)")
+
 def main():
+    parser = argparse.ArgumentParser(description='DART 기업 고유번호 마스터 동기화')
+    parser.add_argument('--target', type=str, default='csv', choices=['csv', 'db'],
+                        help='비교 및 반영 대상 (csv: corp_code.csv 스냅샷 갱신, db: dart_corps에 변경분만 직접 반영)')
+    args = parser.parse_args()
+
     print("DART 기업 데이터 동기화 시작...")
     
     # 1. API로부터 현재 시점의 데이터 수집 (Current Snapshot)
     new_df = fetch_dart_data(API_KEY)
     
-    # 2. 로컬에 저장된 기존 데이터 로드 (Previous Snapshot)
-    old_df = load_existing_data(DATA_PATH)
-    
-    # 효율적인 비교를 위해 corp_code를 인덱스로 설정
-    new_df.set_index('corp_code', inplace=True)
-    old_df.set_index('corp_code', inplace=True)
-
-    # 3. 변경 사항 감지 (Delta Processing)
-    new_keys = set(new_df.index)
-    old_keys = set(old_df.index)
+    # 2. 기존 데이터 로드 (Previous Snapshot: CSV 혹은 DB 마스터)
+    old_df = load_db_master() if args.target == 'db' else load_existing_data(DATA_PATH)
 
-    # Key 기준 신규 및 삭제 항목 탐지
-    added_keys = new_keys - old_keys
-    removed_keys = old_keys - new_keys
-    
-    # 공통 Key 중 데이터가 변경된 항목 탐지
-    common_keys = new_keys & old_keys
-    updated_keys = set()
-    
-    if common_keys:
-        # 데이터프레임 정렬 및 내용 비교를 통한 수정 사항 확인
-        diff_mask = (new_df.loc[list(common_keys)] != old_df.loc[list(common_keys)]).any(axis=1)
-        updated_keys = set(diff_mask[diff_mask].index)
+    # 3. 변경 사항 감지 (Delta Processing: 행 해시 비교)
+    added_keys, removed_keys, updated_keys = compute_delta(row_hashes(new_df), row_hashes(old_df))
 
     # 변경 통계 계산
     n_added = len(added_keys)
@@ -109,15 +225,28 @@ def main():
 
     print(f"변경 통계 - 신규: {n_added}, 수정: {n_updated}, 삭제: {n_removed}")
 
-    # 변경 사항이 없는 경우 파일 저장 생략
+    # 변경 사항이 없는 경우 저장 생략
     if n_added == 0 and n_removed == 0 and n_updated == 0:
         print("변경 사항이 없습니다. 작업을 종료합니다.")
         return
 
-    # 4. 데이터 저장 (변경 사항이 있는 경우에만 전체 스냅샷 갱신)
+    # 4-a. DB 직접 반영 (변경된 행만 단일 트랜잭션으로 Insert/Update/Delete)
+    if args.target == 'db':
+        changelog = apply_delta_to_db(new_df, old_df, added_keys, removed_keys, updated_keys)
+        write_changelog(changelog)
+        if updated_keys:
+            # 기업명 변경을 /api/dividends 배당 시계열 View에 반영
+            from data.schema.db_models import engine, refresh_dividend_series
+            refresh_dividend_series(engine)
+        print("dart_corps 변경분 반영 완료")
+        return
+
+    # 4-b. 데이터 저장 (변경 사항이 있는 경우에만 전체 스냅샷 갱신)
     DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-    new_df.reset_index().to_csv(DATA_PATH, index=False, encoding='utf-8-sig')
+    new_df.to_csv(DATA_PATH, index=False, encoding='utf-8-sig')
+    write_changelog([{'op': op, 'corp_code': c} for op, keys in
+                     (('insert', added_keys), ('update', updated_keys), ('delete', removed_keys)) for c in keys])
     print(f"데이터 업데이트 완료: {DATA_PATH}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
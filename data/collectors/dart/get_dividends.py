@@ -15,7 +15,6 @@ Arguments:
     --reprt_code (str): 보고서 코드 (11011:사업, 11012:반기, 11013:1분기, 11014:3분기)
 """
 
-import requests
 import pandas as pd
 import os
 import argparse
@@ -27,25 +26,27 @@ from sqlalchemy.dialects.postgresql import insert
 # 프로젝트 루트 경로 추가 (schema 모듈 import용)
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from data.schema.db_models import SessionLocal, DartDividendRaw
+from data.collectors.dart.dart_client import get_dart_client
 
 load_dotenv()
 
 # 환경 설정
-API_KEY = os.getenv('DART_API_KEY')
-DIVIDEND_API_URL = 'https://opendart.fss.or.kr/api/alotMatter.json'
+DIVIDEND_API_ENDPOINT = 'alotMatter.json'
 
-def fetch_dividend_data(corp_code: str, bsns_year: str, reprt_code: str) -> list:
-    """특정 기업의 배당 정보를 API로부터 수집한다."""
+def fetch_dividend_response(corp_code: str, bsns_year: str, reprt_code: str) -> dict:
+    """배당 정보 API 원본 응답을 반환한다. 호출 실패 시 예외를 그대로 전달한다."""
     params = {
-        'crtfc_key': API_KEY,
         'corp_code': corp_code,
         'bsns_year': bsns_year,
         'reprt_code': reprt_code
     }
-    
+    # 공용 클라이언트: Rate Limit 및 재시도(HTTP 오류, status 020) 적용
+    return get_dart_client().get_json_sync(DIVIDEND_API_ENDPOINT, params)
+
+def fetch_dividend_data(corp_code: str, bsns_year: str, reprt_code: str) -> list:
+    """특정 기업의 배당 정보를 API로부터 수집한다."""
     try:
-        res = requests.get(DIVIDEND_API_URL, params=params)
-        data = res.json()
+        data = fetch_dividend_response(corp_code, bsns_year, reprt_code)
         
         if data['status'] == '000':
             return data['list']
@@ -60,10 +61,20 @@ def fetch_dividend_data(corp_code: str, bsns_year: str, reprt_code: str) -> list
         print(f"[ERROR] 요청 실패: {e}")
         return []
 
+def get_stored_rcept_no(corp_code: str, year: str, reprt_code: str) -> str:
+    """Raw 테이블에 적재된 접수번호를 정렬된 콤마 구분 문자열로 반환한다. (변경 감지용)"""
+    with SessionLocal() as session:
+        rows = session.query(DartDividendRaw.rcept_no).filter(
+            DartDividendRaw.corp_code == corp_code,
+            DartDividendRaw.bsns_year == year,
+            DartDividendRaw.reprt_code == reprt_code
+        ).distinct().all()
+    return ','.join(sorted(r[0] for r in rows if r[0]))
+
 def save_to_db_raw(dividends: list, year: str, reprt_code: str):
     """수집된 배당 데이터를 Raw 테이블에 Upsert 한다."""
     if not dividends:
-        return
+        return 0
 
     session = SessionLocal()
     try:
@@ -108,13 +119,42 @@ def save_to_db_raw(dividends: list, year: str, reprt_code: str):
         session.execute(on_conflict_stmt)
         session.commit()
         print(f"DB 저장 완료: {len(records)}건 Upsert")
+        return len(records)
         
     except Exception as e:
         session.rollback()
         print(f"[ERROR] DB 저장 실패: {e}")
+        return 0
     finally:
         session.close()
 
+def collect_dividends(corp_code: str, year: str, reprt_code: str) -> dict:
+    """
+    단일 (기업, 연도, 보고서) 단위 수집 및 Raw 적재. Orchestrator 배치 모드에서 In-process로 호출된다.
+    Raw 테이블에 동일 접수번호(rcept_no)가 이미 있으면 적재를 생략하고 changed=False를 반환한다.
+
+    Returns:
+        {'status': 'collected' | 'empty', 'rcept_no': str, 'rows': int, 'changed': bool}
+    """
+    data = fetch_dividend_response(corp_code, year, reprt_code)
+
+    if data.get('status') == '013':
+        return {'status': 'empty', 'rcept_no': None, 'rows': 0, 'changed': False}
+    if data.get('status') != '000':
+        raise RuntimeError(f"DART status {data.get('status')}: {data.get('message')}")
+
+    dividends = data.get('list', [])
+    rcept_no = ','.join(sorted({item['rcept_no'] for item in dividends if item.get('rcept_no')}))
+
+    # 변경 감지: 동일 접수번호가 이미 적재되어 있으면 Skip
+    if rcept_no and rcept_no == get_stored_rcept_no(corp_code, year, reprt_code):
+        return {'status': 'collected', 'rcept_no': rcept_no, 'rows': 0, 'changed': False}
+
+    rows = save_to_db_raw(dividends, year, reprt_code)
+    if dividends and not rows:
+        raise RuntimeError("Raw 테이블 적재 실패")
+    return {'status': 'collected', 'rcept_no': rcept_no, 'rows': rows, 'changed': True}
+
 def main():
     parser = argparse.ArgumentParser(description='DART 배당 정보 수집 및 DB 적재 스크립트')
     parser.add_argument('--corp_code', type=str, required=True, help='DART 기업 고유번호 (8자리)')
@@ -15,7 +15,6 @@ Arguments:
     --reprt_code (str): 보고서 코드 (11011:사업, 11012:반기, 11013:1분기, 11014:3분기)
 """
 
-import requests
 import json
 import os
 import argparse
@@ -23,25 +22,27 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+# 프로젝트 루트 경로 추가 (공용 DART 클라이언트 import용)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.collectors.dart.dart_client import get_dart_client
+
 load_dotenv()
 
 # 환경 설정
-API_KEY = os.getenv('DART_API_KEY')
-FS_API_URL = 'https://opendart.fss.or.kr/api/fnlttSinglAcnt.json'
+FS_API_ENDPOINT = 'fnlttSinglAcnt.json'
 STORAGE_DIR = Path(__file__).resolve().parents[3] / 'data/storage/raw/dart'
 
 def fetch_financial_statements(corp_code: str, bsns_year: str, reprt_code: str) -> dict:
     """특정 기업의 재무제표 정보를 API로부터 수집한다."""
     params = {
-        'crtfc_key': API_KEY,
         'corp_code': corp_code,
         'bsns_year': bsns_year,
         'reprt_code': reprt_code
     }
     
     try:
-        res = requests.get(FS_API_URL, params=params)
-        data = res.json()
+        # 공용 클라이언트: Rate Limit 및 재시도(HTTP 오류, status 020) 적용
+        data = get_dart_client().get_json_sync(FS_API_ENDPOINT, params)
         
         if data['status'] == '000':
             return data
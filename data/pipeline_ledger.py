@@ -0,0 +1,108 @@
+"""
+[Pipeline Job Ledger]
+배치 파이프라인의 작업 단위(task, corp_code, bsns_year, reprt_code)별 처리 상태를 pipeline_jobs 테이블에 기록하는 모듈입니다.
+
+Roles:
+1. Checkpoint: 단위 작업 완료 시마다 상태를 Upsert하여 중단 시점까지의 진행 상황을 보존
+2. Resume: 재실행 시 완료(done) 및 확정된 공시 없음(empty) 단위는 Skip, 실패(failed) 단위만 재시도
+3. Change Tracking: 수집된 접수번호(rcept_no)를 기록하여 Raw 데이터가 실제로 변경된 키만 전처리 대상으로 선정
+
+Status:
+    collected: Raw 적재 완료, 전처리 대기 (재실행 시 수집 없이 전처리만 재수행)
+    done:      수집 및 전처리 완료
+    empty:     해당 보고서 없음 (DART 013). 제출 기한 이후 확인된 경우에만 완료로 간주
+    failed:    수집 실패 (재실행 시 재시도)
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+
+from data.collectors.dart.fs_cache import filing_deadline
+from data.schema.db_models import SessionLocal, PipelineJob
+
+UnitKey = Tuple[str, str, str]  # (corp_code, bsns_year, reprt_code)
+
+
+class JobLedger:
+    """pipeline_jobs 테이블 기반 작업 이력 관리자 (Worker Thread 간 공유)"""
+
+    def __init__(self, task: str):
+        self.task = task
+        self._lock = threading.Lock()
+        self._jobs: Dict[UnitKey, dict] = {}
+
+    def load(self, corp_codes: Optional[Iterable[str]] = None):
+        """기존 작업 이력을 메모리에 적재한다. (단위마다 DB 조회하지 않도록 1회 일괄 조회)"""
+        with SessionLocal() as session:
+            query = session.query(PipelineJob).filter(PipelineJob.task == self.task)
+            if corp_codes is not None:
+                query = query.filter(PipelineJob.corp_code.in_(list(corp_codes)))
+            for job in query.all():
+                self._jobs[(job.corp_code, job.bsns_year, job.reprt_code)] = {
+                    'status': job.status,
+                    'rcept_no': job.rcept_no,
+                    'attempts': job.attempts,
+                    'updated_at': job.updated_at,
+                }
+        return self
+
+    def get(self, key: UnitKey) -> Optional[dict]:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def is_finished(self, key: UnitKey) -> bool:
+        """재실행 시 수집을 생략해도 되는 단위인지 판단한다."""
+        job = self.get(key)
+        if job is None:
+            return False
+        if job['status'] in ('done', 'collected'):
+            return True
+        if job['status'] == 'empty':
+            # 제출 기한 전에 확인된 '공시 없음'은 이후 제출될 수 있으므로 재수집
+            deadline = filing_deadline(key[1], key[2])
+            return deadline is not None and job['updated_at'] > deadline
+        return False
+
+    def needs_processing(self, key: UnitKey) -> bool:
+        """수집은 끝났으나 전처리가 완료되지 않은 단위인지 확인한다."""
+        job = self.get(key)
+        return job is not None and job['status'] == 'collected'
+
+    def record(self, key: UnitKey, status: str, rcept_no: Optional[str] = None, error: Optional[str] = None):
+        """단위 작업 상태를 Upsert 한다."""
+        corp_code, bsns_year, reprt_code = key
+        now = datetime.now()
+        with self._lock:
+            prev = self._jobs.get(key, {})
+            attempts = prev.get('attempts', 0) + (0 if status == 'done' else 1)
+            rcept_no = rcept_no if rcept_no is not None else prev.get('rcept_no')
+            self._jobs[key] = {'status': status, 'rcept_no': rcept_no, 'attempts': attempts, 'updated_at': now}
+
+        record = {
+            'task': self.task,
+            'corp_code': corp_code,
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code,
+            'status': status,
+            'rcept_no': rcept_no,
+            'attempts': attempts,
+            'error': error[:1000] if error else None,
+            'updated_at': now,
+        }
+        with SessionLocal() as session:
+            stmt = insert(PipelineJob).values(record)
+            stmt = stmt.on_conflict_do_update(
+                constraint='uix_pipeline_job_unit',
+                set_={
+                    'status': stmt.excluded.status,
+                    'rcept_no': stmt.excluded.rcept_no,
+                    'attempts': stmt.excluded.attempts,
+                    'error': stmt.excluded.error,
+                    'updated_at': stmt.excluded.updated_at,
+                }
+            )
+            session.execute(stmt)
+            session.commit()
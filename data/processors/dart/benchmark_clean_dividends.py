@@ -0,0 +1,148 @@
+"""
+[배당 전처리 벤치마크 및 정합성 검증 (Benchmark & Parity Check)]
+clean_dividends.py의 행 단위(iterrows) 변환 경로와 벡터화 경로를 합성 Raw 테이블로 비교하는 스크립트입니다.
+DB 연결 없이 메모리 상의 합성 데이터만 사용합니다.
+
+Checks:
+1. Parity: 두 경로가 생성한 dart_dividends 레코드가 동일한지 검증 (값 불일치 시 종료 코드 1)
+2. Benchmark: 정제/피벗/레코드 변환 전체 소요 시간 비교
+
+Usage:
+    python benchmark_clean_dividends.py --rows 1000000
+    python benchmark_clean_dividends.py --rows 1000000 --legacy_rows 100000  # Legacy는 일부 행만 측정
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.processors.dart.clean_dividends import transform_dividends
+
+# DART alotMatter 응답의 대표 SE 항목 (기업 공통 지표 / 주식 종류별 지표)
+COMMON_SE = [
+    '주당액면가액(원)',
+    '(연결)당기순이익(백만원)',
+    '(별도)당기순이익(백만원)',
+    '(연결)주당순이익(원)',
+    '현금배당금총액(백만원)',
+    '주식배당금총액(백만원)',
+    '(연결)현금배당성향(%)',
+]
+STOCK_SE = [
+    '주당 현금배당금(원)',
+    '현금배당수익률(%)',
+    '주식배당수익률(%)',
+    '주당 주식배당(주)',
+]
+STOCK_KINDS = ['보통주', '우선주']
+REPRT_CODES = ['11013', '11012', '11014', '11011']
+
+
+def random_value(rng: random.Random) -> str:
+    """DART 원문 수치 표기 ('1,000', '(123)', '-', '3.5') 중 하나를 생성"""
+    kind = rng.random()
+    if kind < 0.15:
+        return '-'
+    if kind < 0.25:
+        return f"({rng.randint(1, 99999):,})"
+    if kind < 0.6:
+        return f"{rng.randint(0, 10_000_000):,}"
+    return f"{rng.uniform(0, 100):.2f}"
+
+
+def make_raw_table(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """dart_dividends_raw 구조의 합성 데이터 생성 (보고서 단위 약 15행)"""
+    rng = random.Random(seed)
+    rows_per_unit = len(COMMON_SE) + len(STOCK_SE) * len(STOCK_KINDS)
+    n_units = max(1, n_rows // rows_per_unit)
+
+    records = []
+    for unit in range(n_units):
+        corp_code = f"{unit // 20:08d}"
+        bsns_year = str(2019 + (unit // 4) % 5)
+        reprt_code = REPRT_CODES[unit % 4]
+        base = {
+            'corp_code': corp_code,
+            'corp_name': f"기업{corp_code}",
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code,
+            'stlm_dt': f"{bsns_year}-12-31",
+        }
+        for se in COMMON_SE:
+            records.append({**base, 'se': se, 'stock_knd': '', 'thstrm': random_value(rng)})
+        for stock_knd in STOCK_KINDS:
+            for se in STOCK_SE:
+                records.append({**base, 'se': se, 'stock_knd': stock_knd, 'thstrm': random_value(rng)})
+    return pd.DataFrame(records[:n_rows])
+
+
+def same_value(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def check_parity(legacy: list, vectorized: list) -> int:
+    """두 경로의 레코드 불일치 건수를 반환한다."""
+    if len(legacy) != len(vectorized):
+        print(f"[Parity] 레코드 수 불일치: legacy={len(legacy)}, vectorized={len(vectorized)}")
+        return max(len(legacy), len(vectorized))
+
+    mismatches = 0
+    for i, (a, b) in enumerate(zip(legacy, vectorized)):
+        diff = [k for k in a if not same_value(a[k], b.get(k))]
+        if diff:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[Parity] row {i} 불일치: {[(k, a[k], b.get(k)) for k in diff]}")
+    return mismatches
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {elapsed:.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='clean_dividends 벡터화 경로 벤치마크 및 정합성 검증')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='합성 Raw 테이블 행 수')
+    parser.add_argument('--legacy_rows', type=int, help='Legacy 경로 측정 행 수 (기본: --rows와 동일)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"합성 Raw 테이블 생성: {args.rows}행")
+    raw_df = make_raw_table(args.rows, args.seed)
+
+    vectorized, t_vec = timed("Vectorized", lambda: transform_dividends(raw_df, vectorized=True))
+
+    legacy_rows = args.legacy_rows or args.rows
+    legacy_df = raw_df.iloc[:legacy_rows]
+    legacy, t_legacy = timed(f"Legacy ({legacy_rows}행)", lambda: transform_dividends(legacy_df, vectorized=False))
+
+    # Legacy를 일부 행만 수행한 경우 동일 범위의 벡터화 결과와 비교
+    expected = vectorized if legacy_rows >= args.rows else transform_dividends(legacy_df, vectorized=True)
+    mismatches = check_parity(legacy, expected)
+
+    per_row_vec = t_vec / len(raw_df) * 1e6
+    per_row_legacy = t_legacy / len(legacy_df) * 1e6
+    print("=" * 60)
+    print(f"Vectorized: {per_row_vec:.2f} us/row | Legacy: {per_row_legacy:.2f} us/row "
+          f"| Speedup: x{per_row_legacy / per_row_vec:.1f}")
+    print(f"Parity: {'OK' if mismatches == 0 else f'FAILED ({mismatches} rows)'} ({len(legacy)} records)")
+    sys.exit(0 if mismatches == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
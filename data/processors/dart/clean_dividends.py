@@ -9,23 +9,56 @@ Roles:
 4. Normalization: 보고서 코드 매핑 (11011 -> 4Q)
 
 Input: DB Table 'dart_dividends_raw'
-Output: DB Table 'dart_dividends'
+Output: DB Table 'dart_dividends' (적재 후 /api/dividends용 Materialized View 'dart_dividend_series' 갱신)
+
+Streaming Mode:
+    기업 필터 없이 실행하면 Raw 테이블을 corp_code 순으로 Server-side Cursor 스트리밍하여
+    기업 단위 파티션별로 변환 및 Upsert(1,000건 단위)를 수행합니다. (메모리 사용량이 테이블 크기와 무관)
 
 Usage:
     python clean_dividends.py --corp_code 00126380 --year 2023
+    python clean_dividends.py --stream
 """
 
 import pandas as pd
 import sys
+import time
 import argparse
 from pathlib import Path
+from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from tqdm import tqdm
 
 # 프로젝트 루트 경로 추가
 sys.path.append(str(Path(__file__).resolve().parents[3]))
-from data.schema.db_models import SessionLocal, DartDividendRaw, DartDividend, engine
+from data.schema.db_models import SessionLocal, DartDividendRaw, DartDividend, engine, refresh_dividend_series
+
+# 보고서 코드 매핑 (11013 -> 1Q 등)
+REPRT_MAP = {
+    '11013': '1Q',
+    '11012': '2Q',
+    '11014': '3Q',
+    '11011': '4Q'
+}
+
+# Mart 컬럼 -> SE(구분) 컬럼명 검색 키워드
+METRIC_KEYWORDS = {
+    'dps': ['주당 현금배당금'],
+    'dividend_yield': ['현금배당수익률'],
+    'total_dividend': ['현금배당금총액'],
+    'net_income': ['당기순이익'],
+    'eps': ['주당순이익'],
+    'payout_ratio': ['현금배당성향'],
+}
+
+META_COLS = ['corp_code', 'corp_name', 'bsns_year', 'reprt_code', 'stock_knd', 'stlm_dt']
+
+# 변환에 필요한 Raw 컬럼 (Streaming 조회 시 SELECT 대상, corp_code가 첫 컬럼이어야 함)
+RAW_COLS = ['corp_code', 'corp_name', 'bsns_year', 'reprt_code', 'stock_knd', 'se', 'thstrm', 'stlm_dt']
+
+# Upsert 1회당 레코드 수 (12개 컬럼 x 1,000 = 12,000 Bind Parameter, PostgreSQL 한도 65,535)
+UPSERT_BATCH_SIZE = 1000
 
 def clean_value(val):
     """문자열 숫자를 정제하여 Float/Int 변환 가능한 형태로 만듦"""
@@ -40,17 +73,23 @@ def clean_value(val):
             return None
     return val
 
-def process_dividends(target_corp_code=None, target_year=None):
-    """Raw 데이터를 읽어 정제(Cleaning) 및 피벗(Pivoting) 후 분석용 테이블에 적재"""
-    
-    filter_msg = []
-    if target_corp_code: filter_msg.append(f"Corp: {target_corp_code}")
-    if target_year: filter_msg.append(f"Year: {target_year}")
-    filter_str = f" ({', '.join(filter_msg)})" if filter_msg else " (All Data)"
-    
-    print(f"배당 데이터 전처리 시작{filter_str}...")
-    
-    # 1. Raw Data 로드 (Incremental Processing을 위한 필터링)
+def clean_values(series: pd.Series) -> pd.Series:
+    """clean_value의 벡터화 버전. ('1,000' -> 1000.0, '(123)' -> 123.0, '-' / 공백 / 파싱 불가 -> NaN)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+
+    # 문자열: 콤마/괄호 일괄 제거 후 C 레벨 수치 변환 (비문자열 값은 NaN)
+    stripped = series.str.replace(r'[,()]', '', regex=True)
+    values = pd.to_numeric(stripped, errors='coerce')
+
+    # 비문자열 수치 값은 그대로 유지 (clean_value와 동일)
+    non_str = stripped.isna() & series.notna()
+    if non_str.any():
+        values = values.where(~non_str, pd.to_numeric(series[non_str], errors='coerce'))
+    return values.astype(float)
+
+def load_raw_dividends(target_corp_code=None, target_year=None) -> pd.DataFrame:
+    """Raw 테이블에서 처리 대상 데이터를 로드한다. (Incremental Processing을 위한 필터링)"""
     with SessionLocal() as session:
         query = session.query(DartDividendRaw)
         
@@ -59,23 +98,22 @@ def process_dividends(target_corp_code=None, target_year=None):
         if target_year:
             query = query.filter(DartDividendRaw.bsns_year == target_year)
             
-        raw_df = pd.read_sql(query.statement, session.bind)
-    
-    if raw_df.empty:
-        print("처리할 Raw 데이터가 없습니다.")
-        return
-
-    print(f"Raw Data 로드 완료: {len(raw_df)}행")
+        return pd.read_sql(query.statement, session.bind)
 
+def pivot_dividends(raw_df: pd.DataFrame, vectorized: bool = True) -> pd.DataFrame:
+    """정제 -> 피벗(Long -> Wide) -> 공통 지표 병합 -> 보고서 코드 매핑"""
     # 피벗을 위해 필요한 컬럼만 추출
-    df = raw_df[['corp_code', 'corp_name', 'bsns_year', 'reprt_code', 'stock_knd', 'se', 'thstrm', 'stlm_dt']].copy()
+    df = raw_df[RAW_COLS].copy()
     
     # 3. 데이터 정제 (수치 변환)
-    df['clean_value'] = df['thstrm'].apply(clean_value)
+    if vectorized:
+        df['clean_value'] = clean_values(df['thstrm'])
+    else:
+        df['clean_value'] = df['thstrm'].apply(clean_value)
     
     # 4. 피벗 (Long -> Wide)
     pivot_df = df.pivot_table(
-        index=['corp_code', 'corp_name', 'bsns_year', 'reprt_code', 'stock_knd', 'stlm_dt'],
+        index=META_COLS,
         columns='se',
         values='clean_value',
         aggfunc='first'
@@ -92,8 +130,7 @@ def process_dividends(target_corp_code=None, target_year=None):
     merge_keys = ['corp_code', 'bsns_year', 'reprt_code']
     
     # 3) 공통 지표 컬럼만 추출
-    meta_cols = ['corp_code', 'corp_name', 'bsns_year', 'reprt_code', 'stock_knd', 'stlm_dt']
-    se_cols = [c for c in pivot_df.columns if c not in meta_cols]
+    se_cols = [c for c in pivot_df.columns if c not in META_COLS]
     common_values = common_df[merge_keys + se_cols]
     common_values = common_values.drop_duplicates(subset=merge_keys)
 
@@ -107,23 +144,55 @@ def process_dividends(target_corp_code=None, target_year=None):
             merged_df[col] = merged_df[col].fillna(merged_df[common_col])
     
     # 6) 보고서 코드 매핑 (11013 -> 1Q 등)
-    reprt_map = {
-        '11013': '1Q',
-        '11012': '2Q',
-        '11014': '3Q',
-        '11011': '4Q'
+    merged_df['reprt_name'] = merged_df['reprt_code'].map(REPRT_MAP).fillna(merged_df['reprt_code'])
+
+    print(f"병합 및 매핑 완료: {len(merged_df)}행 (공통 지표 통합됨)")
+    return merged_df
+
+def metric_columns(columns) -> dict:
+    """
+    Mart 컬럼별 후보 SE 컬럼 목록을 컬럼 순서대로 1회 계산한다.
+    Returns: {metric: [(se_col, scale), ...]}  (백만원 단위 컬럼은 scale=1,000,000)
+    """
+    value_cols = [c for c in columns
+                  if c not in META_COLS and not c.endswith('_common') and c != 'reprt_name']
+    return {
+        metric: [(c, 1_000_000 if '백만원' in c else 1) for c in value_cols if any(k in c for k in keywords)]
+        for metric, keywords in METRIC_KEYWORDS.items()
     }
-    merged_df['reprt_name'] = merged_df['reprt_code'].map(reprt_map).fillna(merged_df['reprt_code'])
 
-    # 처리 완료된 데이터프레임을 최종 df로 사용
-    final_df = merged_df
-    print(f"병합 및 매핑 완료: {len(final_df)}행 (공통 지표 통합됨)")
+def build_records(final_df: pd.DataFrame) -> list:
+    """Wide 데이터프레임을 Mart 레코드로 변환 (벡터화: 지표별 후보 컬럼을 순서대로 Coalesce)"""
+    if final_df.empty:
+        return []
 
+    out = pd.DataFrame({
+        'corp_code': final_df['corp_code'],
+        'corp_name': final_df['corp_name'],
+        'bsns_year': final_df['bsns_year'],
+        'reprt_code': final_df['reprt_name'],
+        'stock_knd': final_df['stock_knd'],
+        'stlm_dt': final_df['stlm_dt'],
+    })
+    for metric, candidates in metric_columns(final_df.columns).items():
+        value = pd.Series(float('nan'), index=final_df.index)
+        # 앞선 후보 컬럼의 값이 우선 (get_val의 컬럼 순회 순서와 동일)
+        for col, scale in reversed(candidates):
+            scaled = final_df[col] * scale if scale != 1 else final_df[col]
+            value = scaled.where(scaled.notna(), value)
+        out[metric] = value
+
+    # NaN -> None (DB NULL)
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict(orient='records')
+
+def build_records_legacy(final_df: pd.DataFrame) -> list:
+    """Wide 데이터프레임을 Mart 레코드로 변환 (행 단위 순회, 벡터화 경로의 정합성 비교 기준)"""
     records = []
     for _, row in tqdm(final_df.iterrows(), total=len(final_df), desc="Processing"):
         def get_val(keywords):
             for col in final_df.columns:
-                if col in meta_cols or col.endswith('_common') or col == 'reprt_name':
+                if col in META_COLS or col.endswith('_common') or col == 'reprt_name':
                     continue
                 if any(k in col for k in keywords):
                     val = row[col]
@@ -140,48 +209,159 @@ def process_dividends(target_corp_code=None, target_year=None):
             'reprt_code': row['reprt_name'],
             'stock_knd': row['stock_knd'],
             'stlm_dt': row['stlm_dt'],
-            'dps': get_val(['주당 현금배당금']),
-            'dividend_yield': get_val(['현금배당수익률']),
-            'total_dividend': get_val(['현금배당금총액']),
-            'net_income': get_val(['당기순이익']),
-            'eps': get_val(['주당순이익']),
-            'payout_ratio': get_val(['현금배당성향'])
+            'dps': get_val(METRIC_KEYWORDS['dps']),
+            'dividend_yield': get_val(METRIC_KEYWORDS['dividend_yield']),
+            'total_dividend': get_val(METRIC_KEYWORDS['total_dividend']),
+            'net_income': get_val(METRIC_KEYWORDS['net_income']),
+            'eps': get_val(METRIC_KEYWORDS['eps']),
+            'payout_ratio': get_val(METRIC_KEYWORDS['payout_ratio'])
         })
+    return records
 
-    if not records:
-        print("적재할 데이터가 없습니다.")
-        return
+def transform_dividends(raw_df: pd.DataFrame, vectorized: bool = True) -> list:
+    """Raw 데이터프레임 -> Mart 레코드 목록"""
+    final_df = pivot_dividends(raw_df, vectorized=vectorized)
+    if vectorized:
+        return build_records(final_df)
+    return build_records_legacy(final_df)
+
+def iter_raw_partitions(target_corp_code=None, target_year=None, corps_per_partition=200, fetch_size=10000):
+    """
+    Raw 테이블을 corp_code 순으로 Server-side Cursor를 통해 스트리밍하고, 기업 경계 단위로 분할하여 반환한다.
+    한 기업의 행은 항상 같은 파티션에 포함되므로 피벗/공통 지표 병합 결과는 전체 처리와 동일하다.
+    """
+    stmt = select(*[DartDividendRaw.__table__.c[col] for col in RAW_COLS]).order_by(DartDividendRaw.corp_code)
+    if target_corp_code:
+        stmt = stmt.where(DartDividendRaw.corp_code == target_corp_code)
+    if target_year:
+        stmt = stmt.where(DartDividendRaw.bsns_year == target_year)
 
+    buffer, corps = [], 0
+    with engine.connect() as conn:
+        # stream_results: psycopg2 Named Cursor 사용 (전체 결과를 클라이언트 메모리에 적재하지 않음)
+        result = conn.execution_options(stream_results=True, yield_per=fetch_size).execute(stmt)
+        for rows in result.partitions():
+            for row in rows:
+                if not buffer or row[0] != buffer[-1][0]:
+                    # 기업 경계: 파티션 크기 도달 시 직전 기업까지 방출
+                    if corps >= corps_per_partition:
+                        yield pd.DataFrame(buffer, columns=RAW_COLS)
+                        buffer, corps = [], 0
+                    corps += 1
+                buffer.append(tuple(row))
+    if buffer:
+        yield pd.DataFrame(buffer, columns=RAW_COLS)
+
+def upsert_dividends(records: list, batch_size: int = UPSERT_BATCH_SIZE):
+    """
+    Mart 테이블(dart_dividends)에 Upsert (Bind Parameter 한도를 넘지 않도록 batch_size 단위 분할)
+    적재 실패 시 Rollback 후 예외를 그대로 전달한다. (배치 모드에서 해당 단위를 완료로 기록하지 않도록)
+    """
     with SessionLocal() as session:
         try:
-            stmt = insert(DartDividend).values(records)
-            update_dict = {
-                'corp_name': stmt.excluded.corp_name,
-                'dps': stmt.excluded.dps,
-                'dividend_yield': stmt.excluded.dividend_yield,
-                'total_dividend': stmt.excluded.total_dividend,
-                'net_income': stmt.excluded.net_income,
-                'eps': stmt.excluded.eps,
-                'payout_ratio': stmt.excluded.payout_ratio,
-                'stlm_dt': stmt.excluded.stlm_dt
-            }
-            on_conflict_stmt = stmt.on_conflict_do_update(
-                constraint='uix_dividend_clean_identifier',
-                set_=update_dict
-            )
-            session.execute(on_conflict_stmt)
+            for start in range(0, len(records), batch_size):
+                stmt = insert(DartDividend).values(records[start:start + batch_size])
+                update_dict = {
+                    'corp_name': stmt.excluded.corp_name,
+                    'dps': stmt.excluded.dps,
+                    'dividend_yield': stmt.excluded.dividend_yield,
+                    'total_dividend': stmt.excluded.total_dividend,
+                    'net_income': stmt.excluded.net_income,
+                    'eps': stmt.excluded.eps,
+                    'payout_ratio': stmt.excluded.payout_ratio,
+                    'stlm_dt': stmt.excluded.stlm_dt
+                }
+                on_conflict_stmt = stmt.on_conflict_do_update(
+                    constraint='uix_dividend_clean_identifier',
+                    set_=update_dict
+                )
+                session.execute(on_conflict_stmt)
             session.commit()
             print(f"전처리 완료: {len(records)}건 DB 적재 성공")
+            return len(records)
         except Exception as e:
             session.rollback()
             print(f"[ERROR] DB 적재 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            raise
+
+def process_dividends_streaming(target_corp_code=None, target_year=None, vectorized=True,
+                                corps_per_partition=200, fetch_size=10000):
+    """기업 단위 파티션별로 로드 -> 변환 -> Upsert를 반복하여 테이블 크기와 무관하게 메모리 사용량을 일정하게 유지"""
+    partitions, raw_rows, total = 0, 0, 0
+    for raw_df in iter_raw_partitions(target_corp_code, target_year, corps_per_partition, fetch_size):
+        partitions += 1
+        raw_rows += len(raw_df)
+        records = transform_dividends(raw_df, vectorized=vectorized)
+        if records:
+            total += upsert_dividends(records)
+        del raw_df, records
+
+    if partitions == 0:
+        print("처리할 Raw 데이터가 없습니다.")
+        return 0
+    print(f"Streaming 전처리 완료: {partitions}개 파티션, Raw {raw_rows}행 -> Mart {total}건")
+    return total
+
+def refresh_series():
+    """배당 시계열 View 갱신 (배치 모드에서는 전체 배치 종료 후 1회 호출)"""
+    started = time.perf_counter()
+    refresh_dividend_series(engine)
+    print(f"배당 시계열 View 갱신 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+def process_dividends(target_corp_code=None, target_year=None, vectorized=True, stream=None, refresh=True):
+    """
+    Raw 데이터를 읽어 정제(Cleaning) 및 피벗(Pivoting) 후 분석용 테이블에 적재.
+    stream=None이면 기업 필터가 없는 경우(전체/연도 단위 처리)에만 Streaming 모드를 사용한다.
+    refresh=True이면 적재된 건이 있을 때 배당 시계열 View(dart_dividend_series)를 갱신한다.
+    Returns: Mart 적재 건수 (적재 대상이 없으면 0, DB 적재 실패 시 예외 발생)
+    """
+    
+    filter_msg = []
+    if target_corp_code: filter_msg.append(f"Corp: {target_corp_code}")
+    if target_year: filter_msg.append(f"Year: {target_year}")
+    filter_str = f" ({', '.join(filter_msg)})" if filter_msg else " (All Data)"
+    
+    print(f"배당 데이터 전처리 시작{filter_str}...")
+
+    if stream is None:
+        stream = target_corp_code is None
+    if stream:
+        loaded = process_dividends_streaming(target_corp_code, target_year, vectorized=vectorized)
+        if refresh and loaded:
+            refresh_series()
+        return loaded
+    
+    # 1. Raw Data 로드 (Incremental Processing을 위한 필터링)
+    raw_df = load_raw_dividends(target_corp_code, target_year)
+    
+    if raw_df.empty:
+        print("처리할 Raw 데이터가 없습니다.")
+        return 0
+
+    print(f"Raw Data 로드 완료: {len(raw_df)}행")
+
+    # 2. 정제, 피벗, 지표 매핑
+    records = transform_dividends(raw_df, vectorized=vectorized)
+
+    if not records:
+        print("적재할 데이터가 없습니다.")
+        return 0
+
+    # 3. Mart 적재 및 시계열 View 갱신
+    loaded = upsert_dividends(records)
+    if loaded and refresh:
+        refresh_series()
+    return loaded
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='DART 배당 정보 전처리 스크립트')
     parser.add_argument('--corp_code', type=str, help='처리할 기업 고유번호 (Optional)')
     parser.add_argument('--year', type=str, help='처리할 사업 연도 (Optional)')
+    parser.add_argument('--legacy', action='store_true', help='행 단위(iterrows) 변환 경로 사용')
+    parser.add_argument('--stream', dest='stream', action='store_true', default=None,
+                        help='기업 단위 파티션 Streaming 처리 강제 (기본: 기업 필터가 없을 때 자동 적용)')
+    parser.add_argument('--no_stream', dest='stream', action='store_false', help='전체 데이터를 한 번에 로드하여 처리')
+    parser.add_argument('--no_refresh', dest='refresh', action='store_false', help='적재 후 배당 시계열 View 갱신 생략')
     
     args = parser.parse_args()
-    process_dividends(args.corp_code, args.year)
\ No newline at end of file
+    process_dividends(args.corp_code, args.year, vectorized=not args.legacy, stream=args.stream, refresh=args.refresh)
\ No newline at end of file
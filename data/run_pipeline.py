@@ -7,26 +7,48 @@ Process:
 2. Configuration: Task Registry에서 해당 데이터 타입에 맞는 수집기(Collector)와 전처리기(Processor) 경로 조회
 3. Execution: 정의된 절차에 따라 수집 및 전처리 스크립트 실행
 
+Batch Mode:
+    다수 기업 x 다년도 수집 시 서브프로세스 대신 In-process Worker Pool(Thread)로 수집기/전처리기 함수를 직접 호출합니다.
+    모든 Worker는 공용 DART 클라이언트(Token Bucket)를 공유하므로 전역 Rate Limit이 적용됩니다.
+
 Usage:
     python run_pipeline.py --task dividend --corp_code 00126380 --year 2023
+    python run_pipeline.py --task dividend --batch --start_year 2021 --end_year 2025 --workers 8
+    python run_pipeline.py --task dividend --batch --corp_codes 00126380,00164779 --start_year 2023 --end_year 2024
+
+Resume (Job Ledger):
+    배치 모드는 단위 작업(기업, 연도, 보고서)별 상태를 pipeline_jobs 테이블에 기록합니다.
+    중단 후 동일 명령을 재실행하면 완료 단위는 건너뛰고 실패 단위만 재시도하며,
+    접수번호(rcept_no)가 변경된 (기업, 연도)에 대해서만 전처리를 수행합니다. (--force: 전체 재수집)
 """
 
 import argparse
+import importlib
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # 스크립트 경로 정의 (Base)
 BASE_DIR = Path(__file__).resolve().parent
 
+# 프로젝트 루트 경로 추가 (배치 모드에서 수집기/전처리기 모듈을 'data.*' 패키지로 import)
+sys.path.append(str(BASE_DIR.parent))
+
 # --- Pipeline Registry (확장 포인트) ---
 PIPELINE_REGISTRY = {
     'dividend': {
         'collector': BASE_DIR / 'collectors' / 'dart' / 'get_dividends.py',
         'processor': BASE_DIR / 'processors' / 'dart' / 'clean_dividends.py',
         'description': 'DART 배당 정보(분기별 포함) 수집 및 전처리',
-        'strategy': 'quarterly' # 분기별 순회 전략 사용
+        'strategy': 'quarterly', # 분기별 순회 전략 사용
+        # 배치 모드용 In-process 진입점 ('module:function')
+        'collect_fn': 'data.collectors.dart.get_dividends:collect_dividends',
+        'process_fn': 'data.processors.dart.clean_dividends:process_dividends',
+        # 배치 종료 후 1회 실행 (전처리 단위마다 View를 전체 갱신하지 않도록 process_fn은 refresh=False로 호출)
+        'finalize_fn': 'data.processors.dart.clean_dividends:refresh_series',
     },
     # 추후 추가 예시:
     # 'financial_stat': {
@@ -66,19 +88,159 @@ def execute_quarterly_strategy(config, args):
             '--year', args.year,
             '--reprt_code', reprt_code
         ]
+        # Rate Limit은 수집기 내부의 공용 DART 클라이언트(Token Bucket)에서 적용
         run_command(cmd, f"Collecting {q_name} ({reprt_code})")
-        time.sleep(0.5) # Rate Limit
 
 def execute_single_strategy(config, args):
     """단일 실행 전략 (예: 연간 보고서만 필요한 경우)"""
     # 구현 예정 (현재는 dividend만 있으므로 패스)
     pass
 
+def resolve_callable(path):
+    """'package.module:function' 형식의 경로로부터 함수 객체를 로드"""
+    module_name, func_name = path.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+def load_target_corps(args):
+    """배치 대상 기업 목록 조회 (--corp_codes 미지정 시 dart_corps의 전체 상장사)"""
+    if args.corp_codes:
+        return [c.strip() for c in args.corp_codes.split(',') if c.strip()]
+
+    from sqlalchemy import text
+    from data.schema.db_models import engine
+
+    sql = text("""
+        SELECT corp_code FROM dart_corps
+        WHERE stock_code IS NOT NULL AND stock_code != ''
+        ORDER BY corp_code
+    """)
+    with engine.connect() as conn:
+        corp_codes = [row[0] for row in conn.execute(sql)]
+    return corp_codes[:args.limit] if args.limit else corp_codes
+
+def execute_batch_strategy(config, args):
+    """다수 기업 x 다년도 x 분기 수집 및 변경분 전처리를 Worker Pool에서 In-process로 수행하는 전략"""
+    from data.pipeline_ledger import JobLedger
+    from data.schema.db_models import init_db
+
+    # pipeline_jobs 등 누락된 테이블 생성
+    init_db()
+
+    collect = resolve_callable(config['collect_fn'])
+    process = resolve_callable(config['process_fn'])
+    finalize = resolve_callable(config['finalize_fn']) if 'finalize_fn' in config else None
+
+    corp_codes = load_target_corps(args)
+    years = [str(y) for y in range(int(args.start_year), int(args.end_year) + 1)]
+    total = len(corp_codes)
+    print(f"Batch Target: {total} corps x {len(years)} years x {len(REPORT_CODES)} reports ({args.workers} workers)")
+
+    # Job Ledger: 이전 실행 이력 로드 (--force 시 무시하고 전체 재수집)
+    ledger = JobLedger(args.task)
+    if not args.force:
+        ledger.load(corp_codes)
+
+    counters = {'collected': 0, 'skipped': 0, 'unchanged': 0, 'failed_units': 0}
+    counter_lock = threading.Lock()
+
+    def count(name):
+        with counter_lock:
+            counters[name] += 1
+
+    def run_corp(corp_code):
+        # 1. Extraction: 연도 x 분기 순회 (Rate Limit은 공용 DART 클라이언트에서 전역 적용)
+        pending = {}  # bsns_year -> 전처리 대상 단위 키 목록
+        for year in years:
+            for reprt_code in REPORT_CODES.values():
+                key = (corp_code, year, reprt_code)
+                if not args.force and ledger.is_finished(key):
+                    # 수집은 끝났지만 전처리 전에 중단된 단위는 전처리만 재수행
+                    if ledger.needs_processing(key):
+                        pending.setdefault(year, []).append(key)
+                    count('skipped')
+                    continue
+                try:
+                    result = collect(corp_code, year, reprt_code)
+                except Exception as e:
+                    ledger.record(key, 'failed', error=str(e))
+                    count('failed_units')
+                    continue
+
+                if result['status'] == 'empty':
+                    ledger.record(key, 'empty')
+                elif result['changed']:
+                    ledger.record(key, 'collected', rcept_no=result['rcept_no'])
+                    pending.setdefault(year, []).append(key)
+                    count('collected')
+                else:
+                    # 동일 접수번호가 이미 Raw에 존재 -> 전처리 불필요
+                    ledger.record(key, 'done', rcept_no=result['rcept_no'])
+                    count('unchanged')
+
+        # 2. Transformation: Raw가 실제로 변경된 (기업, 연도)만 전처리
+        # 전처리 실패 시 'collected' 상태를 유지하여 다음 실행에서 전처리만 재시도 (오류 메시지 기록)
+        processed = 0
+        for year, keys in sorted(pending.items()):
+            try:
+                process(corp_code, year, refresh=finalize is None)
+            except Exception as e:
+                for key in keys:
+                    ledger.record(key, 'collected', error=f"process: {e}")
+                    count('failed_units')
+                continue
+            for key in keys:
+                ledger.record(key, 'done')
+            processed += 1
+        return processed
+
+    started = time.perf_counter()
+    done, failed, processed = 0, [], 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_corp, corp_code): corp_code for corp_code in corp_codes}
+        for future in as_completed(futures):
+            corp_code = futures[future]
+            done += 1
+            try:
+                processed += future.result()
+            except Exception as e:
+                failed.append(corp_code)
+                print(f"[Batch] {corp_code} 실패: {e}")
+
+            # 진행률 및 처리량 (companies/min)
+            if done % args.report_every == 0 or done == total:
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed * 60 if elapsed else 0.0
+                print(f"[Batch] {done}/{total} corps | {rate:.1f} corps/min | "
+                      f"collected: {counters['collected']}, unchanged: {counters['unchanged']}, "
+                      f"skipped: {counters['skipped']}, failed units: {counters['failed_units']}")
+
+    # 전처리된 (기업, 연도)가 있으면 후처리 1회 실행 (예: 배당 시계열 View 갱신)
+    if finalize is not None and processed:
+        finalize()
+
+    elapsed = time.perf_counter() - started
+    print(f"Batch Completed: {done - len(failed)}/{total} corps in {elapsed:.1f}s "
+          f"({done / elapsed * 60 if elapsed else 0.0:.1f} corps/min)")
+    if failed:
+        print(f"Failed corps: {', '.join(failed)}")
+    if counters['failed_units']:
+        print(f"{counters['failed_units']} units failed. 동일 명령 재실행 시 실패 단위만 재시도합니다.")
+
 def main():
     parser = argparse.ArgumentParser(description='Financial Data Pipeline Orchestrator')
     parser.add_argument('--task', type=str, required=True, choices=PIPELINE_REGISTRY.keys(), help='Task Name (e.g., dividend)')
-    parser.add_argument('--corp_code', type=str, required=True, help='Target Corporation Code')
-    parser.add_argument('--year', type=str, required=True, help='Target Business Year')
+    parser.add_argument('--corp_code', type=str, help='Target Corporation Code')
+    parser.add_argument('--year', type=str, help='Target Business Year')
+
+    # Batch Mode
+    parser.add_argument('--batch', action='store_true', help='다수 기업 x 다년도 In-process 배치 수집')
+    parser.add_argument('--corp_codes', type=str, help='배치 대상 기업 코드 (콤마 구분, 미지정 시 전체 상장사)')
+    parser.add_argument('--start_year', type=str, help='배치 시작 연도')
+    parser.add_argument('--end_year', type=str, help='배치 종료 연도')
+    parser.add_argument('--workers', type=int, default=4, help='배치 Worker 수')
+    parser.add_argument('--limit', type=int, help='배치 대상 기업 수 제한 (테스트용)')
+    parser.add_argument('--report_every', type=int, default=10, help='처리량 로그 출력 주기 (기업 수)')
+    parser.add_argument('--force', action='store_true', help='Job Ledger를 무시하고 전체 재수집')
     
     args = parser.parse_args()
     
@@ -88,6 +250,24 @@ def main():
         print(f"Error: Unknown task '{args.task}'")
         sys.exit(1)
 
+    if args.batch:
+        if not args.start_year:
+            parser.error('--batch requires --start_year')
+        args.end_year = args.end_year or args.start_year
+        if 'collect_fn' not in config:
+            print(f"Error: Task '{args.task}' does not support batch mode")
+            sys.exit(1)
+
+        print(f"Starting Batch Pipeline: [{args.task.upper()}] {args.start_year}~{args.end_year}")
+        print(f"Description: {config['description']}")
+        print("=" * 60)
+        execute_batch_strategy(config, args)
+        print("=" * 60)
+        return
+
+    if not args.corp_code or not args.year:
+        parser.error('--corp_code and --year are required (or use --batch)')
+
     print(f"Starting Pipeline: [{args.task.upper()}] for {args.corp_code} ({args.year})")
     print(f"Description: {config['description']}")
     print("=" * 60)